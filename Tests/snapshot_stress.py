@@ -0,0 +1,146 @@
+"""
+Stress test for the data manager's writer/reader snapshots (core/seqlock.py).
+
+One thread records samples as fast as it can into a small, constantly
+evicting log while reader threads pull the plot data, the history and the
+statistics, and check every result for consistency. The same readers are
+then run against the log directly, with no snapshot, to show what they
+would see without it.
+
+Run from the repository root:
+    python Tests/snapshot_stress.py --seconds 5 --readers 3
+"""
+import argparse
+import math
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "pyqt"))
+
+from app_data import AppDataManager
+from core.ratio_index import RatioIndex
+from core.ring_buffer import PostureRingBuffer
+
+PERIOD = 97 # Ratios cycle through PERIOD values, so neighbours can be checked
+ABSENT_EVERY = 13 # Every 13th second is an "away" sample (NaN)
+
+
+class FixedSettings:
+    """The few settings AppDataManager reads, without touching the user's QSettings."""
+
+    def get(self, key):
+        return {"baseline": 0.0, "posture_strictness": 0.85, "posture_threshold": 0.5}[key]
+
+
+def ratio_for(second):
+    if second % ABSENT_EVERY == 0:
+        return math.nan
+    return (second % PERIOD) / PERIOD
+
+
+def check_series(times, ratios):
+    """Problems in a (relative_times, ratios) pair, as a list of strings."""
+    problems = []
+    if len(times) != len(ratios):
+        return [f"length mismatch {len(times)} != {len(ratios)}"]
+    if len(times) > 1 and not np.all(np.diff(times) == 1.0):
+        problems.append("timestamps not 1 s apart")
+    # Rebuild the sequence from the first sample and compare
+    present = ~np.isnan(ratios)
+    if present.any():
+        first = int(np.flatnonzero(present)[0])
+        with np.errstate(invalid="ignore"): # An unsynchronized read can see NaN appear here
+            steps = np.round(ratios[present] * PERIOD).astype(int)
+        expected = (steps[0] + np.flatnonzero(present) - first) % PERIOD
+        if not np.array_equal(steps, expected):
+            problems.append("ratios out of sequence")
+    return problems
+
+
+def check_stats(snapshot):
+    if snapshot is None:
+        return []
+    total_s, stats = snapshot
+    problems = []
+    if stats.count + stats.absent_count != int(total_s) + 1:
+        problems.append(f"stats cover {stats.count + stats.absent_count} samples, log {int(total_s) + 1}")
+    if not 0 <= stats.longest_streak <= stats.good_count <= stats.count:
+        problems.append("streak/good/count out of order")
+    return problems
+
+
+def run(manager, readers, seconds, snapshots):
+    stop = threading.Event()
+    counts = {"writes": 0, "reads": 0}
+    problems = {}
+    problems_lock = threading.Lock()
+
+    def writer():
+        second = 1_000_000
+        while not stop.is_set():
+            manager.record_sample(float(second), ratio_for(second))
+            second += 1
+            counts["writes"] += 1
+
+    def reader():
+        while not stop.is_set():
+            if snapshots:
+                found = check_series(*manager.get_latest_data())
+                history = manager.get_history(0, math.inf, 1)
+                found += check_series(history["time"] - history["time"][0] if len(history["time"]) else
+                                      history["time"], history["mean"])
+                found += check_stats(manager.stats_snapshot())
+            else:
+                # The log read directly, as the stats page used to
+                log = manager.posture_log
+                timestamps = log.timestamps
+                found = check_series(timestamps - timestamps[0] if len(timestamps) else timestamps, log.ratios)
+            counts["reads"] += 1
+            if found:
+                with problems_lock:
+                    for problem in found:
+                        problems[problem] = problems.get(problem, 0) + 1
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return counts, problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0, help="run time per mode")
+    parser.add_argument("--readers", type=int, default=3, help="reader threads")
+    parser.add_argument("--capacity", type=int, default=500, help="samples kept in the log")
+    args = parser.parse_args()
+
+    # Switch threads as often as possible so reads and writes interleave
+    sys.setswitchinterval(1e-6)
+    failed = False
+    for snapshots in (True, False):
+        manager = AppDataManager(FixedSettings())
+        manager.posture_log = PostureRingBuffer(args.capacity)
+        manager.ratio_index = RatioIndex(args.capacity)
+        counts, problems = run(manager, args.readers, args.seconds, snapshots)
+        label = "snapshots" if snapshots else "unsynchronized"
+        print(f"{label:<15}: {counts['writes']} writes, {counts['reads']} reads, "
+              f"{sum(problems.values())} inconsistent, {manager.published.retries} retried")
+        for problem, count in sorted(problems.items()):
+            print(f"    {count:>6} x {problem}")
+        if snapshots and problems:
+            failed = True
+
+    print("FAIL" if failed else "OK: every snapshot read was consistent")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
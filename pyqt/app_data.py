@@ -1,123 +1,340 @@
 from PyQt6.QtCore import QObject, pyqtSignal
-import time
+import copy
+import math
 import numpy as np
 
+from core.clock import SystemClock
+from core.episodes import EpisodeIndex
+from core.history_analytics import HistoryAnalytics
+from core.posture_features import FEATURE_NAMES
+from core.ratio_index import RatioIndex
+from core.ring_buffer import PostureRingBuffer
+from core.rollups import RollupStore
+from core.seqlock import SeqLock
+from core.session_stats import SessionStats
+
 class AppDataManager(QObject):
     """
     Manages the posture data log by averaging frames into 1-second chunks,
     and calculates ongoing session statistics.
+
+    The detector thread is the only writer (add_ratio() / record_sample());
+    the GUI reads through get_latest_data(), get_history(),
+    stats_snapshot() and calculate_posture_stats(). Writes go through a
+    SeqLock, so the writer never blocks and readers get copies taken between
+    two samples, never a half-updated log.
     """
     # Signal to notify the statistics page that new data is available
     new_ratio_data = pyqtSignal()
 
-    def __init__(self, settings, parent=None): 
+    def __init__(self, settings, store=None, clock=None, parent=None): 
         super().__init__(parent)
         self.settings = settings
+        # Timestamps for the samples (a ReplayClock when replaying a recording)
+        self.clock = clock or SystemClock()
+        # Optional on-disk history (core/session_store.py); writes happen off this thread
+        self.store = store
         
+        # Capacity: ~10 hours of 1-second data points
+        self.MAX_LOG_SIZE = 36000 
+
         # This will hold the long-term history (1 point per second)
-        # Format: (timestamp, average_ratio)
-        self.posture_log = []
+        # Columns: timestamps (float64), average ratios and features (float32)
+        self.posture_log = PostureRingBuffer(self.MAX_LOG_SIZE, FEATURE_NAMES)
+
+        # Running statistics over posture_log, updated per sample
+        self.session_stats = SessionStats(self.active_threshold())
+
+        # Good counts and longest streaks of posture_log for any threshold (what-if queries)
+        self.ratio_index = RatioIndex(self.MAX_LOG_SIZE)
+
+        # 1-minute / 15-minute / 1-hour aggregates that outlive posture_log
+        self.rollups = RollupStore()
+
+        # Good / bad / absent episodes (run lengths of the samples), also outliving posture_log
+        self.episodes = EpisodeIndex()
+
+        # Guards posture_log, session_stats, ratio_index, rollups and episodes (one writer, lock-free readers)
+        self.published = SeqLock()
+
+        # Daily/weekly/hour-of-day breakdowns over every stored session
+        self.analytics = HistoryAnalytics(store) if store else None
+
+        if self.store:
+            self.store.start_session(self.clock.time(), *self._threshold_settings())
         
         # This acts as a temporary buffer to calculate the 1-second average
         self.second_buffer = []
-        self.last_save_time = time.time()
+        self.feature_buffer = [] # Feature rows of the frames with a pose
+        self.last_save_time = self.clock.time()
 
-        # Capacity: ~10 hours of 1-second data points
-        self.MAX_LOG_SIZE = 36000 
-
-    def add_ratio(self, ratio):
+    def add_ratio(self, ratio, features=None):
         """
-        Called by the thread every frame (~30 times/sec).
+        Called by the thread every frame (~30 times/sec), with the frame's
+        features (core/posture_features.py) if it has them.
         Buffers data and saves an average 1-second chunk to the log.
         """
-        current_time = time.time()
+        current_time = self.clock.time()
         self.second_buffer.append(ratio)
+        if features is not None:
+            self.feature_buffer.append(features)
 
         # If 1 second has passed since the last save...
         if current_time - self.last_save_time >= 1.0:
             if self.second_buffer:
-                # Calculate average of the last second
-                avg_ratio = np.mean(self.second_buffer)
-                
-                # Save to long-term log
-                self.posture_log.append((current_time, avg_ratio))
+                # Calculate average of the last second (NaN if nobody was seen in it)
+                present = [r for r in self.second_buffer if not math.isnan(r)]
+                avg_ratio = np.mean(present) if present else math.nan
+                avg_features = self._average_features()
                 
                 # Reset buffer and timer
                 self.second_buffer = []
+                self.feature_buffer = []
                 self.last_save_time = current_time
-                
-                # Trim log if too big
-                if len(self.posture_log) > self.MAX_LOG_SIZE:
-                    self.posture_log.pop(0)
 
-                # Emit signal to update graph (now only happens once per second!)
-                self.new_ratio_data.emit()
+                self.record_sample(current_time, avg_ratio, avg_features)
+
+    def _average_features(self):
+        """Per-feature mean of the buffered rows, leaving out NaN (unmeasurable) values."""
+        if not self.feature_buffer:
+            return None
+        rows = np.array(self.feature_buffer)
+        measured = ~np.isnan(rows)
+        with np.errstate(invalid="ignore"):
+            return np.where(measured, rows, 0).sum(axis=0) / measured.sum(axis=0)
 
-    def get_latest_data(self):
+    def add_absence(self):
         """
-        Retrieves the entire session history for plotting.
+        Called by the thread for frames without a person in them. Seconds with
+        no pose at all are stored as NaN ratios ("away") rather than left out.
         """
-        if not self.posture_log:
-            return [], []
-            
-        timestamps, ratios = zip(*self.posture_log)
-        
-        # Convert timestamps to relative time (seconds since start)
-        start_time = timestamps[0]
-        relative_times = [(t - start_time) for t in timestamps]
-        
-        return relative_times, list(ratios)
+        self.add_ratio(math.nan)
 
-    def calculate_posture_stats(self):
+    def record_sample(self, timestamp, avg_ratio, features=None):
         """
-        Calculates the total duration, percentage of good posture time, and 
-        the longest streak of good posture (above threshold).
-        Returns: (total_duration_s, percent_good, longest_streak_s, active_threshold)
+        Saves one 1-second average (NaN = away), and the averaged features if
+        any, to the long-term log and notifies listeners.
         """
-        if not self.posture_log:
-            return 0.0, 0.0, 0.0, 0.0 
+        # Ratios are stored as float32; score exactly what was stored
+        ratio = float(np.float32(avg_ratio))
+
+        with self.published.write():
+            self._sync_threshold()
+            # The ring buffer drops the oldest point itself once it is full
+            evicted = self.posture_log.append(timestamp, ratio, features)
+            if evicted is not None:
+                self.session_stats.remove(evicted[1])
+                self.ratio_index.remove(evicted[1])
+            self.session_stats.add(ratio)
+            # Rescans only when evicting the oldest good run may have shortened the longest one
+            self.session_stats.refresh_longest(self.posture_log.ratios)
+            self.ratio_index.add(ratio)
+            is_good = ratio > self.session_stats.threshold
+            self.rollups.add(timestamp, ratio, is_good)
+            self.episodes.add(timestamp, ratio, is_good)
+        if self.store:
+            self.store.add_sample(timestamp, ratio) # Only queued; written in batches
+
+        # Emit signal to update graph (now only happens once per second!)
+        self.new_ratio_data.emit()
+
+    def get_latest_data(self, feature=None):
+        """
+        Retrieves the entire session history for plotting: the ratios, or
+        the named feature (core/posture_features.py) if given.
+        Returns (relative_times, values) as NumPy arrays (copies).
+        """
+        def read():
+            if not len(self.posture_log):
+                return np.empty(0), np.empty(0, dtype=np.float32)
+
+            timestamps = self.posture_log.timestamps
+
+            # Convert timestamps to relative time (seconds since start)
+            relative_times = timestamps - timestamps[0]
+
+            values = self.posture_log.ratios if feature is None else self.posture_log.feature(feature)
+            return relative_times, values.copy()
+
+        return self.published.read(read)
+
+    def get_feature_history(self, feature, start, end):
+        """
+        One feature's 1-second samples between two timestamps, from the
+        session log (features aren't rolled up or stored on disk).
+        Returns (timestamps, values) as NumPy arrays (copies).
+        """
+        def read():
+            timestamps = self.posture_log.timestamps
+            lo, hi = np.searchsorted(timestamps, [start, end])
+            return timestamps[lo:hi].copy(), self.posture_log.feature(feature)[lo:hi].copy()
 
-        # 1. Determine the active threshold (Calibration takes precedence)
+        return self.published.read(read)
+
+    def get_history(self, start, end, resolution_s):
+        """
+        Posture history between two timestamps from the coarsest store whose
+        buckets are no wider than resolution_s: raw 1-second samples, or the
+        1-minute, 15-minute or 1-hour rollups.
+        Returns a dict of equal-length arrays: time (bucket start), count,
+        mean, min, max, good_fraction, no_pose_s, plus "resolution" (seconds).
+        """
+        tier = self.rollups.tier_for(resolution_s)
+        if tier is not None:
+            # Some of the columns are views into the tier; copy them out
+            history = self.published.read(
+                lambda: {name: column.copy() for name, column in tier.query(start, end).items()})
+            history["resolution"] = tier.bucket_seconds
+            return history
+        return self.published.read(lambda: self._raw_history(start, end))
+
+    def get_episodes(self, start, end):
+        """
+        Good / bad / absent episodes overlapping [start, end), oldest first,
+        from the episode index (core/episodes.py) rather than the samples.
+        Returns a dict of equal-length arrays (copies): start, end, duration,
+        state, count, mean, min.
+        """
+        return self.published.read(lambda: self.episodes.query(start, end))
+
+    def log_start(self):
+        """Timestamp of the oldest sample in the log (x = 0 of get_latest_data()), or None."""
+        def read():
+            return float(self.posture_log.timestamps[0]) if len(self.posture_log) else None
+
+        return self.published.read(read)
+
+    def _raw_history(self, start, end):
+        timestamps = self.posture_log.timestamps
+        lo, hi = np.searchsorted(timestamps, [start, end])
+        ratios = self.posture_log.ratios[lo:hi].astype(np.float64)
+        away = np.isnan(ratios)
+        good_fraction = (ratios > self.session_stats.threshold).astype(np.float64)
+        good_fraction[away] = np.nan
+        return {
+            "time": timestamps[lo:hi].copy(),
+            "count": (~away).astype(np.int32),
+            "mean": ratios,
+            "min": ratios,
+            "max": ratios,
+            "good_fraction": good_fraction,
+            "no_pose_s": away.astype(np.float32),
+            "resolution": 1,
+        }
+
+    def active_threshold(self):
+        """The good/bad threshold in use (Calibration takes precedence)."""
         baseline = self.settings.get("baseline")
         strictness = self.settings.get("posture_strictness")
         default_threshold = self.settings.get("posture_threshold")
         
         if baseline > 0:
-            active_threshold = baseline * strictness
-        else:
-            active_threshold = default_threshold
-        
-        timestamps, ratios = zip(*self.posture_log)
+            return baseline * strictness
+        return default_threshold
+
+    def _sync_threshold(self):
+        """Re-scores the history once if the threshold changed (new calibration or slider move)."""
+        threshold = self.active_threshold()
+        if threshold != self.session_stats.threshold:
+            self.session_stats.recompute(self.posture_log.ratios, threshold)
+            if self.store:
+                self.store.update_session(*self._threshold_settings())
+
+    def _threshold_settings(self):
+        """(baseline, strictness, active threshold) as saved with a session."""
+        return (self.settings.get("baseline"), self.settings.get("posture_strictness"),
+                self.active_threshold())
+
+    def close(self):
+        """Ends the stored session and writes out anything still pending."""
+        if self.store:
+            self.analytics.close()
+            self.store.end_session(self.clock.time())
+            self.store.close()
+
+    def stats_snapshot(self):
+        """
+        A consistent copy of the session statistics (any thread):
+        (total_duration_s, SessionStats), or None while the log is empty.
+        The copy is re-scored if the threshold changed since the last sample
+        (the writer re-scores its own at the next one).
+        """
+        threshold = self.active_threshold()
+
+        def read():
+            if not len(self.posture_log):
+                return None
+            timestamps = self.posture_log.timestamps
+            stats = copy.copy(self.session_stats)
+            # The ratios are only needed to re-score
+            ratios = None
+            if stats.threshold != threshold:
+                ratios = self.posture_log.ratios.copy()
+            return float(timestamps[-1] - timestamps[0]), stats, ratios
+
+        snapshot = self.published.read(read)
+        if snapshot is None:
+            return None
+        total_duration_s, stats, ratios = snapshot
+        if stats.threshold != threshold:
+            stats.recompute(ratios, threshold)
+        return total_duration_s, stats
+
+    def stats_at_threshold(self, threshold):
+        """
+        What the statistics would be with another threshold (any thread), from
+        the ratio index rather than a rescan of the log. The threshold is
+        rounded down to the index's 0.01 grid.
+        Returns (percent_good, longest_streak_s), or None while the log is empty.
+        """
+        index = self.ratio_index
+
+        def read():
+            if not len(self.posture_log):
+                return None
+            timestamps = self.posture_log.timestamps
+            absent_count = len(self.posture_log) - index.present
+            return (float(timestamps[-1] - timestamps[0]), absent_count,
+                    index.good_count(threshold), index.longest_streak(threshold))
+
+        snapshot = self.published.read(read)
+        if snapshot is None:
+            return None
+        total_duration_s, absent_count, good_count, longest_streak = snapshot
+        # Scored like calculate_posture_stats(), so both agree at the active threshold
+        present_s = total_duration_s - absent_count
+        percent_good = (good_count / present_s) * 100 if present_s > 0 else 0.0
+        return percent_good, float(longest_streak)
+
+    def calculate_posture_stats(self):
+        """
+        Returns the total duration, percentage of good posture time, and 
+        the longest streak of good posture (above threshold), all kept up to
+        date by record_sample() rather than rescanned. Time away from the desk
+        (NaN samples) is left out of the percentage and ends a streak.
+        Returns: (total_duration_s, percent_good, longest_streak_s, active_threshold)
+        """
+        # 1. A consistent copy of the statistics, scored against the active threshold
+        return self.score_stats(self.stats_snapshot())
+
+    def score_stats(self, snapshot):
+        """calculate_posture_stats() for a stats_snapshot() already taken."""
+        if snapshot is None:
+            return 0.0, 0.0, 0.0, 0.0 
+        total_duration_s, stats = snapshot
+        active_threshold = stats.threshold
         
-        total_duration_s = timestamps[-1] - timestamps[0]
         if total_duration_s == 0:
              return 0.0, 0.0, 0.0, active_threshold
 
-        # 2. Calculate time above threshold (good posture) and longest streak
-        good_posture_time_s = 0.0
-        longest_streak_s = 0.0
-        current_streak_s = 0.0
-        
-        # Iterate through the 1-second averaged data points
-        for i in range(len(self.posture_log)):
-            ratio = self.posture_log[i][1] # Get the ratio
-            time_interval_s = 1.0 
-            
-            is_good = ratio > active_threshold
-            
-            if is_good:
-                good_posture_time_s += time_interval_s
-                current_streak_s += time_interval_s
-            else:
-                # Streak is broken, save if it's the longest
-                if current_streak_s > longest_streak_s:
-                    longest_streak_s = current_streak_s
-                current_streak_s = 0.0
-
-        # Check the final streak when the loop ends
-        if current_streak_s > longest_streak_s:
-            longest_streak_s = current_streak_s
-
-        percent_good = (good_posture_time_s / total_duration_s) * 100
+        # 2. Time above threshold (good posture) and longest streak
+        # Each data point is a 1-second average
+        good_posture_time_s = float(stats.good_count)
+        longest_streak_s = float(stats.longest_streak)
+
+        # Each away sample stands for one second without a person
+        present_s = total_duration_s - stats.absent_count
+        percent_good = (good_posture_time_s / present_s) * 100 if present_s > 0 else 0.0
         
-        return total_duration_s, percent_good, longest_streak_s, active_threshold
\ No newline at end of file
+        return total_duration_s, percent_good, longest_streak_s, active_threshold
+
@@ -1,14 +1,29 @@
-from PyQt6.QtCore import QSettings
+import threading
+import time
 
-class AppSettings:
+from PyQt6.QtCore import QObject, QSettings, pyqtSignal
+
+class AppSettings(QObject):
     """
     A wrapper for QSettings to manage persistent application settings.
     This replaces the Streamlit session_state.
+
+    Values are read once into an in-memory, typed snapshot; get() is a dict
+    lookup, so the detector can call it every frame without touching
+    QSettings or taking a lock. set() swaps in an updated copy of the
+    snapshot, emits `changed` and leaves the disk write to a background
+    thread, which waits until no setting has changed for `write_delay`
+    seconds (a slider drag is written once, at the end).
     """
-    def __init__(self):
+    # (key, new value), emitted by set() on the thread that called it
+    changed = pyqtSignal(str, object)
+
+    def __init__(self, write_delay=0.5, store=None, parent=None):
+        super().__init__(parent)
         # define organization application name.
         # this tells QSettings where to save the settings on the users OS.
-        self.settings = QSettings("PostureAppCompany", "PostureApp")
+        # (store: a QSettings to use instead, e.g. a throwaway file for the benchmarks)
+        self.settings = store if store is not None else QSettings("PostureAppCompany", "PostureApp")
         
         # default values
         self.defaults = {
@@ -17,12 +32,49 @@ class AppSettings:
             "warning_wait": 3,
             "calibration_duration": 3,
             "sound_enabled": True,
-            "baseline": 0.0
+            "baseline": 0.0,
+            # "thread" runs MediaPipe in the detector thread, "process" in a worker process
+            "inference_mode": "thread",
+            # Frames per second checked while the pose page isn't visible (0 = pause)
+            "background_fps": 2,
+            # Most camera frames between pose inferences while posture is steady (1 = every frame)
+            "cadence_max_interval": 4,
+            # Longer side (pixels) of the image given to MediaPipe; 0 = full camera frame
+            "inference_size": 256,
+            # Pose model: "lite", "full", "heavy" or "auto" (the most accurate one within frame_budget_ms).
+            # Only "full" ships with MediaPipe; the others are downloaded the first time they're used
+            "model_complexity": "full",
+            # Per-inference time the "auto" model choice aims to stay under
+            "frame_budget_ms": 33,
+            # MediaPipe confidence needed to find a person / to keep tracking them
+            "min_detection_confidence": 0.5,
+            "min_tracking_confidence": 0.5,
+            # Draw the pose skeleton and posture labels on the video
+            "show_overlay": True,
+            # Save each frame's pose landmarks (PostureApp/recordings/) for replaying later
+            "record_landmarks": False,
+            # Features besides the posture ratio to check (core/posture_features.py), comma-separated
+            "posture_features": "head_tilt,shoulder_asymmetry,forward_head,shoulder_width",
+            # Highest good value of each feature
+            "head_tilt_threshold": 12.0, # Degrees
+            "shoulder_asymmetry_threshold": 6.0, # Degrees
+            "forward_head_threshold": 0.8, # Shoulder widths
+            "shoulder_width_threshold": 0.6 # Fraction of the frame width
         }
         
         # Ensure all default settings are populated on first launch
         self._initialize_defaults()
 
+        # Replaced as a whole on every set(), never modified in place
+        self._values = {key: self.read_stored(key) for key in self.defaults}
+
+        # --- Write-behind ---
+        self.write_delay = write_delay
+        self._dirty = {}
+        self._last_set = 0.0
+        self._cond = threading.Condition()
+        self._writer = None
+
     def _initialize_defaults(self):
         """
         Writes any default values that are not already in the settings file.
@@ -33,7 +85,17 @@ class AppSettings:
 
     def get(self, key):
         """
-        Gets a setting value.
+        Gets a setting value from the snapshot (any thread).
+        """
+        try:
+            return self._values[key]
+        except KeyError:
+            with self._cond: # QSettings may be in use by the writer thread
+                return self.read_stored(key)
+
+    def read_stored(self, key):
+        """
+        Reads a setting from QSettings, bypassing the snapshot.
         It will automatically convert types (e.g., "true" to True).
         """
         # Get the value, falling back to the default if it doesn't exist
@@ -51,9 +113,54 @@ class AppSettings:
 
     def set(self, key, value):
         """
-        Saves a setting value persistently.
+        Saves a setting value persistently (any thread).
+        The snapshot changes at once; QSettings is written shortly after.
         """
-        if key in self.defaults:
+        if key not in self.defaults:
+            print(f"Warning: Attempted to set unknown setting '{key}'")
+            return
+
+        # Same type as the default, so get() returns what read_stored() would
+        default_value = self.defaults[key]
+        if isinstance(default_value, (bool, int, float)):
+            value = type(default_value)(value)
+        with self._cond:
+            # Under the lock, so concurrent set() calls don't copy the same old snapshot
+            if self._values.get(key) == value:
+                return
+            values = dict(self._values)
+            values[key] = value
+            self._values = values
+
+            self._dirty[key] = value
+            self._last_set = time.monotonic()
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_behind, name="SettingsWriter", daemon=True)
+                self._writer.start()
+            self._cond.notify_all()
+        self.changed.emit(key, value)
+
+    def _write_behind(self):
+        """Writer thread: flushes changed settings once they have been quiet for write_delay."""
+        with self._cond:
+            while True:
+                while not self._dirty:
+                    self._cond.wait()
+                remaining = self._last_set + self.write_delay - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                self._write_dirty()
+
+    def _write_dirty(self):
+        # Called with self._cond held, so set() and flush() wait for the write
+        for key, value in self._dirty.items():
             self.settings.setValue(key, value)
-        else:
-            print(f"Warning: Attempted to set unknown setting '{key}'")
\ No newline at end of file
+        self._dirty = {}
+        self.settings.sync()
+
+    def flush(self):
+        """Writes any pending changes now (e.g. when the app closes)."""
+        with self._cond:
+            if self._dirty:
+                self._write_dirty()
\ No newline at end of file
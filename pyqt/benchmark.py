@@ -0,0 +1,1157 @@
+"""
+Headless benchmarks for the posture checker.
+
+Run from the pyqt/ folder, e.g.:
+    python benchmark.py pipeline --source clip.mp4
+    python benchmark.py pipeline --source synthetic:1280x720 --frames 300
+    python benchmark.py gui --source clip.mp4 --modes thread process
+    python benchmark.py datalog --hours 10
+    python benchmark.py store --days 365
+    python benchmark.py startup --source clip.mp4
+    python benchmark.py power --source clip.mp4
+    python benchmark.py roi --source clip.mp4
+    python benchmark.py overlay --source clip.mp4
+    python benchmark.py events --source clip.mp4 --realtime
+    python benchmark.py settings
+    python benchmark.py pipeline --source clip.mp4 --record clip.poselm
+    python benchmark.py landmarks --recording clip.poselm
+    python benchmark.py scoring --sizes 1000 100000 10000000
+    python benchmark.py whatif --hours 12
+    python benchmark.py episodes --days 7
+
+The gui benchmark opens real Qt widgets; on machines without a display set
+QT_QPA_PLATFORM=offscreen.
+
+No camera or window is needed, so this also runs on build machines.
+"""
+# Imported first so startup timings count everything the app loads
+from core import startup_metrics
+import argparse
+import atexit
+import os
+import re
+import statistics
+import subprocess
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from PyQt6.QtCore import QCoreApplication
+
+from app_settings import AppSettings
+from app_data import AppDataManager
+
+
+def print_pipeline_summary(summary, wall_s):
+    print(f"Frames processed : {summary['frames']}")
+    print(f"Wall time        : {wall_s:.2f}s")
+    print(f"Sustained FPS    : {summary['fps']:.1f}")
+    print(f"Inference FPS    : {summary['inference_fps']:.1f}")
+
+    latency = summary["latency_ms"]
+    if latency:
+        print("Per-frame latency: "
+              f"p50 {latency['p50']:.2f}ms  p95 {latency['p95']:.2f}ms  p99 {latency['p99']:.2f}ms")
+
+    print(f"Dropped frames   : {summary['dropped']}")
+    for name, latency in summary["latencies"].items():
+        if latency:
+            print(f"{name:<17}: "
+                  f"p50 {latency['p50']:.2f}ms  p95 {latency['p95']:.2f}ms  p99 {latency['p99']:.2f}ms")
+
+    print()
+    print(f"{'Stage':<12}{'wall ms':>10}{'wall p95':>10}{'cpu ms':>10}")
+    for name, stage in summary["stages"].items():
+        print(f"{name:<12}{stage['wall_ms']:>10.3f}{stage['wall_p95_ms']:>10.3f}{stage['cpu_ms']:>10.3f}")
+
+
+def synthetic_ratios(count, seed=0):
+    """Plausible 1-second posture ratios: slow drift, slouch dips and noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(count)
+    return 0.85 + 0.1 * np.sin(t / 600.0) - 0.15 * (np.sin(t / 97.0) > 0.7) + rng.normal(0, 0.03, count)
+
+
+def fill_history(data_manager, seconds, end_time=None):
+    """Loads `seconds` of one-second samples into the data manager, ending now."""
+    end_time = end_time or time.time()
+    for i, ratio in enumerate(synthetic_ratios(seconds)):
+        data_manager.record_sample(end_time - seconds + i, float(ratio))
+
+
+def isolated_settings():
+    """
+    AppSettings with default values in a throwaway INI file, so results don't
+    depend on the user's settings and runs don't write into their data folder.
+    """
+    from PyQt6.QtCore import QSettings
+
+    directory = tempfile.mkdtemp(prefix="posture-settings-")
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    store = QSettings(os.path.join(directory, "settings.ini"), QSettings.Format.IniFormat)
+    return AppSettings(store=store)
+
+
+def time_call(func, repeats):
+    """Mean wall and CPU milliseconds per call."""
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    for _ in range(repeats):
+        func()
+    return ((time.perf_counter() - wall_start) * 1000.0 / repeats,
+            (time.process_time() - cpu_start) * 1000.0 / repeats)
+
+
+def bench_datalog(args):
+    """Memory and per-tick cost of the posture history with a full log."""
+    settings = isolated_settings()
+    data_manager = AppDataManager(settings)
+    seconds = int(args.hours * 3600)
+    if seconds > data_manager.MAX_LOG_SIZE:
+        print(f"Note: the log keeps at most {data_manager.MAX_LOG_SIZE} samples")
+
+    # The previous format (a list of (timestamp, np.float64) tuples), for comparison
+    tracemalloc.start()
+    ratios = synthetic_ratios(min(seconds, data_manager.MAX_LOG_SIZE))
+    legacy_log = [(float(i), np.float64(r)) for i, r in enumerate(ratios)]
+    legacy_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del legacy_log
+
+    fill_history(data_manager, seconds)
+    now = time.time()
+
+    def tick():
+        # What happens once per second: one new sample, then the stats page refresh
+        tick.t += 1.0
+        data_manager.record_sample(tick.t, 0.8)
+        data_manager.get_latest_data()
+        data_manager.calculate_posture_stats()
+    tick.t = now
+
+    print(f"Samples in log   : {len(data_manager.posture_log)}")
+    print(f"Log memory       : {data_manager.posture_log.nbytes / 1e6:.2f} MB "
+          f"(list of tuples: {legacy_bytes / 1e6:.2f} MB)")
+    print(f"Rollup memory    : {data_manager.rollups.nbytes / 1e6:.2f} MB (fixed, all tiers)")
+    for name, func in (("record_sample", lambda: data_manager.record_sample(now, 0.8)),
+                       ("get_latest_data", data_manager.get_latest_data),
+                       ("posture_stats", data_manager.calculate_posture_stats),
+                       ("week history", lambda: data_manager.get_history(now - 7 * 86400, now, 1512)),
+                       ("full tick", tick)):
+        wall_ms, cpu_ms = time_call(func, args.repeats)
+        print(f"{name:<17}: {wall_ms:.3f} ms wall, {cpu_ms:.3f} ms CPU")
+
+
+def bench_store(args):
+    """Append throughput of the on-disk history and reopen time with a large file."""
+    from core.session_store import SessionStore
+
+    directory = tempfile.mkdtemp(prefix="posture_store_")
+    path = os.path.join(directory, "history.sqlite3")
+    try:
+        store = SessionStore(path)
+        store.start_session(time.time(), 0.0, 0.85, 0.75)
+
+        # Producer cost: what add_ratio() pays per sample
+        count = args.samples
+        ratios = synthetic_ratios(count).tolist()
+        start_ts = time.time() - args.days * 86400
+        start = time.perf_counter()
+        for i, ratio in enumerate(ratios):
+            store.add_sample(start_ts + i, ratio)
+        queued_s = time.perf_counter() - start
+        store.flush()
+        while store.rows_written < count:
+            time.sleep(0.01)
+        written_s = time.perf_counter() - start
+        print(f"add_sample       : {queued_s / count * 1e6:.2f} us per call")
+        print(f"Write throughput : {count / written_s:,.0f} samples/s ({count} samples)")
+
+        # Fill the rest of the requested history one day at a time
+        day = synthetic_ratios(86400).tolist()
+        filled = count
+        total = int(args.days * 86400)
+        while filled < total:
+            batch = min(86400, total - filled)
+            base = start_ts + filled
+            for i in range(batch):
+                store.add_sample(base + i, day[i])
+            filled += batch
+            store.flush()
+            while store.rows_written < filled:
+                time.sleep(0.01)
+        store.end_session(time.time())
+        store.close()
+
+        size_mb = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)) / 1e6
+        start = time.perf_counter()
+        store = SessionStore(path)
+        reopen_s = time.perf_counter() - start
+        print(f"History on disk  : {filled:,} samples ({filled / 86400:.0f} days), {size_mb:.0f} MB")
+        print(f"Reopen time      : {reopen_s * 1000:.1f} ms")
+
+        # Cross-session queries; every completed hour is summarized once, a day per refresh()
+        from core.history_analytics import HistoryAnalytics
+        analytics = HistoryAnalytics(store)
+        end = time.time()
+        chunks = []
+        start = time.perf_counter()
+        more = True
+        while more:
+            chunk_start = time.perf_counter()
+            more = analytics.refresh()
+            chunks.append(time.perf_counter() - chunk_start)
+        print(f"Hourly backfill  : {(time.perf_counter() - start) * 1000:.0f} ms (once per file), "
+              f"{len(chunks)} chunks of at most {max(chunks) * 1000:.0f} ms")
+
+        # Opening the history page with nothing summarized: the backfill runs on its own thread
+        with analytics.connection:
+            analytics.connection.execute("DELETE FROM hourly_stats")
+        fresh = HistoryAnalytics(store)
+        start = time.perf_counter()
+        fresh.daily(end - 30 * 86400, end)
+        first_s = time.perf_counter() - start
+        while fresh.backfilling:
+            time.sleep(0.01)
+        print(f"First page open  : {first_s * 1000:.1f} ms on the GUI thread, "
+              f"backfill done after {(time.perf_counter() - start) * 1000:.0f} ms")
+        fresh.close()
+        for name, days in (("daily", 30), ("weekly", 90), ("hour_of_day", 90), ("daily", args.days)):
+            query = getattr(analytics, name)
+            wall_ms, cpu_ms = time_call(lambda: query(end - days * 86400, end), 20)
+            print(f"{name + f' ({days:.0f}d)':<17}: {wall_ms:.2f} ms wall, {cpu_ms:.2f} ms CPU")
+        analytics.close()
+        store.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def replay(args, max_interval=None, inference_size=None, model=None, posture_state=None, posts=None,
+           threshold=None):
+    """
+    Runs args.source through the real PoseDetectorThread loop on this thread.
+    Returns (detector, wall_s, verdicts) where verdicts maps frame number to
+    the last posture status shown for it. posture_state replaces the
+    detector's PostureDebouncer; every status post is appended to posts
+    (a list), if given. threshold overrides the good/bad threshold.
+    """
+    # Imported here so the other benchmarks don't pay for loading MediaPipe
+    from core.frame_sources import open_frame_source
+    from core.pose_detector_thread import PoseDetectorThread
+    from core.pipeline_metrics import PipelineMetrics
+
+    settings = isolated_settings()
+    data_manager = AppDataManager(settings)
+    source = open_frame_source(args.source, loop=args.loop, realtime=args.realtime,
+                               max_frames=args.frames)
+
+    detector = PoseDetectorThread(settings, data_manager, frame_source=source,
+                                  inference_mode=args.inference_mode)
+    if max_interval is not None:
+        detector.cadence.max_interval = max_interval
+    if inference_size is not None:
+        detector.roi.target_size = inference_size
+    if model is not None:
+        detector.configure_model(model, args.frame_budget or settings.get("frame_budget_ms"))
+    if posture_state is not None:
+        detector.posture_state = posture_state
+    if threshold is not None:
+        detector.current_threshold = lambda: threshold
+
+    # Warm up the graph so model loading isn't counted against the first frames
+    if args.warmup:
+        warmup = open_frame_source(args.source, max_frames=args.warmup)
+        detector.frame_source = warmup
+        detector.run()
+        detector.running = True
+        detector.frame_source = source
+        detector.presence.reset()
+        detector.cadence.reset()
+        detector.roi.reset()
+        detector.held_landmarks = None
+        detector.posture_state.reset()
+        detector.status.forget("posture")
+        detector.status.take()
+
+    detector.metrics = PipelineMetrics(window=None)
+    detector.presence.skipped = 0
+    detector.status.posted = detector.status.notified = 0
+    if getattr(args, "record", None):
+        from core.landmark_recording import LandmarkRecorder
+        detector.recorder = LandmarkRecorder(args.record)
+    if posts is not None:
+        post = detector.status.post
+        def recording_post(topic, *value):
+            posts.append((topic, value))
+            post(topic, *value)
+        detector.status.post = recording_post
+
+    transitions = {}
+    def on_status():
+        # Emitted on this thread, so this runs straight away
+        posture = detector.status.take().get("posture")
+        if posture:
+            transitions[detector.metrics.frames] = posture[0]
+    detector.status.changed.connect(on_status)
+    start = time.perf_counter()
+    detector.run() # Runs the loop synchronously until the source is exhausted
+    wall_s = time.perf_counter() - start
+
+    detector.release_estimator()
+    if getattr(args, "record", None):
+        print(f"Recorded {args.record}")
+    # Only changes are posted; carry each one forward to the frames after it
+    verdicts = {}
+    shown = None
+    for frame in range(detector.metrics.frames):
+        shown = transitions.get(frame, shown)
+        if shown:
+            verdicts[frame] = shown
+    return detector, wall_s, verdicts
+
+
+def bench_pipeline(args):
+    """Replays a source through the detector loop and reports throughput and stage timings."""
+    detector, wall_s, verdicts = replay(args, args.max_interval, args.inference_size, args.model)
+
+    print_pipeline_summary(detector.metrics.summary(), wall_s)
+    print(f"Inference skipped: {detector.presence.skipped} frames (nobody in view, no motion)")
+    print(f"Pose model       : {detector.model_name()}")
+    if detector.model_selector:
+        selector = detector.model_selector
+        timed = ", ".join(f"{detector.model_name(complexity)} {seconds * 1000:.1f}ms"
+                          for complexity, (seconds, _) in sorted(selector.measured.items()))
+        print(f"Auto model       : budget {selector.budget * 1000:.0f}ms; median inference {timed or '-'}")
+        if selector.unavailable:
+            print("Not loadable     : " + ", ".join(detector.model_name(c) for c in sorted(selector.unavailable)))
+
+    if args.check_cadence:
+        # Same frames again with a fresh inference on every one
+        baseline, _, baseline_verdicts = replay(args, max_interval=1, inference_size=args.inference_size,
+                                                   model=args.model)
+        frames = [frame for frame in baseline_verdicts if frame in verdicts]
+        agreeing = sum(verdicts[frame] == baseline_verdicts[frame] for frame in frames)
+        print()
+        print(f"Every-frame inference FPS: {baseline.metrics.inference_fps():.1f}")
+        if frames:
+            print(f"Verdict agreement: {agreeing / len(frames) * 100:.2f}% of {len(frames)} frames "
+                  f"({len(frames) - agreeing} differ)")
+        else:
+            print("Verdict agreement: no frames with a verdict in both runs")
+
+
+def bench_settings(args):
+    """
+    Per-frame cost of the settings reads the detector makes, from the
+    in-memory snapshot versus from QSettings (how every get() used to work),
+    and the cost of a slider drag calling set() on every tick.
+    """
+    # A temp INI file keeps the user's real settings out of it on every OS
+    settings = isolated_settings()
+    settings.set("baseline", 0.9)
+    settings.flush()
+    # What one classified frame on screen reads: the threshold (for the verdict
+    # and the cadence), the alert settings and the overlay switch
+    frame_keys = ("posture_strictness", "posture_strictness", "sound_enabled", "warning_wait", "show_overlay")
+
+    def read_frames(read):
+        for _ in range(args.frames):
+            for key in frame_keys:
+                read(key)
+
+    print(f"{len(frame_keys)} reads per frame, {args.frames} frames")
+    for label, read in (("QSettings", settings.read_stored), ("snapshot", settings.get)):
+        wall_ms, _ = time_call(lambda: read_frames(read), 3)
+        print(f"{label:<10}: {wall_ms / args.frames * 1000:8.2f} us per frame")
+
+    # A drag from one end of the threshold slider to the other
+    ticks = [value / 100.0 for value in range(50, 101)]
+    start = time.perf_counter()
+    for value in ticks:
+        settings.settings.setValue("posture_threshold", value)
+    settings.settings.sync()
+    direct_s = time.perf_counter() - start
+    start = time.perf_counter()
+    for value in ticks:
+        settings.set("posture_threshold", value)
+    set_s = time.perf_counter() - start
+    settings.flush()
+    print(f"Slider drag ({len(ticks)} ticks): {direct_s * 1000:.2f} ms writing QSettings on each tick, "
+          f"{set_s * 1000:.2f} ms in set() with one write afterwards")
+
+
+def bench_events(args):
+    """
+    Status traffic from the detector to the GUI for one replay: a queued
+    signal and label update per post (how every frame used to be reported)
+    versus the change-only StatusBus, without and with the PostureDebouncer.
+    GUI time is measured by applying the updates to a real PoseDetectorWidget.
+    """
+    from PyQt6.QtWidgets import QApplication
+    from core.posture_state import PostureDebouncer
+    from core.status_bus import StatusBus
+    from widgets.pose_detector_widget import PoseDetectorWidget
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    settings = isolated_settings()
+
+    runs = {}
+    for label, debouncer in (("raw", PostureDebouncer(hysteresis=0.0, dwell=0.0)),
+                             ("debounced", PostureDebouncer())):
+        posts = []
+        detector, wall_s, verdicts = replay(args, posture_state=debouncer, posts=posts, threshold=args.threshold)
+        runs[label] = (detector, wall_s, posts)
+
+    detector = runs["raw"][0]
+    page = PoseDetectorWidget(settings, AppDataManager(settings), worker=detector)
+    page.worker_started = True # Only the labels are needed, not the thread
+    page.resize(1200, 800)
+    page.show()
+    app.processEvents()
+
+    slots = {"posture": page.update_posture_label, "warning": page.update_warning_label,
+             "calibration": page.update_calibration_status, "features": page.update_features_label}
+
+    def apply(updates):
+        """Runs the label slot for each (topic, value), one event loop turn each; returns GUI seconds."""
+        start = time.perf_counter()
+        for topic, value in updates:
+            slots[topic](*value)
+            app.processEvents()
+        return time.perf_counter() - start
+
+    def changes(posts):
+        """What the change-only bus lets through."""
+        bus = StatusBus()
+        through = []
+        for topic, value in posts:
+            bus.post(topic, *value)
+            through.extend(bus.take().items())
+        return through
+
+    frames = detector.metrics.frames
+    print(f"{frames} frames per replay; GUI time applies the label updates to the pose page")
+    print(f"{'Delivery':<34}{'queued':>8}{'per s':>8}{'posture':>9}{'GUI ms':>9}")
+    rows = (("signal per post (before)", runs["raw"]),
+            ("change-only bus, raw verdict", runs["raw"]),
+            ("change-only bus, debounced", runs["debounced"]))
+    for index, (label, (run, wall_s, posts)) in enumerate(rows):
+        updates = posts if index == 0 else changes(posts)
+        posture = sum(topic == "posture" for topic, _ in updates)
+        gui_s = apply(updates)
+        print(f"{label:<34}{len(updates):>8}{len(updates) / wall_s:>8.1f}{posture:>9}{gui_s * 1000:>9.1f}")
+    page.close()
+
+
+def synthetic_recording(path, hours, fps, seed=0):
+    """
+    Writes a landmark recording of a made-up person: the posture ratio
+    drifts around 0.8 with per-frame jitter, and there is a 5-minute break
+    every 50 minutes. Returns the number of frames.
+    """
+    from core.landmark_recording import LandmarkRecorder
+
+    rng = np.random.default_rng(seed)
+    frames = int(hours * 3600 * fps)
+    start = time.time() - frames / fps
+    drift = 0.8 + np.cumsum(rng.normal(0, 0.002, frames)).clip(-0.3, 0.3)
+    ratios = drift + rng.normal(0, 0.02, frames)
+    pose = np.zeros((33, 4), dtype=np.float32)
+    pose[:, 3] = 1.0
+    pose[11, :2] = (0.6, 0.6) # Shoulders 0.2 apart
+    pose[12, :2] = (0.4, 0.6)
+
+    recorder = LandmarkRecorder(path)
+    for frame in range(frames):
+        t = frame / fps
+        if t % 3000 >= 2700:
+            recorder.add_array(start + t, None)
+            continue
+        pose[0, :2] = (0.5, 0.6 - ratios[frame] * 0.2)
+        recorder.add_array(start + t, pose)
+    recorder.close()
+    return frames
+
+
+def bench_landmarks(args):
+    """
+    Replays a landmark recording through scoring, debouncing, alerts and the
+    data manager without a camera or MediaPipe, and reports how much faster
+    than real time it ran.
+    """
+    from core.landmark_recording import open_recording
+    from core.replay import LandmarkReplay
+
+    directory = None
+    path = args.recording
+    if path is None:
+        directory = tempfile.mkdtemp(prefix="posture-landmarks-")
+        path = os.path.join(directory, "synthetic.poselm")
+        start = time.perf_counter()
+        frames = synthetic_recording(path, args.hours, args.fps)
+        print(f"Wrote {frames} synthetic frames ({args.hours:g} h at {args.fps} fps) "
+              f"in {time.perf_counter() - start:.2f}s")
+    try:
+        records = open_recording(path)
+        print(f"Recording        : {os.path.getsize(path) / 1e6:.1f} MB, {len(records)} frames")
+        if not len(records):
+            return
+
+        replay = LandmarkReplay(isolated_settings())
+        start = time.perf_counter()
+        replay.run(records)
+        wall_s = time.perf_counter() - start
+
+        recorded_s = float(records["time"][-1] - records["time"][0])
+        total_s, percent_good, longest_s, threshold = replay.data_manager.calculate_posture_stats()
+        print(f"Replayed         : {recorded_s / 3600:.2f} h in {wall_s:.2f}s "
+              f"({recorded_s / wall_s:.0f}x real time, {wall_s / replay.frames * 1e6:.1f} us per frame)")
+        print(f"Samples logged   : {len(replay.data_manager.posture_log)} (1 s averages)")
+        print(f"Good posture     : {percent_good:.1f}% (threshold {threshold:.3f}), "
+              f"longest streak {longest_s / 60:.1f} min")
+        print(f"Status changes   : {len(replay.transitions)}; alerts {replay.detector.alerts}")
+        del records
+    finally:
+        if directory:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def synthetic_landmarks(count, seed=0):
+    """
+    (count, 33, 4) float32 landmarks with varied nose and shoulder positions;
+    about 5% of the samples have no pose (NaN) and 5% narrow shoulders.
+    """
+    rng = np.random.default_rng(seed)
+    landmarks = np.zeros((count, 33, 4), dtype=np.float32)
+    landmarks[:, :, 3] = 1.0
+    width = rng.uniform(0.12, 0.35, count)
+    width[rng.random(count) < 0.05] = 0.05
+    center = rng.uniform(0.35, 0.65, count)
+    shoulder_y = rng.uniform(0.5, 0.8, count)
+    landmarks[:, 11, 0] = center + width / 2
+    landmarks[:, 12, 0] = center - width / 2
+    landmarks[:, 11, 1] = shoulder_y + rng.normal(0, 0.01, count)
+    landmarks[:, 12, 1] = shoulder_y + rng.normal(0, 0.01, count)
+    landmarks[:, 0, 0] = center
+    landmarks[:, 0, 1] = shoulder_y - width * rng.uniform(0.3, 1.1, count)
+    landmarks[rng.random(count) < 0.05] = np.nan
+    return landmarks
+
+
+def scalar_posture(landmarks):
+    """The per-frame formula read_posture() used before it wrapped score_posture()."""
+    nose = landmarks[0]
+    left_shoulder = landmarks[11]
+    right_shoulder = landmarks[12]
+    shoulder_Length = abs(left_shoulder.x - right_shoulder.x)
+    if shoulder_Length < 0.1:
+        return 0
+    return ((left_shoulder.y + right_shoulder.y) / 2 - nose.y) / shoulder_Length
+
+
+def bench_scoring(args):
+    """
+    Posture scoring throughput: the per-frame formula over landmark objects
+    vs score_posture() over (N, 33, 4) arrays. Large sizes are scored a chunk
+    at a time, reusing one chunk of data, as a replay of a memmap would.
+    """
+    from collections import namedtuple
+    from core.posture_scoring import score_posture
+
+    Landmark = namedtuple("Landmark", "x y z visibility")
+    array_chunk = synthetic_landmarks(args.chunk)
+    # Landmark objects cost far more memory than the array; a smaller chunk of them is reused
+    object_count = min(args.chunk, 10000)
+    object_chunk = [[Landmark(*row) for row in frame] for frame in array_chunk[:object_count].tolist()]
+
+    # Same ratios from both paths (no-pose frames are skipped by the detector, so not compared)
+    vector, valid = score_posture(array_chunk[:object_count])
+    present = ~np.isnan(vector)
+    scalar = np.array([scalar_posture(frame) for frame, ok in zip(object_chunk, present) if ok])
+    print(f"Scalar vs vector : max difference {np.abs(scalar - vector[present]).max():.3g}, "
+          f"{valid.mean() * 100:.1f}% valid, {(~present).mean() * 100:.1f}% no pose")
+
+    print(f"{'samples':>10}{'scalar s':>11}{'vector s':>11}{'scalar ns':>11}{'vector ns':>11}{'speedup':>9}")
+    for size in args.sizes:
+        start = time.perf_counter()
+        done = 0
+        while done < size:
+            count = min(object_count, size - done)
+            for frame in object_chunk[:count]:
+                if frame[0].x == frame[0].x: # The detector only scores frames with a pose
+                    scalar_posture(frame)
+            done += count
+        scalar_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        done = 0
+        while done < size:
+            count = min(args.chunk, size - done)
+            score_posture(array_chunk[:count])
+            done += count
+        vector_s = time.perf_counter() - start
+        print(f"{size:>10}{scalar_s:>11.3f}{vector_s:>11.3f}{scalar_s / size * 1e9:>11.1f}"
+              f"{vector_s / size * 1e9:>11.1f}{scalar_s / vector_s:>8.0f}x")
+
+    # The ratio plus every feature (core/posture_features.py), vectorized and for one live frame
+    from core.landmarks import array_to_landmark_list, landmarks_to_array
+    from core.posture_features import extract_features
+
+    features_ms, _ = time_call(lambda: extract_features(array_chunk), 10)
+    print(f"Ratio + features : {features_ms / args.chunk * 1e6:.1f} ns per sample over {args.chunk} samples")
+    frame = array_to_landmark_list(array_chunk[0]).landmark
+    score_ms, _ = time_call(lambda: score_posture(landmarks_to_array(frame)[np.newaxis]), 10000)
+    frame_ms, _ = time_call(lambda: extract_features(landmarks_to_array(frame)[np.newaxis], 16 / 9), 10000)
+    print(f"One live frame   : ratio {score_ms * 1000:.1f} us, ratio + features {frame_ms * 1000:.1f} us "
+          f"(incl. packing the landmark list)")
+
+
+def bench_whatif(args):
+    """
+    What-if threshold queries (the statistics page's slider): percent good
+    and longest streak from the ratio index vs a rescan of the log, with
+    the log full and evicting when --hours exceeds its 10 hours.
+    """
+    from core.session_stats import longest_true_run
+
+    data_manager = AppDataManager(isolated_settings())
+    seconds = int(args.hours * 3600)
+    start = time.perf_counter()
+    fill_history(data_manager, seconds)
+    fill_s = time.perf_counter() - start
+    print(f"Samples in log   : {len(data_manager.posture_log)} ({seconds} recorded, "
+          f"{fill_s / seconds * 1e6:.1f} us per record_sample incl. the index)")
+
+    thresholds = np.round(np.linspace(0.5, 1.2, args.thresholds), 2)
+
+    def rescan(threshold):
+        # What answering a slider move cost without the index
+        ratios = data_manager.published.read(lambda: data_manager.posture_log.ratios.copy())
+        good = ratios > threshold
+        return int(np.count_nonzero(good)), longest_true_run(good)
+
+    index = data_manager.ratio_index
+    mismatches = sum((index.good_count(t), index.longest_streak(t)) != rescan(t) for t in thresholds)
+    print(f"Index vs rescan  : {mismatches} of {len(thresholds)} thresholds differ")
+
+    for name, func in (("rescan", rescan), ("index", data_manager.stats_at_threshold)):
+        wall_ms, _ = time_call(lambda: [func(t) for t in thresholds], args.repeats)
+        print(f"{name:<17}: {wall_ms / len(thresholds) * 1000:.1f} us per threshold")
+
+
+def bench_episodes(args):
+    """
+    The episode index over weeks of samples: memory, per-sample cost and
+    range queries, against finding the same runs in the raw samples.
+    """
+    from core.episodes import BAD, EpisodeIndex
+
+    seconds = int(args.days * 86400)
+    end = time.time()
+    timestamps = end - seconds + np.arange(seconds, dtype=np.float64)
+    ratios = synthetic_ratios(seconds).astype(np.float32).astype(np.float64)
+    ratios[(np.arange(seconds) % 3600) >= 3300] = np.nan # 5 minutes away every hour
+    threshold = 0.75
+
+    episodes = EpisodeIndex()
+    start = time.perf_counter()
+    for t, ratio in zip(timestamps.tolist(), ratios.tolist()):
+        episodes.add(t, ratio, ratio > threshold)
+    add_s = time.perf_counter() - start
+    print(f"Samples          : {seconds} ({args.days:g} days), {len(episodes)} episodes kept "
+          f"(capacity {episodes.capacity}), {episodes.nbytes / 1e6:.1f} MB")
+    print(f"add()            : {add_s / seconds * 1e6:.2f} us per sample")
+
+    def from_index(span):
+        found = episodes.query(end - span, end)
+        bad = (found["state"] == BAD) & (found["duration"] >= 10)
+        return int(np.count_nonzero(bad))
+
+    def from_samples(span):
+        # Run lengths found again in the raw samples, as without the index
+        lo = np.searchsorted(timestamps, end - span)
+        window = ratios[lo:]
+        state = np.where(np.isnan(window), 0, np.where(window > threshold, 2, 1))
+        edges = np.flatnonzero(np.diff(state)) + 1
+        bounds = np.concatenate(([0], edges, [len(state)]))
+        lengths = np.diff(bounds)
+        return int(np.count_nonzero((state[bounds[:-1]] == 1) & (lengths >= 10)))
+
+    print(f"{'Range':<12}{'bad eps':>9}{'index ms':>10}{'samples ms':>12}")
+    for label, span in (("hour", 3600), ("day", 86400), ("week", 7 * 86400), ("all", seconds)):
+        span = min(span, seconds)
+        count = from_index(span)
+        if count != from_samples(span):
+            print(f"  mismatch over the last {label}: {count} vs {from_samples(span)}")
+        index_ms, _ = time_call(lambda: from_index(span), args.repeats)
+        samples_ms, _ = time_call(lambda: from_samples(span), args.repeats)
+        print(f"{label:<12}{count:>9}{index_ms:>10.3f}{samples_ms:>12.3f}")
+
+
+def letterbox(frame, width, height):
+    """Scales a frame to fit width x height and centres it on a gray canvas."""
+    import cv2
+    scale = min(width / frame.shape[1], height / frame.shape[0])
+    resized = cv2.resize(frame, (int(frame.shape[1] * scale), int(frame.shape[0] * scale)))
+    canvas = np.full((height, width, 3), 90, dtype=np.uint8)
+    y0 = (height - resized.shape[0]) // 2
+    x0 = (width - resized.shape[1]) // 2
+    canvas[y0:y0 + resized.shape[0], x0:x0 + resized.shape[1]] = resized
+    return canvas
+
+
+def seeded_pose():
+    """A centred head-and-shoulders pose (nose, eyes, ears, shoulders), as a landmark list."""
+    from core.landmarks import array_to_landmark_list
+
+    pose = np.zeros((33, 4), dtype=np.float32)
+    pose[:, 3] = 1.0
+    for index, (x, y) in {0: (0.50, 0.35), 2: (0.47, 0.32), 5: (0.53, 0.32), 7: (0.44, 0.34),
+                          8: (0.56, 0.34), 11: (0.62, 0.55), 12: (0.38, 0.55)}.items():
+        pose[index, :2] = x, y
+    return array_to_landmark_list(pose)
+
+
+def bench_roi(args):
+    """
+    Per-frame preprocessing and inference cost at 720p and 1080p capture,
+    sending MediaPipe the full frame versus the upper-body crop, plus how far
+    the posture ratios of the two runs differ. Frames with no pose in them
+    (e.g. the synthetic source) get a seeded crop, so its cost is still
+    measured; the ratio difference needs footage of a person.
+    """
+    from core.frame_sources import open_frame_source
+    from core.pose_detector_thread import PoseDetectorThread
+    from core.pose_estimator import create_pose_estimator
+    from core.roi import RoiCropper
+
+    source = open_frame_source(args.source, max_frames=args.frames)
+    source.open()
+    clip = []
+    while True:
+        ret, frame = source.read()
+        if not ret:
+            break
+        clip.append(frame)
+    source.release()
+
+    settings = isolated_settings()
+    scorer = PoseDetectorThread(settings, AppDataManager(settings)) # For read_posture()
+    mode = args.inference_mode or settings.get("inference_mode")
+    seed = seeded_pose()
+    print(f"{len(clip)} frames, {mode} inference; medians per frame")
+    print(f"{'Capture':<9}{'Input':>8}{'prep ms':>9}{'infer ms':>10}{'crop':>7}{'|d ratio|':>11}")
+    for width, height in ((1280, 720), (1920, 1080)):
+        frames = [letterbox(frame, width, height) for frame in clip]
+        baseline = None
+        for size in (0, args.inference_size):
+            estimator = create_pose_estimator(mode)
+            roi = RoiCropper(target_size=size)
+            prep, infer, ratios = [], [], []
+            cropped = seeded = 0
+            for frame in frames:
+                cropped += roi.box is not None
+                start = time.perf_counter()
+                image, transform = roi.prepare(frame)
+                crop_s = time.perf_counter() - start
+                results = estimator.process(image)
+                timings = results.timings
+                prep.append(crop_s + timings.get("convert", (0.0, 0.0))[0])
+                # In process mode the round trip also covers the copy into shared memory
+                infer.append(timings.get("roundtrip", timings.get("inference", (0.0, 0.0)))[0])
+                if results.pose_landmarks:
+                    roi.map_back(results.pose_landmarks, transform)
+                    ratios.append(scorer.read_posture(results.pose_landmarks.landmark))
+                else:
+                    ratios.append(np.nan)
+                if size and not results.pose_landmarks:
+                    seeded += 1 # Keeps the crop in use (and measured) without a person in view
+                    roi.track(seed, frame.shape)
+                else:
+                    roi.track(results.pose_landmarks, frame.shape)
+            estimator.close()
+
+            ratios = np.asarray(ratios)
+            if baseline is None:
+                baseline = ratios
+                difference = "-"
+            elif np.isnan(ratios - baseline).all():
+                difference = "no pose"
+            else:
+                difference = f"{np.nanmean(np.abs(ratios - baseline)):.4f}"
+            label = f"{size}px" if size else "full"
+            print(f"{str(height) + 'p':<9}{label:>8}{np.median(prep) * 1000:>9.2f}{np.median(infer) * 1000:>10.2f}"
+                  f"{cropped / len(frames):>7.0%}{difference:>11}")
+            if seeded:
+                print(f"{'':<9}({seeded} of {len(frames)} frames had no pose; their next crop was seeded)")
+
+
+def bench_overlay(args):
+    """
+    Per-frame cost of the overlay at 720p and 1080p capture: drawing on the
+    camera frame before scaling it for display (how it used to be done)
+    versus the compositor drawing on the display-sized frame, with the video
+    shown, hidden, and with the overlay turned off.
+    """
+    import cv2
+    import mediapipe as mp
+    from core.frame_sources import open_frame_source
+    from core.overlay import OverlayCompositor
+    from core.pose_estimator import create_pose_estimator
+
+    source = open_frame_source(args.source, max_frames=args.frames)
+    source.open()
+    clip = []
+    while True:
+        ret, frame = source.read()
+        if not ret:
+            break
+        clip.append(frame)
+    source.release()
+
+    estimator = create_pose_estimator("thread")
+    poses = [estimator.process(frame).pose_landmarks for frame in clip]
+    estimator.close()
+    ratios = [0.6 + 0.4 * (i % 50) / 50 for i in range(len(clip))] # Varying label text
+    connections = mp.solutions.pose.POSE_CONNECTIONS
+    display_w, display_h = (int(v) for v in args.display.split("x"))
+
+    def legacy(frame, landmarks, ratio, shown):
+        # The old order: draw on the camera frame, then scale for display if shown
+        if landmarks:
+            mp.solutions.drawing_utils.draw_landmarks(frame, landmarks, connections)
+        cv2.putText(frame, f"Posture Ratio: {ratio:.2f}", (30, 80), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        cv2.putText(frame, "Good posture", (30, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+        if shown:
+            display(frame, None)
+
+    def display(frame, compositor):
+        scale = min(display_w / frame.shape[1], display_h / frame.shape[0])
+        size = (int(frame.shape[1] * scale), int(frame.shape[0] * scale))
+        buffer = cv2.resize(frame, size, interpolation=cv2.INTER_LINEAR)
+        if compositor:
+            compositor.draw(buffer, frame.shape[1])
+        cv2.cvtColor(buffer, cv2.COLOR_BGR2RGB, dst=buffer)
+
+    def composited(frame, landmarks, ratio, shown, enabled=True):
+        compositor.enabled = enabled
+        compositor.update(landmarks, ratio, True)
+        if shown:
+            display(frame, compositor)
+
+    print(f"{len(clip)} frames, display area {args.display}; median ms per frame (overlay + display scaling)")
+    print(f"{'Capture':<9}{'Method':<26}{'shown':>8}{'hidden':>8}")
+    for width, height in ((1280, 720), (1920, 1080)):
+        frames = [letterbox(frame, width, height) for frame in clip]
+        compositor = OverlayCompositor()
+        compositor.connections = np.array(sorted(connections))
+        methods = (("draw on camera frame", legacy),
+                   ("compositor", composited),
+                   ("compositor, overlay off", lambda *a: composited(*a, enabled=False)))
+        for label, method in methods:
+            times = {}
+            for shown in (True, False):
+                samples = []
+                for frame, landmarks, ratio in zip(frames, poses, ratios):
+                    frame = frame.copy() # Drawing would otherwise accumulate
+                    start = time.perf_counter()
+                    method(frame, landmarks, ratio, shown)
+                    samples.append(time.perf_counter() - start)
+                times[shown] = np.median(samples) * 1000
+            print(f"{str(height) + 'p':<9}{label:<26}{times[True]:>8.2f}{times[False]:>8.2f}")
+
+
+def bench_gui(args):
+    """
+    Runs the detector thread next to a live Qt event loop (video label plus a
+    statistics page redrawing every second) and measures how regularly the
+    GUI thread gets to run, once per inference mode.
+    """
+    from PyQt6.QtCore import QEventLoop, QTimer
+    from PyQt6.QtWidgets import QApplication
+    from core.frame_sources import open_frame_source
+    from core.pose_detector_thread import PoseDetectorThread
+    from widgets.pose_detector_widget import PoseDetectorWidget
+    from widgets.stats_widget import StatisticsWidget
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    settings = isolated_settings()
+
+    print(f"{'Mode':<10}{'infer fps':>10}{'disp fps':>10}{'gui p50':>10}{'gui p95':>10}{'gui max':>10}{'late %':>8}")
+    for mode in args.modes:
+        data_manager = AppDataManager(settings)
+        # An hour of history so the stats page redraw has realistic cost
+        fill_history(data_manager, 3600)
+
+        stats_page = StatisticsWidget(settings, data_manager)
+        stats_page.show()
+
+        source = open_frame_source(args.source, loop=True, realtime=True)
+        detector = PoseDetectorThread(settings, data_manager, frame_source=source,
+                                      inference_mode=mode)
+        pose_page = PoseDetectorWidget(settings, data_manager, worker=detector)
+        pose_page.resize(1200, 800) # Same size as the main window
+        pose_page.show() # Starts the thread
+
+        # GUI frame time: how late a 16ms timer actually fires
+        ticks = []
+        last_tick = [time.perf_counter()]
+        def on_tick():
+            now_tick = time.perf_counter()
+            ticks.append(now_tick - last_tick[0])
+            last_tick[0] = now_tick
+        frame_timer = QTimer()
+        frame_timer.timeout.connect(on_tick)
+        frame_timer.start(16)
+
+        redraw_timer = QTimer()
+        redraw_timer.timeout.connect(stats_page.update_graph)
+        redraw_timer.start(1000)
+
+        loop = QEventLoop()
+        # Let the model load before measuring
+        while detector.metrics.frames < 5 and detector.isRunning():
+            app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 50)
+        ticks.clear()
+        detector.metrics.reset()
+        displayed_before = detector.display.delivered
+        last_tick[0] = time.perf_counter()
+        QTimer.singleShot(int(args.seconds * 1000), loop.quit)
+        loop.exec()
+
+        frame_timer.stop()
+        redraw_timer.stop()
+        pose_page.stop_worker_thread()
+        pose_page.close()
+        stats_page.close()
+
+        gui_ms = np.asarray(ticks) * 1000.0
+        late = 100.0 * np.mean(gui_ms > 33.0) if len(gui_ms) else 0.0
+        display_fps = (detector.display.delivered - displayed_before) / args.seconds
+        print(f"{mode:<10}{detector.metrics.fps():>10.1f}{display_fps:>10.1f}{np.percentile(gui_ms, 50):>10.1f}"
+              f"{np.percentile(gui_ms, 95):>10.1f}{gui_ms.max():>10.1f}{late:>8.1f}")
+
+
+def bench_power(args):
+    """CPU use and classification rate of the detector in each power mode."""
+    from core.frame_sources import open_frame_source
+    from core.pose_detector_thread import PoseDetectorThread
+    from core.power_modes import PowerMode
+
+    settings = isolated_settings()
+    data_manager = AppDataManager(settings)
+    source = open_frame_source(args.source, loop=True, realtime=True)
+    detector = PoseDetectorThread(settings, data_manager, frame_source=source,
+                                  inference_mode=args.inference_mode)
+    detector.display.set_target_size(960, 540) # As if the video label were showing
+    detector.start()
+    while detector.metrics.frames < 5 and detector.isRunning():
+        time.sleep(0.1) # Model loading
+
+    print(f"{'Mode':<12}{'frames/s':>10}{'CPU %':>8}")
+    for mode in (PowerMode.FOREGROUND, PowerMode.BACKGROUND, PowerMode.PAUSED):
+        detector.power.set_mode(mode, args.background_fps)
+        time.sleep(1.0) # Let the previous mode's frames drain
+        frames_before = detector.metrics.frames
+        cpu_start = time.process_time() # All threads of this process
+        wall_start = time.perf_counter()
+        time.sleep(args.seconds)
+        wall_s = time.perf_counter() - wall_start
+        cpu_percent = (time.process_time() - cpu_start) / wall_s * 100.0
+        print(f"{mode:<12}{(detector.metrics.frames - frames_before) / wall_s:>10.1f}{cpu_percent:>8.1f}")
+
+    detector.stop()
+    detector.wait()
+    detector.release_estimator()
+
+
+def bench_startup(args):
+    """
+    Time to first window and to first classified frame, each run in a fresh
+    interpreter so imports are counted. The pose page is opened as soon as
+    the window is up.
+    """
+    if args.child:
+        return startup_child(args)
+
+    command = [sys.executable, os.path.abspath(__file__), "startup", "--child",
+               "--source", args.source, "--timeout", str(args.timeout)]
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.run(command, capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        runs.append({name: float(seconds) for name, seconds in
+                     re.findall(r"^Startup: (.+) after ([0-9.]+)s$", output, re.MULTILINE)})
+
+    for name in ("first window", "first processed frame", "first classified frame"):
+        times = [run[name] for run in runs if name in run]
+        if times:
+            print(f"{name:<23}: median {statistics.median(times):.2f}s  "
+                  f"(min {min(times):.2f}s, {len(times)}/{len(runs)} runs)")
+        else:
+            print(f"{name:<23}: not reached (no pose in the source?)")
+
+
+def startup_child(args):
+    """One startup: window, then the pose page, until a classified frame or the timeout."""
+    from PyQt6.QtCore import QEventLoop
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication(sys.argv[:1])
+    from main_window import MainAppWindow
+
+    directory = tempfile.mkdtemp(prefix="posture_startup_")
+    try:
+        window = MainAppWindow(store_path=os.path.join(directory, "history.sqlite3"),
+                               settings=isolated_settings())
+        window.show()
+        while "first window" not in startup_metrics.milestones():
+            app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 10)
+
+        from core.frame_sources import open_frame_source
+        window.frame_source = open_frame_source(args.source, loop=True, realtime=True)
+        window.go_to_pose_detector()
+        deadline = time.perf_counter() + args.timeout
+        while ("first classified frame" not in startup_metrics.milestones()
+               and time.perf_counter() < deadline):
+            app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 10)
+        window.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    pipeline = subparsers.add_parser("pipeline", help="capture -> pose -> classify throughput")
+    pipeline.add_argument("--source", default="synthetic",
+                          help="video file, image folder, camera index or synthetic[:WxH]")
+    pipeline.add_argument("--frames", type=int, default=None,
+                          help="stop after this many frames")
+    pipeline.add_argument("--warmup", type=int, default=10,
+                          help="frames to run before measuring")
+    pipeline.add_argument("--loop", action="store_true", help="loop finite sources")
+    pipeline.add_argument("--realtime", action="store_true",
+                          help="pace file sources at their native frame rate")
+    pipeline.add_argument("--inference-mode", choices=["thread", "process"], default=None,
+                          help="override the inference_mode setting")
+    pipeline.add_argument("--max-interval", type=int, default=None,
+                          help="override the cadence_max_interval setting (1 = inference on every frame)")
+    pipeline.add_argument("--inference-size", type=int, default=None,
+                          help="override the inference_size setting (0 = full camera frames)")
+    pipeline.add_argument("--model", choices=["auto", "lite", "full", "heavy"], default=None,
+                          help="override the model_complexity setting")
+    pipeline.add_argument("--frame-budget", type=float, default=None,
+                          help="override the frame_budget_ms setting (used by --model auto)")
+    pipeline.add_argument("--record", default=None,
+                          help="write the measured run's landmarks to this recording file")
+    pipeline.add_argument("--check-cadence", action="store_true",
+                          help="replay again with inference on every frame and compare verdicts")
+    pipeline.set_defaults(func=bench_pipeline)
+
+    gui = subparsers.add_parser("gui", help="GUI frame time and inference FPS per inference mode")
+    gui.add_argument("--source", default="synthetic:1280x720",
+                     help="video file, image folder, camera index or synthetic[:WxH]")
+    gui.add_argument("--seconds", type=float, default=10.0, help="measurement time per mode")
+    gui.add_argument("--modes", nargs="+", choices=["thread", "process"],
+                     default=["thread", "process"])
+    gui.set_defaults(func=bench_gui)
+
+    datalog = subparsers.add_parser("datalog", help="posture history memory and per-tick cost")
+    datalog.add_argument("--hours", type=float, default=10.0, help="hours of 1-second samples")
+    datalog.add_argument("--repeats", type=int, default=200, help="calls timed per operation")
+    datalog.set_defaults(func=bench_datalog)
+
+    store = subparsers.add_parser("store", help="on-disk history throughput, reopen time and analytics queries")
+    store.add_argument("--days", type=float, default=365.0, help="days of 1-second history to build")
+    store.add_argument("--samples", type=int, default=200000, help="samples used for the throughput test")
+    store.set_defaults(func=bench_store)
+
+    power = subparsers.add_parser("power", help="CPU use per power mode (foreground/background/paused)")
+    power.add_argument("--source", default="synthetic:1280x720",
+                       help="video file, image folder, camera index or synthetic[:WxH]")
+    power.add_argument("--seconds", type=float, default=10.0, help="measurement time per mode")
+    power.add_argument("--background-fps", type=float, default=2.0, help="classification rate in the background")
+    power.add_argument("--inference-mode", choices=["thread", "process"], default=None,
+                       help="override the inference_mode setting")
+    power.set_defaults(func=bench_power)
+
+    roi = subparsers.add_parser("roi", help="preprocessing and inference cost with and without the ROI crop")
+    roi.add_argument("--source", default="synthetic",
+                     help="video file or image folder (rescaled to 720p and 1080p)")
+    roi.add_argument("--frames", type=int, default=120, help="frames used from the source")
+    roi.add_argument("--inference-size", type=int, default=256, help="ROI input size to compare")
+    roi.add_argument("--inference-mode", choices=["thread", "process"], default=None,
+                     help="override the inference_mode setting")
+    roi.set_defaults(func=bench_roi)
+
+    overlay = subparsers.add_parser("overlay", help="overlay drawing cost on the camera frame vs at display size")
+    overlay.add_argument("--source", default="synthetic",
+                         help="video file or image folder (rescaled to 720p and 1080p)")
+    overlay.add_argument("--frames", type=int, default=120, help="frames used from the source")
+    overlay.add_argument("--display", default="800x450", help="size of the video area, WxH")
+    overlay.set_defaults(func=bench_overlay)
+
+    landmarks = subparsers.add_parser("landmarks", help="replay a landmark recording faster than real time")
+    landmarks.add_argument("--recording", default=None,
+                           help="recording to replay (default: a synthetic one)")
+    landmarks.add_argument("--hours", type=float, default=1.0, help="length of the synthetic recording")
+    landmarks.add_argument("--fps", type=int, default=30, help="frame rate of the synthetic recording")
+    landmarks.set_defaults(func=bench_landmarks)
+
+    scoring = subparsers.add_parser("scoring", help="posture scoring and features, per frame vs vectorized")
+    scoring.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 10000000],
+                         help="samples to score")
+    scoring.add_argument("--chunk", type=int, default=100000, help="samples scored per score_posture() call")
+    scoring.set_defaults(func=bench_scoring)
+
+    whatif = subparsers.add_parser("whatif", help="what-if threshold queries, ratio index vs rescan")
+    whatif.add_argument("--hours", type=float, default=12.0, help="history to load (the log keeps 10 h)")
+    whatif.add_argument("--thresholds", type=int, default=71, help="thresholds queried per pass")
+    whatif.add_argument("--repeats", type=int, default=20, help="passes to time")
+    whatif.set_defaults(func=bench_whatif)
+
+    episodes = subparsers.add_parser("episodes", help="episode index memory, cost and queries over weeks")
+    episodes.add_argument("--days", type=float, default=7.0, help="days of 1-second samples")
+    episodes.add_argument("--repeats", type=int, default=20, help="calls timed per query")
+    episodes.set_defaults(func=bench_episodes)
+
+    settings_parser = subparsers.add_parser("settings", help="per-frame settings read cost, snapshot vs QSettings")
+    settings_parser.add_argument("--frames", type=int, default=10000, help="frames of reads to time")
+    settings_parser.set_defaults(func=bench_settings)
+
+    events = subparsers.add_parser("events", help="status updates sent to the GUI: per frame vs change-only")
+    events.add_argument("--source", default="synthetic",
+                        help="video file, image folder, camera index or synthetic[:WxH]")
+    events.add_argument("--frames", type=int, default=None, help="stop after this many frames")
+    events.add_argument("--warmup", type=int, default=10, help="frames to run before measuring")
+    events.add_argument("--loop", action="store_true", help="loop finite sources")
+    events.add_argument("--realtime", action="store_true",
+                        help="pace file sources at their native frame rate")
+    events.add_argument("--threshold", type=float, default=None,
+                        help="good/bad threshold to use (near the clip's posture ratio shows flapping)")
+    events.set_defaults(func=bench_events, inference_mode=None, model=None)
+
+    startup = subparsers.add_parser("startup", help="time to first window and first classified frame")
+    startup.add_argument("--source", default="synthetic",
+                         help="video file, image folder, camera index or synthetic[:WxH]")
+    startup.add_argument("--runs", type=int, default=3, help="fresh app launches to time")
+    startup.add_argument("--timeout", type=float, default=30.0,
+                         help="seconds to wait for a classified frame per run")
+    startup.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    startup.set_defaults(func=bench_startup)
+
+    args = parser.parse_args(argv)
+    if args.command not in ("gui", "startup", "events"):
+        app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
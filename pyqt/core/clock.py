@@ -0,0 +1,34 @@
+"""
+Clocks for the detector and data manager. Both take one as `clock=` and use
+it for everything that decides behaviour (1-second averaging, alert
+cooldowns, presence and debounce timing), so a landmark recording can be
+replayed faster than real time on a ReplayClock (see core/replay.py).
+Measurements of how long work took keep using time.perf_counter().
+"""
+import time
+
+
+class SystemClock:
+    def time(self):
+        """Wall-clock seconds since the epoch."""
+        return time.time()
+
+    def monotonic(self):
+        """Seconds for measuring intervals; never goes backwards."""
+        return time.perf_counter()
+
+
+class ReplayClock:
+    """A clock that only moves when set(); both readings are the recorded time."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def set(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
@@ -0,0 +1,43 @@
+import numpy as np
+
+
+def minmax_downsample(x, y, columns):
+    """
+    Reduces (x, y) to at most 2 * columns points by keeping the minimum and
+    maximum of each group of consecutive points, in x order. Spikes and dips
+    survive, so the line looks the same at screen resolution.
+    NaN values (gaps) are ignored within a group; an all-NaN group stays a gap.
+    """
+    n = len(y)
+    columns = max(int(columns), 1)
+    if n <= 2 * columns:
+        return x, y
+
+    per_column = -(-n // columns) # ceil
+    full = (n // per_column) * per_column
+    xs = [x[:full].reshape(-1, per_column)]
+    ys = [y[:full].reshape(-1, per_column)]
+    if full < n:
+        # Pad the last partial group with its own last value
+        tail = per_column - (n - full)
+        xs.append(np.pad(x[full:], (0, tail), mode="edge")[None, :])
+        ys.append(np.pad(y[full:], (0, tail), mode="edge")[None, :])
+    groups_x = np.concatenate(xs)
+    groups_y = np.concatenate(ys)
+
+    missing = np.isnan(groups_y)
+    min_idx = np.where(missing, np.inf, groups_y).argmin(axis=1)
+    max_idx = np.where(missing, -np.inf, groups_y).argmax(axis=1)
+
+    # Emit each group's two extremes in the order they occur
+    first = np.minimum(min_idx, max_idx)
+    second = np.maximum(min_idx, max_idx)
+    picks = np.stack([first, second], axis=1)
+    rows = np.arange(len(groups_y))[:, None]
+
+    out_x = groups_x[rows, picks].ravel()
+    out_y = groups_y[rows, picks].ravel().astype(np.float64)
+    all_missing = missing.all(axis=1)
+    if all_missing.any():
+        out_y.reshape(-1, 2)[all_missing] = np.nan
+    return out_x, out_y
@@ -0,0 +1,119 @@
+import math
+
+import numpy as np
+
+# Episode states
+ABSENT = 0
+BAD = 1
+GOOD = 2
+
+
+class EpisodeIndex:
+    """
+    Run-length index of the 1-second samples: consecutive samples in the same
+    state (good, bad or absent) make one episode, with its start, end,
+    sample count, ratio sum and lowest ratio. Like the rollups, a sample is
+    judged against the threshold in force when it arrived, so the index
+    never has to go back to the samples.
+
+    The newest episode is extended in place and a change of state opens a
+    new one, so adding a sample is O(1). Gaps between samples (e.g. while
+    paused) count as absent. The newest `capacity` episodes are kept, each
+    written twice like in PostureRingBuffer, so queries get contiguous
+    oldest-to-newest columns and find a time range by binary search.
+    """
+    # Gaps longer than this between samples are counted as time without a pose
+    SAMPLE_INTERVAL = 1.0
+
+    def __init__(self, capacity=100000):
+        self.capacity = capacity
+        self._starts = np.zeros(capacity * 2, dtype=np.float64)
+        self._ends = np.zeros(capacity * 2, dtype=np.float64)
+        self._states = np.zeros(capacity * 2, dtype=np.int8)
+        self._counts = np.zeros(capacity * 2, dtype=np.int32)
+        self._sums = np.zeros(capacity * 2, dtype=np.float64)
+        self._mins = np.zeros(capacity * 2, dtype=np.float32)
+        self.head = 0 # Slot of the oldest episode
+        self.size = 0
+        self.state = None # State of the newest episode
+
+    def __len__(self):
+        return self.size
+
+    def add(self, timestamp, ratio, is_good):
+        """Adds a 1-second sample; a NaN ratio (nobody there) is an absent second."""
+        if math.isnan(ratio):
+            state = ABSENT
+        else:
+            state = GOOD if is_good else BAD
+
+        if self.size:
+            newest = self._slot(self.size - 1)
+            last_end = self._ends[newest]
+            if timestamp < last_end - self.SAMPLE_INTERVAL:
+                return # Out-of-order sample older than the open episode
+            if timestamp - last_end >= self.SAMPLE_INTERVAL:
+                # Nothing recorded in between: absent
+                if self.state != ABSENT:
+                    self._open(ABSENT, last_end)
+                self._extend(timestamp, math.nan)
+        if state != self.state:
+            self._open(state, timestamp)
+        self._extend(timestamp + self.SAMPLE_INTERVAL, ratio)
+
+    def _slot(self, index):
+        return (self.head + index) % self.capacity
+
+    def _open(self, state, start):
+        if self.size < self.capacity:
+            slot = self._slot(self.size)
+            self.size += 1
+        else:
+            slot = self.head
+            self.head = (self.head + 1) % self.capacity
+        for column, value in ((self._starts, start), (self._ends, start), (self._states, state),
+                              (self._counts, 0), (self._sums, 0.0), (self._mins, np.inf)):
+            column[slot] = column[slot + self.capacity] = value
+        self.state = state
+
+    def _extend(self, end, ratio):
+        """Extends the newest episode to end, adding a ratio unless it is NaN."""
+        slot = self._slot(self.size - 1)
+        for offset in (slot, slot + self.capacity):
+            self._ends[offset] = end
+            if not math.isnan(ratio):
+                self._counts[offset] += 1
+                self._sums[offset] += ratio
+                self._mins[offset] = min(self._mins[offset], ratio)
+
+    def query(self, start, end):
+        """
+        Episodes overlapping [start, end), oldest first, as a dict of arrays
+        (copies): start, end, duration, state, count, mean, min. The first and
+        last episode may reach outside the range; the last one may still grow.
+        """
+        starts = self._starts[self.head:self.head + self.size]
+        ends = self._ends[self.head:self.head + self.size]
+        lo = np.searchsorted(ends, start, side="right")
+        hi = np.searchsorted(starts, end, side="left")
+        hi = max(lo, hi)
+        window = slice(self.head + lo, self.head + hi)
+        counts = self._counts[window].copy()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = self._sums[window] / counts
+        mins = self._mins[window].astype(np.float64)
+        mins[counts == 0] = np.nan
+        return {
+            "start": self._starts[window].copy(),
+            "end": self._ends[window].copy(),
+            "duration": self._ends[window] - self._starts[window],
+            "state": self._states[window].copy(),
+            "count": counts,
+            "mean": means,
+            "min": mins,
+        }
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in
+                   (self._starts, self._ends, self._states, self._counts, self._sums, self._mins))
@@ -0,0 +1,147 @@
+import threading
+import time
+
+from core.power_modes import PowerMode
+
+
+class LatestFrameMailbox:
+    """
+    Single-slot hand-off between the capture thread and the detector loop.
+    The capture side always overwrites the slot, so the detector only ever
+    sees the freshest frame; frames overwritten before being taken are counted
+    as dropped.
+
+    With drop_stale=False the capture side waits for each frame to be taken
+    instead, which is what the benchmark wants for un-paced file sources.
+    """
+
+    def __init__(self, drop_stale=True):
+        self.drop_stale = drop_stale
+        self._cond = threading.Condition()
+        self._frame = None
+        self._timestamp = 0.0
+        self._seq = 0
+        self._taken_seq = 0
+        self.closed = False
+        self.dropped = 0
+        self.delivered = 0
+
+    def put(self, frame, timestamp):
+        """Publishes a frame captured at `timestamp` (perf_counter seconds)."""
+        with self._cond:
+            if not self.drop_stale:
+                while self._seq != self._taken_seq and not self.closed:
+                    self._cond.wait()
+            elif self._seq != self._taken_seq:
+                self.dropped += 1 # Previous frame was never picked up
+
+            self._frame = frame
+            self._timestamp = timestamp
+            self._seq += 1
+            self._cond.notify_all()
+
+    def take(self, timeout=None):
+        """
+        Waits for a frame newer than the last one taken.
+        Returns (frame, timestamp) or None on timeout / once closed and empty.
+        """
+        with self._cond:
+            if self._seq == self._taken_seq and not self.closed:
+                self._cond.wait(timeout)
+            if self._seq == self._taken_seq:
+                return None
+
+            self._taken_seq = self._seq
+            self.delivered += 1
+            frame = self._frame
+            self._frame = None
+            self._cond.notify_all()
+            return frame, self._timestamp
+
+    def close(self):
+        """Wakes up both sides; take() returns None once the last frame is gone."""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class CaptureThread(threading.Thread):
+    """
+    Reads a FrameSource as fast as it produces frames and posts them into a
+    LatestFrameMailbox together with their capture time, so a slow detector
+    never works through a backlog of stale camera frames.
+
+    With a PowerScheduler, reads are spaced out in the background and stop
+    (releasing a camera) while paused.
+    """
+    # A camera that keeps failing reads is treated as disconnected
+    READ_RETRY_DELAY = 0.05
+    MAX_READ_FAILURES = 20
+
+    def __init__(self, source, mailbox, metrics=None, on_disconnect=None, scheduler=None):
+        super().__init__(name="FrameCapture", daemon=True)
+        self.source = source
+        self.mailbox = mailbox
+        self.metrics = metrics
+        self.on_disconnect = on_disconnect
+        self.scheduler = scheduler
+        self.running = True
+
+    def stopped(self):
+        return not self.running
+
+    def run(self):
+        failures = 0
+        while self.running:
+            if self.scheduler:
+                mode = self.scheduler.wait_for_capture(self.stopped)
+                if mode is None:
+                    break
+                if mode == PowerMode.PAUSED:
+                    self.pause()
+                    continue
+
+            if not self.source.is_opened():
+                if self.source.exhausted or not self.source.is_live:
+                    break
+                if self.on_disconnect:
+                    self.on_disconnect()
+                self.source.reconnect()
+                time.sleep(1)
+                continue
+
+            if self.metrics:
+                with self.metrics.stage("capture"):
+                    ret, frame = self.source.read()
+            else:
+                ret, frame = self.source.read()
+            captured_at = time.perf_counter()
+
+            if not ret:
+                if self.source.exhausted:
+                    break # End of a recorded clip / image folder
+                failures += 1
+                if failures >= self.MAX_READ_FAILURES and self.source.is_live:
+                    failures = 0
+                    self.source.release() # Reconnects on the next pass
+                time.sleep(self.READ_RETRY_DELAY) # Don't spin on a failing camera
+                continue
+            failures = 0
+
+            self.mailbox.put(frame, captured_at)
+
+        self.mailbox.close()
+
+    def pause(self):
+        """Waits out PAUSED mode; a camera is closed meanwhile (so its light goes off)."""
+        if self.source.is_live:
+            self.source.release()
+        self.scheduler.wait_while_paused(self.stopped)
+        if self.source.is_live and self.running:
+            self.source.open()
+
+    def stop(self):
+        self.running = False
+        self.mailbox.close()
+        if self.scheduler:
+            self.scheduler.wake()
@@ -0,0 +1,85 @@
+import threading
+
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class FrameChannel(QObject):
+    """
+    Hands display-ready frames from the detector thread to the GUI.
+
+    A fixed pool of three buffers is cycled between the writer, one pending
+    frame and the frame currently on screen. Publishing replaces any frame
+    the GUI hasn't picked up yet (latest wins), and frame_available is only
+    emitted when nothing was pending, so at most one notification is ever
+    queued no matter how far behind the GUI falls.
+    """
+    frame_available = pyqtSignal()
+
+    SLOTS = 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._buffers = [None] * self.SLOTS
+        self._free = list(range(self.SLOTS))
+        self._pending = None
+        self._displayed = None
+        # Size of the area the frame is shown in; (0, 0) means nothing is shown
+        self._target_size = (0, 0)
+        self.published = 0
+        self.delivered = 0
+        self.replaced = 0
+
+    # --- GUI side ---
+    def set_target_size(self, width, height):
+        self._target_size = (max(int(width), 0), max(int(height), 0))
+
+    def take(self):
+        """Returns the newest undisplayed RGB frame (valid until the next take), or None."""
+        with self._lock:
+            slot = self._pending
+            if slot is None:
+                return None
+            self._pending = None
+            if self._displayed is not None:
+                self._free.append(self._displayed)
+            self._displayed = slot
+            self.delivered += 1
+            return self._buffers[slot]
+
+    # --- Worker side ---
+    def fitted_size(self, frame_shape):
+        """
+        Size (width, height) a frame of frame_shape should be scaled to so it
+        fits the target area with its aspect ratio kept, or None if no frame
+        is currently being displayed.
+        """
+        target_w, target_h = self._target_size
+        if target_w <= 0 or target_h <= 0:
+            return None
+        frame_h, frame_w = frame_shape[:2]
+        scale = min(target_w / frame_w, target_h / frame_h)
+        return max(int(frame_w * scale), 1), max(int(frame_h * scale), 1)
+
+    def acquire(self, size):
+        """Returns (slot, buffer) with a reusable (h, w, 3) uint8 buffer for the given size."""
+        width, height = size
+        with self._lock:
+            slot = self._free.pop()
+        buffer = self._buffers[slot]
+        if buffer is None or buffer.shape[:2] != (height, width):
+            buffer = self._buffers[slot] = np.empty((height, width, 3), dtype=np.uint8)
+        return slot, buffer
+
+    def publish(self, slot):
+        """Makes a filled buffer the pending frame, replacing any older one."""
+        with self._lock:
+            notify = self._pending is None
+            if not notify:
+                self._free.append(self._pending)
+                self.replaced += 1
+            self._pending = slot
+            self.published += 1
+        if notify:
+            self.frame_available.emit()
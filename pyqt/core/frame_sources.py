@@ -0,0 +1,281 @@
+import glob
+import os
+import time
+
+import cv2
+import numpy as np
+
+
+class FrameSource:
+    """
+    Base class for anything the pose detector can pull frames from.
+    Mirrors the small part of cv2.VideoCapture the detector actually uses.
+    """
+    # Live sources (cameras) keep producing frames and may need reconnecting.
+    # Finite sources (files, image folders) end once they are exhausted.
+    is_live = False
+
+    def __init__(self):
+        self.exhausted = False
+
+    def open(self):
+        """Opens the underlying device/file. Returns True on success."""
+        return True
+
+    @property
+    def paced(self):
+        """True if frames arrive at a fixed rate regardless of how fast they are read."""
+        return self.is_live
+
+    def is_opened(self):
+        return True
+
+    def read(self):
+        """Returns (ret, frame) just like cv2.VideoCapture.read()."""
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+    def reconnect(self):
+        """Releases and re-opens the source."""
+        self.release()
+        return self.open()
+
+
+class WebcamSource(FrameSource):
+    """A local camera, opened through cv2.VideoCapture."""
+    is_live = True
+
+    def __init__(self, index=0, width=None, height=None):
+        super().__init__()
+        self.index = index
+        self.width = width
+        self.height = height
+        self.cap = None
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.index)
+        # Keep only the newest frame queued, so a slow (background) reader isn't handed stale ones
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        if self.width:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        if self.height:
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        return self.cap.isOpened()
+
+    def is_opened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def read(self):
+        return self.cap.read()
+
+    def release(self):
+        if self.cap:
+            self.cap.release()
+
+    def reconnect(self):
+        self.release()
+        time.sleep(0.5)
+        return self.open()
+
+
+class VideoFileSource(FrameSource):
+    """
+    A recorded clip. By default frames are returned as fast as they can be
+    decoded; with realtime=True reads are paced to the clip's own frame rate
+    so the file behaves like a camera.
+    """
+
+    def __init__(self, path, loop=False, realtime=False, max_frames=None):
+        super().__init__()
+        self.path = path
+        self.loop = loop
+        self.realtime = realtime
+        self.max_frames = max_frames
+        self.cap = None
+        self.frame_interval = 0.0
+        self.frames_read = 0
+        self._next_frame_time = 0.0
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.path)
+        fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.frame_interval = 1.0 / fps
+        self._next_frame_time = time.perf_counter()
+        self.exhausted = False
+        return self.cap.isOpened()
+
+    @property
+    def paced(self):
+        return self.realtime
+
+    def is_opened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def read(self):
+        if self.max_frames is not None and self.frames_read >= self.max_frames:
+            self.exhausted = True
+            return False, None
+
+        if self.realtime:
+            _pace(self._next_frame_time)
+            self._next_frame_time += self.frame_interval
+
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        if not ret:
+            self.exhausted = True
+            return False, None
+
+        self.frames_read += 1
+        return True, frame
+
+    def release(self):
+        if self.cap:
+            self.cap.release()
+
+
+class ImageSequenceSource(FrameSource):
+    """A folder of still images, read in sorted filename order."""
+
+    EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+    def __init__(self, directory, loop=False, fps=None, max_frames=None):
+        super().__init__()
+        self.directory = directory
+        self.loop = loop
+        self.fps = fps
+        self.max_frames = max_frames
+        self.paths = []
+        self.position = 0
+        self.frames_read = 0
+        self._next_frame_time = 0.0
+
+    def open(self):
+        self.paths = sorted(
+            p for p in glob.glob(os.path.join(self.directory, "*"))
+            if p.lower().endswith(self.EXTENSIONS)
+        )
+        self.position = 0
+        self.exhausted = False
+        self._next_frame_time = time.perf_counter()
+        return bool(self.paths)
+
+    @property
+    def paced(self):
+        return bool(self.fps)
+
+    def is_opened(self):
+        return bool(self.paths)
+
+    def read(self):
+        if self.max_frames is not None and self.frames_read >= self.max_frames:
+            self.exhausted = True
+            return False, None
+        if self.position >= len(self.paths):
+            if not self.loop:
+                self.exhausted = True
+                return False, None
+            self.position = 0
+
+        if self.fps:
+            _pace(self._next_frame_time)
+            self._next_frame_time += 1.0 / self.fps
+
+        frame = cv2.imread(self.paths[self.position])
+        self.position += 1
+        if frame is None:
+            return False, None
+
+        self.frames_read += 1
+        return True, frame
+
+
+class SyntheticSource(FrameSource):
+    """
+    Generated frames (a gradient with a moving block) for exercising the
+    pipeline on machines without a camera or sample footage.
+    """
+
+    def __init__(self, width=640, height=480, max_frames=300, fps=None):
+        super().__init__()
+        self.width = width
+        self.height = height
+        self.max_frames = max_frames
+        self.fps = fps
+        self.frames_read = 0
+        self._base = None
+        self._next_frame_time = 0.0
+
+    def open(self):
+        # Build the background once; each frame only moves a block over it.
+        ramp_x = np.linspace(40, 200, self.width, dtype=np.float32)
+        ramp_y = np.linspace(0, 55, self.height, dtype=np.float32)[:, None]
+        gray = (ramp_x[None, :] + ramp_y).astype(np.uint8)
+        self._base = np.dstack([gray, gray, gray])
+        self.frames_read = 0
+        self.exhausted = False
+        self._next_frame_time = time.perf_counter()
+        return True
+
+    @property
+    def paced(self):
+        return bool(self.fps)
+
+    def is_opened(self):
+        return self._base is not None
+
+    def read(self):
+        if self.max_frames is not None and self.frames_read >= self.max_frames:
+            self.exhausted = True
+            return False, None
+
+        if self.fps:
+            _pace(self._next_frame_time)
+            self._next_frame_time += 1.0 / self.fps
+
+        frame = self._base.copy()
+        size = max(self.height // 6, 1)
+        x = (self.frames_read * 7) % max(self.width - size, 1)
+        y = self.height // 3
+        frame[y:y + size, x:x + size] = (30, 90, 220)
+
+        self.frames_read += 1
+        return True, frame
+
+    def release(self):
+        self._base = None
+
+
+def _pace(target_time):
+    """Sleeps until target_time (a perf_counter value), if it is in the future."""
+    delay = target_time - time.perf_counter()
+    if delay > 0:
+        time.sleep(delay)
+
+
+def open_frame_source(spec, loop=False, realtime=False, max_frames=None):
+    """
+    Builds a frame source from a short description:
+      - an integer (or digit string)        -> webcam with that index
+      - "synthetic" or "synthetic:1280x720" -> generated frames
+      - a directory                         -> image sequence
+      - anything else                       -> video file
+    """
+    if isinstance(spec, int) or str(spec).isdigit():
+        return WebcamSource(int(spec))
+
+    spec = str(spec)
+    if spec.startswith("synthetic"):
+        width, height = 640, 480
+        if ":" in spec:
+            width, height = (int(v) for v in spec.split(":", 1)[1].lower().split("x"))
+        return SyntheticSource(width, height, max_frames=max_frames or 300,
+                               fps=30 if realtime else None)
+    if os.path.isdir(spec):
+        return ImageSequenceSource(spec, loop=loop, fps=30 if realtime else None,
+                                   max_frames=max_frames)
+    return VideoFileSource(spec, loop=loop, realtime=realtime, max_frames=max_frames)
@@ -0,0 +1,278 @@
+import datetime
+import itertools
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+
+SCHEMA = """
+-- Aggregates for each completed clock hour, so long-range queries read a few
+-- thousand rows instead of every stored sample
+CREATE TABLE IF NOT EXISTS hourly_stats (
+    hour_start REAL PRIMARY KEY,
+    day TEXT NOT NULL,            -- local date, YYYY-MM-DD
+    hour_of_day INTEGER NOT NULL, -- local hour, 0-23
+    samples INTEGER NOT NULL,     -- seconds with a pose (time at desk)
+    good INTEGER NOT NULL,        -- seconds above the session's threshold
+    ratio_sum REAL NOT NULL,
+    longest_run INTEGER NOT NULL, -- longest run of good samples within the hour
+    leading_run INTEGER NOT NULL, -- good run from the start of the hour (0 if it starts later)
+    trailing_run INTEGER NOT NULL -- good run up to the end of the hour (0 if it ends earlier)
+);
+"""
+
+HOUR = 3600
+# Samples are about a second apart; a longer gap (paused, app closed) ends a streak
+MAX_SAMPLE_GAP = 1.5
+
+
+class HistoryAnalytics:
+    """
+    Daily, weekly and hour-of-day breakdowns over everything in a SessionStore.
+
+    Completed hours are reduced once (vectorized) into hourly_stats, a day
+    at a time on a background thread; every query then works on those rows
+    plus the current, still-open hour. Raw
+    samples are only read by time range, which the samples table is
+    clustered on, so a query touches just the blocks it needs.
+
+    A sample counts as good when it is above the threshold of the session it
+    was recorded in. Streaks are runs of good samples with no gap in time
+    between them, joined across hours when they run through the hour's end.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.connection = sqlite3.connect(store.path, check_same_thread=False, timeout=5.0)
+        self.connection.executescript(SCHEMA)
+        self._backfill = None
+        self._backfill_hour = None # Open hour when the last backfill started
+        self._closing = False
+
+    def close(self):
+        self._closing = True
+        if self._backfill is not None:
+            self._backfill.join()
+        self.connection.close()
+
+    # --- Maintenance ---
+    def _session_thresholds(self):
+        rows = self.connection.execute(
+            "SELECT started_at, threshold FROM sessions ORDER BY started_at").fetchall()
+        if not rows:
+            return np.empty(0), np.empty(0)
+        starts, thresholds = zip(*rows)
+        return np.asarray(starts, dtype=np.float64), np.asarray(thresholds, dtype=np.float64)
+
+    def _read_samples(self, start, end):
+        """(timestamps, ratios) for start <= ts < end; absent seconds have NaN ratios."""
+        # Streamed straight into one array instead of a list of row tuples
+        # (a separate NULL flag: any REAL, negative ones too, is a valid ratio)
+        cursor = self.connection.execute(
+            "SELECT ts, COALESCE(ratio, 0.0), ratio IS NULL FROM samples WHERE ts >= ? AND ts < ? ORDER BY ts",
+            (start, end))
+        data = np.fromiter(itertools.chain.from_iterable(cursor), dtype=np.float64).reshape(-1, 3)
+        ratios = data[:, 1]
+        ratios[data[:, 2] != 0] = np.nan # NULL: no pose that second
+        return data[:, 0], ratios
+
+    def _summarize_hours(self, start, end):
+        """Reduces the samples in [start, end) to one hourly_stats row per hour that has data."""
+        timestamps, ratios = self._read_samples(start, end)
+        if not len(timestamps):
+            return []
+
+        session_starts, thresholds = self._session_thresholds()
+        if len(session_starts):
+            # Samples older than the first session (e.g. imported) use its threshold
+            index = np.maximum(np.searchsorted(session_starts, timestamps, side="right") - 1, 0)
+            sample_thresholds = thresholds[index]
+        else:
+            sample_thresholds = np.full(len(timestamps), np.nan)
+
+        present = ~np.isnan(ratios)
+        with np.errstate(invalid="ignore"):
+            good = present & (ratios > sample_thresholds)
+
+        hours = np.floor(timestamps / HOUR) * HOUR
+        boundaries = np.flatnonzero(np.diff(hours)) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [len(hours)]))
+        run_lengths = _run_lengths(good, timestamps, hours)
+
+        rows = []
+        for lo, hi in zip(starts, ends):
+            hour_good = good[lo:hi]
+            longest = int(run_lengths[lo:hi].max())
+            # Only runs touching the hour's edges can continue into the neighbouring hours
+            leading = int(run_lengths[lo]) if timestamps[lo] - hours[lo] < MAX_SAMPLE_GAP else 0
+            trailing = int(run_lengths[hi - 1]) if hours[lo] + HOUR - timestamps[hi - 1] <= MAX_SAMPLE_GAP else 0
+            hour_present = present[lo:hi]
+            local = datetime.datetime.fromtimestamp(hours[lo])
+            rows.append((
+                float(hours[lo]), local.strftime("%Y-%m-%d"), local.hour,
+                int(np.count_nonzero(hour_present)), int(np.count_nonzero(hour_good)),
+                float(ratios[lo:hi][hour_present].sum()), longest, leading, trailing,
+            ))
+        return rows
+
+    def refresh(self, max_hours=24):
+        """
+        Summarizes up to max_hours of the completed hours not yet in
+        hourly_stats, so one call stays short however big the backlog is.
+        Returns True if there may be more left.
+        """
+        last = self.connection.execute("SELECT MAX(hour_start) FROM hourly_stats").fetchone()[0]
+        # Skips hours without samples (e.g. days the app wasn't used)
+        first = self.connection.execute(
+            "SELECT MIN(ts) FROM samples WHERE ts >= ?", (0.0 if last is None else last + HOUR,)).fetchone()[0]
+        if first is None:
+            return False
+        start = np.floor(first / HOUR) * HOUR
+        current_hour = np.floor(time.time() / HOUR) * HOUR
+        if start >= current_hour:
+            return False
+
+        end = min(start + max_hours * HOUR, current_hour)
+        rows = self._summarize_hours(start, end)
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO hourly_stats VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return end < current_hour
+
+    # --- Background backfill ---
+    def start_backfill(self):
+        """
+        Summarizes the completed hours on a background thread; a no-op while
+        one is running or if one already ran since the last hour completed.
+        """
+        current_hour = np.floor(time.time() / HOUR) * HOUR
+        if self.backfilling or self._closing or self._backfill_hour == current_hour:
+            return
+        self._backfill_hour = current_hour
+        self._backfill = threading.Thread(target=self._backfill_main, name="HistoryBackfill", daemon=True)
+        self._backfill.start()
+
+    @property
+    def backfilling(self):
+        """True while completed hours are still being summarized."""
+        return self._backfill is not None and self._backfill.is_alive()
+
+    def _backfill_main(self):
+        # Own connection, so the GUI thread's queries never wait on this one
+        worker = HistoryAnalytics(self.store)
+        try:
+            while not self._closing and worker.refresh():
+                pass
+        finally:
+            worker.close()
+
+    def _hours(self, start, end):
+        """
+        hourly_stats rows (plus the open hour) overlapping [start, end), as
+        arrays. Hours the backfill hasn't reached yet are left out.
+        """
+        self.start_backfill()
+        rows = self.connection.execute(
+            "SELECT * FROM hourly_stats WHERE hour_start >= ? AND hour_start < ? ORDER BY hour_start",
+            (np.floor(start / HOUR) * HOUR, end)).fetchall()
+        current_hour = np.floor(time.time() / HOUR) * HOUR
+        if start <= current_hour < end:
+            rows += self._summarize_hours(current_hour, current_hour + HOUR)
+
+        columns = ("hour_start", "day", "hour_of_day", "samples", "good", "ratio_sum",
+                   "longest_run", "leading_run", "trailing_run")
+        if not rows:
+            return {name: np.empty(0) for name in columns}
+        values = list(zip(*rows))
+        hours = {name: np.asarray(column) for name, column in zip(columns, values)}
+        hours["day"] = np.asarray(values[1], dtype=object)
+        return hours
+
+    # --- Queries ---
+    def daily(self, start, end):
+        """Per local day in [start, end): day, time_at_desk_s, percent_good, avg_ratio, longest_streak_s."""
+        hours = self._hours(start, end)
+        return self._group(hours, hours["day"])
+
+    def weekly(self, start, end):
+        """Like daily(), grouped by ISO week ("YYYY-Www")."""
+        hours = self._hours(start, end)
+        days, index = np.unique(hours["day"].astype(str), return_inverse=True)
+        weeks = np.asarray([
+            "{0}-W{1:02d}".format(*datetime.date.fromisoformat(day).isocalendar()[:2]) for day in days
+        ], dtype=object)
+        return self._group(hours, weeks[index])
+
+    def hour_of_day(self, start, end):
+        """For each local hour 0-23 over [start, end): time_at_desk_s, percent_good, avg_ratio."""
+        hours = self._hours(start, end)
+        slots = hours["hour_of_day"].astype(np.int64)
+        samples = np.bincount(slots, weights=hours["samples"], minlength=24)
+        good = np.bincount(slots, weights=hours["good"], minlength=24)
+        ratio_sum = np.bincount(slots, weights=hours["ratio_sum"], minlength=24)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return {
+                "hour": np.arange(24),
+                "time_at_desk_s": samples,
+                "percent_good": np.where(samples > 0, good / samples * 100, np.nan),
+                "avg_ratio": np.where(samples > 0, ratio_sum / samples, np.nan),
+            }
+
+    def _group(self, hours, keys):
+        if not len(keys):
+            return {"period": np.empty(0, dtype=object), "time_at_desk_s": np.empty(0),
+                    "percent_good": np.empty(0), "avg_ratio": np.empty(0),
+                    "longest_streak_s": np.empty(0)}
+
+        # Rows are in time order, so equal keys are contiguous
+        boundaries = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+        starts = np.concatenate(([0], boundaries))
+        samples = np.add.reduceat(hours["samples"], starts).astype(np.float64)
+        good = np.add.reduceat(hours["good"], starts)
+        ratio_sum = np.add.reduceat(hours["ratio_sum"], starts)
+        ends = np.concatenate((boundaries, [len(keys)]))
+        columns = [hours[name].tolist() for name in
+                   ("hour_start", "samples", "longest_run", "leading_run", "trailing_run")]
+        streaks = [_join_runs(*(column[lo:hi] for column in columns)) for lo, hi in zip(starts, ends)]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return {
+                "period": keys[starts],
+                "time_at_desk_s": samples,
+                "percent_good": np.where(samples > 0, good / samples * 100, np.nan),
+                "avg_ratio": np.where(samples > 0, ratio_sum / samples, np.nan),
+                "longest_streak_s": np.asarray(streaks, dtype=np.float64),
+            }
+
+
+def _run_lengths(good, timestamps, hours):
+    """
+    For each sample, the length of the good run it belongs to (0 if it isn't
+    good). A run ends at a bad sample, a gap in time or the end of an hour.
+    """
+    continues = np.zeros(len(good), dtype=bool)
+    continues[1:] = (good[1:] & good[:-1] & (np.diff(timestamps) <= MAX_SAMPLE_GAP)
+                     & (hours[1:] == hours[:-1]))
+    run_ids = np.cumsum(good & ~continues) - 1
+    lengths = np.bincount(run_ids[good], minlength=1)
+    return np.where(good, lengths[np.maximum(run_ids, 0)], 0)
+
+
+def _join_runs(hour_starts, samples, longest, leading, trailing):
+    """Longest good streak over consecutive hourly rows, continuing runs across adjacent hours."""
+    best = 0
+    carry = 0
+    previous_hour = None
+    for hour_start, count, inner, first, last in zip(hour_starts, samples, longest, leading, trailing):
+        adjacent = previous_hour is not None and hour_start - previous_hour == HOUR
+        if adjacent:
+            best = max(best, carry + first)
+        best = max(best, inner)
+        # One run from the start of the hour to its end
+        all_good = first == count == last and count > 0
+        carry = (carry if adjacent else 0) + count if all_good else last
+        previous_hour = hour_start
+    return best
@@ -0,0 +1,52 @@
+from collections import deque
+
+
+class CadenceController:
+    """
+    Chooses how many camera frames pass between pose inferences. The frames
+    in between reuse (hold) the last landmarks.
+
+    While the last `window` posture ratios are steady (spread under
+    `stable_spread`) and all at least `margin` away from the threshold, the
+    interval grows by one frame per inference up to `max_interval`. It drops
+    back to every frame as soon as a ratio comes near the threshold, the
+    ratios move, no pose is found or the picture changes (`motion`, the
+    presence gate's mean frame difference, above `motion_threshold`).
+    max_interval=1 runs inference on every frame.
+    """
+
+    def __init__(self, max_interval=5, margin=0.05, stable_spread=0.03, window=8, motion_threshold=2.5):
+        self.max_interval = max_interval
+        self.margin = margin
+        self.stable_spread = stable_spread
+        self.motion_threshold = motion_threshold
+        self.recent = deque(maxlen=window)
+        self.interval = 1
+        self.frames_since = 0
+
+    def due(self, motion):
+        """Called once per frame; True if this frame should get a fresh inference."""
+        self.frames_since += 1
+        if motion > self.motion_threshold:
+            self.interval = 1
+        if self.frames_since >= self.interval:
+            self.frames_since = 0
+            return True
+        return False
+
+    def observe(self, ratio, threshold):
+        """Reports an inference result: its posture ratio, or None if no pose was found."""
+        if ratio is None:
+            self.reset()
+            return
+
+        self.recent.append(ratio)
+        stable = (len(self.recent) == self.recent.maxlen
+                  and max(self.recent) - min(self.recent) <= self.stable_spread
+                  and min(abs(r - threshold) for r in self.recent) >= self.margin)
+        self.interval = min(self.interval + 1, self.max_interval) if stable else 1
+
+    def reset(self):
+        self.recent.clear()
+        self.interval = 1
+        self.frames_since = 0
@@ -0,0 +1,89 @@
+"""
+Pose landmark recordings: one record per processed frame with the frame's
+wall-clock time and its 33 landmarks (x, y, z, visibility as float32; all
+NaN when nobody was found), so sessions can be replayed without a camera
+or MediaPipe (see core/replay.py).
+
+A file is a 16-byte header followed by fixed-size records. The recorder
+buffers CHUNK_FRAMES records and writes them in one go, and the whole file
+can be opened as a read-only np.memmap without loading it.
+"""
+import os
+import struct
+import time
+
+import numpy as np
+
+from core.landmarks import NUM_LANDMARKS, landmarks_to_array
+
+MAGIC = b"POSELM01"
+HEADER = struct.Struct("<8sII") # magic, record size, landmarks per record
+RECORD = np.dtype([("time", "<f8"), ("landmarks", "<f4", (NUM_LANDMARKS, 4))])
+CHUNK_FRAMES = 256 # ~8 s at 30 fps, 137 KB
+EXTENSION = ".poselm"
+
+
+def default_recording_dir():
+    """recordings/ in the per-user application data folder (next to the history database)."""
+    from PyQt6.QtCore import QStandardPaths
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericDataLocation)
+    return os.path.join(base, "PostureApp", "recordings")
+
+
+class LandmarkRecorder:
+    """Appends frames to a recording file. Used from the detector thread only."""
+
+    def __init__(self, path, chunk_frames=CHUNK_FRAMES):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, RECORD.itemsize, NUM_LANDMARKS))
+        self.chunk = np.empty(chunk_frames, dtype=RECORD)
+        self.filled = 0
+        self.frames = 0
+
+    @classmethod
+    def in_directory(cls, directory):
+        """A new recording named after the current time."""
+        name = time.strftime("%Y%m%d-%H%M%S") + EXTENSION
+        return cls(os.path.join(directory, name))
+
+    def add(self, timestamp, landmarks):
+        """Records one frame: a MediaPipe landmark list, or None when nobody was found."""
+        self.add_array(timestamp, None if landmarks is None else landmarks_to_array(landmarks.landmark))
+
+    def add_array(self, timestamp, array):
+        """Records one frame from a (33, 4) array, or None when nobody was found."""
+        record = self.chunk[self.filled]
+        record["time"] = timestamp
+        record["landmarks"] = np.nan if array is None else array
+        self.filled += 1
+        self.frames += 1
+        if self.filled == len(self.chunk):
+            self.flush()
+
+    def flush(self):
+        if self.filled:
+            self.file.write(self.chunk[:self.filled].tobytes())
+            self.filled = 0
+        self.file.flush()
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+
+
+def open_recording(path):
+    """The records of a recording as a read-only memmap (fields "time" and "landmarks")."""
+    with open(path, "rb") as file:
+        magic, record_size, landmarks = HEADER.unpack(file.read(HEADER.size))
+    if magic != MAGIC or record_size != RECORD.itemsize or landmarks != NUM_LANDMARKS:
+        raise ValueError(f"{path} is not a landmark recording")
+    frames = (os.path.getsize(path) - HEADER.size) // RECORD.itemsize
+    if not frames:
+        return np.empty(0, dtype=RECORD)
+    return np.memmap(path, dtype=RECORD, mode="r", offset=HEADER.size, shape=(frames,))
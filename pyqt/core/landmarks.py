@@ -0,0 +1,22 @@
+import numpy as np
+
+# MediaPipe Pose always returns this many landmarks
+NUM_LANDMARKS = 33
+
+
+def landmarks_to_array(landmarks):
+    """Packs a MediaPipe landmark list into a (33, 4) float32 array of x, y, z, visibility."""
+    array = np.empty((NUM_LANDMARKS, 4), dtype=np.float32)
+    for i, lm in enumerate(landmarks):
+        array[i] = (lm.x, lm.y, lm.z, lm.visibility)
+    return array
+
+
+def array_to_landmark_list(array):
+    """Rebuilds a NormalizedLandmarkList (what draw_landmarks expects) from a (33, 4) array."""
+    from mediapipe.framework.formats import landmark_pb2
+
+    landmark_list = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z, visibility in array.tolist():
+        landmark_list.landmark.add(x=x, y=y, z=z, visibility=visibility)
+    return landmark_list
@@ -0,0 +1,84 @@
+from collections import deque
+
+import numpy as np
+
+# "model_complexity" setting -> MediaPipe model_complexity, cheapest first
+MODEL_COMPLEXITIES = {"lite": 0, "full": 1, "heavy": 2}
+# Rough inference cost relative to "full", used for a model that hasn't been timed yet
+RELATIVE_COST = {0: 0.6, 1: 1.0, 2: 3.0}
+
+
+def pose_options(settings, complexity):
+    """Keyword arguments for mp.solutions.pose.Pose from the settings."""
+    return {
+        "model_complexity": complexity,
+        "min_detection_confidence": settings.get("min_detection_confidence"),
+        "min_tracking_confidence": settings.get("min_tracking_confidence"),
+    }
+
+
+class ModelSelector:
+    """
+    Picks the Pose model for the "auto" model_complexity setting from
+    measured inference times.
+
+    After every `window` inferences the median time is compared with the
+    frame budget. Over budget, the next cheaper model is chosen. Under it, the
+    next heavier model is chosen only if its expected time (measured earlier,
+    or estimated from RELATIVE_COST) fits in `headroom` of the budget, so a
+    model that was just found too slow isn't tried again straight away.
+    Earlier measurements are trusted for `retry_after` seconds, after which
+    a faster machine state (e.g. back on mains power) can be picked up.
+    """
+
+    def __init__(self, budget_ms=33.0, start=1, window=30, headroom=0.7, retry_after=300.0):
+        self.budget = budget_ms / 1000.0
+        self.current = start
+        self.headroom = headroom
+        self.retry_after = retry_after
+        self.samples = deque(maxlen=window)
+        self.measured = {} # complexity -> (median seconds, when measured)
+        self.unavailable = set() # Models that failed to load (e.g. not downloadable offline)
+
+    def observe(self, seconds, now):
+        """Reports one inference time; returns the complexity to switch to, or None to stay."""
+        self.samples.append(seconds)
+        if len(self.samples) < self.samples.maxlen:
+            return None
+
+        typical = float(np.median(self.samples))
+        self.samples.clear()
+        self.measured[self.current] = (typical, now)
+
+        if typical > self.budget:
+            return self._neighbour(-1)
+        heavier = self._neighbour(+1)
+        if heavier is not None and self.expected(heavier, now) <= self.budget * self.headroom:
+            return heavier
+        return None
+
+    def expected(self, complexity, now):
+        """Expected inference time of a model, in seconds."""
+        known = self.measured.get(complexity)
+        if known and now - known[1] < self.retry_after:
+            return known[0]
+        current = self.measured[self.current][0]
+        return current * RELATIVE_COST[complexity] / RELATIVE_COST[self.current]
+
+    def _neighbour(self, step):
+        """The nearest loadable model in the direction of step, or None."""
+        complexity = self.current + step
+        while complexity in RELATIVE_COST:
+            if complexity not in self.unavailable:
+                return complexity
+            complexity += step
+        return None
+
+    def switched(self, complexity):
+        """The detector is now running this model."""
+        self.current = complexity
+        self.samples.clear()
+
+    def failed(self, complexity):
+        """This model couldn't be loaded; it won't be chosen again."""
+        self.unavailable.add(complexity)
@@ -0,0 +1,107 @@
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+from core.landmarks import landmarks_to_array
+
+# Colours are BGR: the overlay is drawn before the display frame is converted to RGB
+LANDMARK_COLOR = (0, 0, 255)
+CONNECTION_COLOR = (224, 224, 224)
+GOOD_COLOR = (0, 255, 0)
+BAD_COLOR = (0, 0, 255)
+TEXT_COLOR = (255, 255, 255)
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+# Same as MediaPipe's drawing_utils: less visible landmarks aren't drawn
+MIN_VISIBILITY = 0.5
+
+
+class OverlayCompositor:
+    """
+    Draws the pose skeleton and the posture labels onto the display-sized
+    frame (see PoseDetectorThread.publish_frame()) rather than the camera
+    frame, so nothing is drawn when no video is on screen and the drawing
+    cost follows the size of the video on screen, not the camera resolution.
+
+    The detector calls update() with each frame's result; draw() renders it.
+    Labels are rendered once per text, colour and size into a small sprite
+    that is then copied in; the ratio label only has a few hundred distinct
+    values, so the last `cache_size` sprites are kept.
+
+    enabled=False (the "show_overlay" setting) shows the plain video.
+    """
+
+    def __init__(self, enabled=True, cache_size=256):
+        self.enabled = enabled
+        self.cache_size = cache_size
+        self.connections = None # (n, 2) landmark index pairs, set once MediaPipe is loaded
+        self.landmarks = None
+        self.labels = () # ((text, color), ...) top to bottom
+        self.sprites = OrderedDict()
+
+    def update(self, landmarks, posture_ratio=None, good=None):
+        """Stores what the next draw() shows: landmarks (or None) and the verdict, if any."""
+        self.landmarks = landmarks
+        if posture_ratio is None:
+            self.labels = ()
+        else:
+            self.labels = (("Good posture", GOOD_COLOR) if good else ("Bad posture", BAD_COLOR),
+                           (f"Posture Ratio: {posture_ratio:.2f}", TEXT_COLOR))
+
+    def draw(self, image, source_width):
+        """Draws onto a BGR display frame scaled down from a camera frame source_width pixels wide."""
+        if not self.enabled:
+            return
+        # Sizes keep the proportions the overlay had when drawn on the camera frame
+        scale = image.shape[1] / source_width
+        if self.landmarks is not None:
+            self.draw_skeleton(image, max(1, round(2 * scale)))
+        y = round(50 * scale)
+        for text, color in self.labels:
+            self.draw_label(image, text, color, round(30 * scale), y, scale)
+            y += round(30 * scale)
+
+    def draw_skeleton(self, image, thickness):
+        height, width = image.shape[:2]
+        points = landmarks_to_array(self.landmarks.landmark)
+        visible = points[:, 3] >= MIN_VISIBILITY
+        pixels = np.round(points[:, :2] * (width, height)).astype(np.int32)
+
+        if self.connections is not None:
+            pairs = self.connections[visible[self.connections].all(axis=1)]
+            if len(pairs):
+                cv2.polylines(image, list(pixels[pairs]), False, CONNECTION_COLOR, thickness)
+        for x, y in pixels[visible]:
+            cv2.circle(image, (int(x), int(y)), thickness, LANDMARK_COLOR, thickness)
+
+    def draw_label(self, image, text, color, x, y, scale):
+        """Copies the cached sprite of a label in, with its baseline at y."""
+        sprite, mask, ascent = self.sprite(text, color, round(scale, 2))
+        top = y - ascent
+        height, width = mask.shape
+        # Clip to the frame (very small video areas)
+        height = min(height, image.shape[0] - top)
+        width = min(width, image.shape[1] - x)
+        if top < 0 or height <= 0 or width <= 0:
+            return
+        region = image[top:top + height, x:x + width]
+        np.copyto(region, sprite[:height, :width], where=mask[:height, :width, None])
+
+    def sprite(self, text, color, scale):
+        """(BGR sprite, bool mask, ascent) for a label, rendered on first use."""
+        key = (text, color, scale)
+        cached = self.sprites.get(key)
+        if cached is not None:
+            self.sprites.move_to_end(key)
+            return cached
+
+        thickness = max(1, round(2 * scale))
+        (width, ascent), descent = cv2.getTextSize(text, FONT, scale, thickness)
+        pad = thickness
+        sprite = np.zeros((ascent + descent + 2 * pad, width + 2 * pad, 3), dtype=np.uint8)
+        cv2.putText(sprite, text, (pad, ascent + pad), FONT, scale, color, thickness)
+        mask = sprite.any(axis=2)
+        cached = self.sprites[key] = (sprite, mask, ascent + pad)
+        if len(self.sprites) > self.cache_size:
+            self.sprites.popitem(last=False)
+        return cached
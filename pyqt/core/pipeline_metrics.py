@@ -0,0 +1,128 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class PipelineMetrics:
+    """
+    Rolling per-stage timings for the detector loop.
+    Each stage records wall time and process CPU time (process CPU so that
+    MediaPipe's own worker threads are counted against the inference stage).
+    """
+
+    def __init__(self, window=600):
+        # window=None keeps every sample (used by the benchmark)
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self.stage_wall = {}
+        self.stage_cpu = {}
+        self.frame_latency = deque(maxlen=self.window)
+        # Named end-to-end measurements, e.g. glass-to-verdict latency
+        self.latencies = {}
+        self.frames = 0
+        self.inferences = 0 # Frames that got a fresh pose inference
+        self.dropped_frames = 0
+        self.started_at = None
+        self.last_frame_at = None
+        self._frame_start = None
+
+    def _samples(self, table, name):
+        samples = table.get(name)
+        if samples is None:
+            samples = table[name] = deque(maxlen=self.window)
+        return samples
+
+    def begin_frame(self):
+        self._frame_start = time.perf_counter()
+        if self.started_at is None:
+            self.started_at = self._frame_start
+
+    def end_frame(self):
+        if self._frame_start is None:
+            return
+        now = time.perf_counter()
+        self.frame_latency.append(now - self._frame_start)
+        self.frames += 1
+        self.last_frame_at = now
+        self._frame_start = None
+
+    def observe(self, name, seconds):
+        """Records one sample of a named latency (in seconds)."""
+        self._samples(self.latencies, name).append(seconds)
+
+    def latency_percentiles(self, name):
+        """Returns p50/p95/p99 (ms) of a named latency, or an empty dict."""
+        samples = self.latencies.get(name)
+        if not samples:
+            return {}
+        values = np.asarray(samples) * 1000.0
+        return {
+            "p50": float(np.percentile(values, 50)),
+            "p95": float(np.percentile(values, 95)),
+            "p99": float(np.percentile(values, 99)),
+        }
+
+    def record_stages(self, timings):
+        """Adds stage timings measured elsewhere: {name: (wall_s, cpu_s)}."""
+        for name, (wall, cpu) in timings.items():
+            self._samples(self.stage_wall, name).append(wall)
+            self._samples(self.stage_cpu, name).append(cpu)
+
+    @contextmanager
+    def stage(self, name):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            self._samples(self.stage_wall, name).append(time.perf_counter() - wall_start)
+            self._samples(self.stage_cpu, name).append(time.process_time() - cpu_start)
+
+    def fps(self):
+        """Sustained frames per second since the first frame."""
+        return self._rate(self.frames)
+
+    def inference_fps(self):
+        """Pose inferences per second since the first frame (<= fps() with cadence/presence skipping)."""
+        return self._rate(self.inferences)
+
+    def _rate(self, count):
+        if not self.frames or self.last_frame_at is None:
+            return 0.0
+        elapsed = self.last_frame_at - self.started_at
+        return count / elapsed if elapsed > 0 else 0.0
+
+    def summary(self):
+        """
+        Returns a dict with fps, per-frame latency percentiles (ms) and
+        per-stage wall/CPU means (ms).
+        """
+        result = {"frames": self.frames, "fps": self.fps(), "inference_fps": self.inference_fps(),
+                  "dropped": self.dropped_frames,
+                  "latency_ms": {}, "stages": {}, "latencies": {}}
+
+        if self.frame_latency:
+            latency = np.asarray(self.frame_latency) * 1000.0
+            result["latency_ms"] = {
+                "mean": float(latency.mean()),
+                "p50": float(np.percentile(latency, 50)),
+                "p95": float(np.percentile(latency, 95)),
+                "p99": float(np.percentile(latency, 99)),
+            }
+
+        for name in self.latencies:
+            result["latencies"][name] = self.latency_percentiles(name)
+
+        for name, samples in list(self.stage_wall.items()):
+            wall = np.asarray(samples) * 1000.0
+            cpu = np.asarray(self.stage_cpu[name]) * 1000.0
+            result["stages"][name] = {
+                "wall_ms": float(wall.mean()),
+                "wall_p95_ms": float(np.percentile(wall, 95)),
+                "cpu_ms": float(cpu.mean()),
+            }
+        return result
@@ -1,62 +1,139 @@
 import cv2
-import mediapipe as mp
 import numpy as np
+import threading
 import time
-import pygame
-from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtCore import QThread
+
+from core import startup_metrics
+from core.clock import SystemClock
+from core.frame_capture import CaptureThread, LatestFrameMailbox
+from core.frame_channel import FrameChannel
+from core.frame_sources import WebcamSource
+from core.pose_estimator import create_pose_estimator
+from core.pipeline_metrics import PipelineMetrics
+from core.power_modes import PowerMode, PowerScheduler
+from core.presence_gate import PresenceGate
+from core.inference_cadence import CadenceController
+from core.roi import RoiCropper
+from core.model_selector import MODEL_COMPLEXITIES, ModelSelector, pose_options
+from core.overlay import OverlayCompositor
+from core.posture_state import PostureDebouncer
+from core.status_bus import StatusBus
+from core.landmark_recording import LandmarkRecorder, default_recording_dir
+from core.landmarks import landmarks_to_array
+from core.posture_scoring import score_posture
+from core.posture_features import FEATURES, FeatureChecker, extract_features, parse_feature_names
 
 # Import your settings class or pass settings dictionary
 # from app_settings import AppSettings 
 
 class PoseDetectorThread(QThread):
-    # --- Define Signals ---
-    # Signal to send the video frame (np.ndarray)
-    frame_ready = pyqtSignal(np.ndarray)
-    # Signal to send status updates (text, color)
-    posture_status = pyqtSignal(str, str)
-    # Signal to send warnings (e.g., "Too dark")
-    system_warning = pyqtSignal(str)
-    # Signal for calibration status
-    calibration_status = pyqtSignal(str)
-
-    def __init__(self, settings, data_manager, parent=None):
+    # Video frames go through self.display (a FrameChannel) and status text
+    # through self.status (a StatusBus) rather than per-frame signals. Topics:
+    #   "posture": (text, color), e.g. ("Good Posture", "green")
+    #   "warning": (text,), e.g. "Too dark", or "" when there is nothing to warn about
+    #   "calibration": (text,)
+
+    def __init__(self, settings, data_manager, frame_source=None, inference_mode=None, clock=None, parent=None):
         super().__init__(parent)
         self.settings = settings
         self.data_manager = data_manager
+        # Time for cooldowns, presence and debouncing (a ReplayClock when replaying a recording)
+        self.clock = clock or SystemClock()
         self.running = True
         self.calibrating = False
 
+        # Where frames come from (webcam by default, see core/frame_sources.py)
+        self.frame_source = frame_source or WebcamSource(0)
+        # Per-stage timings, read by the benchmark
+        self.metrics = PipelineMetrics()
+        # Display-sized frames for the GUI (latest wins, fixed buffer pool)
+        self.display = FrameChannel()
+        # Status changes for the GUI (change-only, coalesced)
+        self.status = StatusBus()
+        # Steadies the good/bad verdict so a noisy ratio doesn't flap the label and alert
+        self.posture_state = PostureDebouncer()
+        # Head tilt, shoulder asymmetry, ... checked against their own thresholds
+        self.enabled_features = parse_feature_names(self.settings.get("posture_features"))
+        self.feature_checker = FeatureChecker()
+        # Foreground / background / paused, set by the main window
+        self.power = PowerScheduler(self.settings.get("background_fps"))
+        # Skips pose inference (apart from occasional probes) while nobody is there
+        self.presence = PresenceGate()
+        # Runs inference less often while posture is steady; frames in between hold the landmarks
+        self.cadence = CadenceController(max_interval=self.settings.get("cadence_max_interval"))
+        self.held_landmarks = None
+        # Crops around the upper body and shrinks what MediaPipe is given
+        self.roi = RoiCropper(target_size=self.settings.get("inference_size"))
+        # Draws the skeleton and labels onto the display-sized frame only
+        self.overlay = OverlayCompositor(enabled=self.settings.get("show_overlay"))
+
         # --- PoseDetector logic (moved from __init__) ---
-        self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose()
-        self.mp_drawing = mp.solutions.drawing_utils
+        # MediaPipe is imported when the loop starts (on this thread, not the GUI's)
+        self.mp_pose = None
+        # Created when the loop starts: in-thread or in a worker process,
+        # depending on the "inference_mode" setting
+        self.estimator = None
+        self.inference_mode = inference_mode # Overrides the setting (used by the benchmark)
+        # Shown under "warning" while there is nothing else to warn about (e.g. the worker crashed)
+        self.inference_warning = ""
+        # Lite / full / heavy, or chosen from measured inference times ("auto")
+        self.configure_model(self.settings.get("model_complexity"), self.settings.get("frame_budget_ms"))
+        # A replacement Pose graph loaded on a helper thread: (complexity, estimator or None)
+        self.pending_estimator = None
+        self.model_loader = None
         self.cap = None
+        self.mailbox = None
+        self.capture_thread = None
         
         self.lastTime = 0
-        pygame.mixer.init()
-        try:
-            self.warning_sound = pygame.mixer.Sound("assets/warning.wav")
-        except FileNotFoundError:
-            self.warning_sound = None
-            print("Warning: could not load sound file.")
+        self.alerts = 0 # Alerts raised (whether or not a sound could be played)
+        # Writes each frame's landmarks to a file when "record_landmarks" is on
+        self.recorder = None
+        # pygame and the sound are loaded on the first alert
+        self.warning_sound = None
+        self.sound_loaded = False
 
-        self.baseline = None
+        # A saved calibration is reused so the detector and stats page agree
+        self.baseline = self.settings.get("baseline") or None
         self.brightness_threshold = 40
 
+        # Some settings apply while the detector runs
+        self.settings.changed.connect(self.on_setting_changed)
+
     def run(self):
         """This is the main loop of the thread."""
-        self.cap = cv2.VideoCapture(0)
+        if self.mp_pose is None:
+            import mediapipe as mp
+            self.mp_pose = mp.solutions.pose
+            self.overlay.connections = np.array(sorted(self.mp_pose.POSE_CONNECTIONS))
+        if self.estimator is None:
+            self.start_estimator()
+
+        if self.settings.get("record_landmarks") and self.recorder is None:
+            self.recorder = LandmarkRecorder.in_directory(default_recording_dir())
+
+        self.cap = self.frame_source
+        self.cap.open()
+
+        # Capture runs on its own thread and always overwrites the mailbox, so
+        # this loop classifies the newest frame instead of OpenCV's backlog.
+        # Un-paced sources (benchmark replays) hand over every frame instead.
+        self.mailbox = LatestFrameMailbox(drop_stale=self.cap.paced)
+        self.capture_thread = CaptureThread(
+            self.cap, self.mailbox, self.metrics,
+            on_disconnect=lambda: self.status.post("warning", "No camera feed — trying to reconnect..."),
+            scheduler=self.power
+        )
+        self.capture_thread.start()
         
         while self.running:
-            if not self.cap.isOpened():
-                self.system_warning.emit("No camera feed — trying to reconnect...")
-                self.reconnect_camera()
-                time.sleep(1)
-                continue
-
-            ret, frame = self.cap.read()
-            if not ret:
+            packet = self.next_frame(timeout=0.5)
+            if packet is None:
+                if self.mailbox.closed:
+                    break # End of a recorded clip / image folder
                 continue
+            frame, captured_at = packet
 
             # --- Handle Calibration ---
             if self.calibrating:
@@ -64,107 +141,350 @@ class PoseDetectorThread(QThread):
                 self.calibrating = False # Stop calibrating after it's done
                 continue # Skip rest of loop for this one frame
 
-            # --- Brightness Check ---
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            if np.mean(gray) < self.brightness_threshold:
-                self.system_warning.emit("Too dark — please improve lighting!")
-            else:
-                self.system_warning.emit("") # Clear warning
-
-            # --- Pose Processing ---
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.pose.process(rgb)
-            self.mp_drawing.draw_landmarks(frame, results.pose_landmarks, self.mp_pose.POSE_CONNECTIONS)
-            
-            if results.pose_landmarks:
-                posture_ratio = self.read_posture(results.pose_landmarks.landmark)
-                self.add_text_and_check(frame, posture_ratio)
-
-                # Record data
-                self.data_manager.add_ratio(posture_ratio)
-            
-            # --- Emit the processed frame ---
-            self.frame_ready.emit(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            self.metrics.begin_frame()
+            self.process_frame(frame, captured_at)
+            self.metrics.end_frame()
             
+        self.capture_thread.stop()
+        self.capture_thread.join()
         self.cap.release()
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+        if not self.running:
+            self.release_estimator()
         print("Pose detector thread stopped.")
 
+    def on_setting_changed(self, key, value):
+        """Picks up settings changed on the settings page (runs on the GUI thread)."""
+        if key == "cadence_max_interval":
+            self.cadence.max_interval = value
+        elif key == "inference_size":
+            self.roi.target_size = value
+        elif key == "posture_features":
+            self.enabled_features = parse_feature_names(value)
+
+    def set_power_mode(self, mode):
+        """
+        Switches between PowerMode.FOREGROUND, BACKGROUND and PAUSED (any thread).
+        Background with the rate setting at 0 pauses instead.
+        """
+        background_fps = self.settings.get("background_fps")
+        if mode == PowerMode.BACKGROUND and background_fps <= 0:
+            mode = PowerMode.PAUSED
+        self.power.set_mode(mode, background_fps)
+
+    def configure_model(self, model, budget_ms):
+        """model is the "model_complexity" setting: "auto", "lite", "full" or "heavy"."""
+        self.model_selector = None
+        if model == "auto":
+            self.model_selector = ModelSelector(budget_ms=budget_ms)
+            self.complexity = self.model_selector.current
+        else:
+            self.complexity = MODEL_COMPLEXITIES.get(model, 1)
+
+    def create_estimator(self, complexity):
+        mode = self.inference_mode or self.settings.get("inference_mode")
+        return create_pose_estimator(mode, pose_options(self.settings, complexity))
+
+    def start_estimator(self):
+        """Builds the Pose graph, falling back to the full model (the one bundled with MediaPipe)."""
+        try:
+            self.estimator = self.create_estimator(self.complexity)
+        except (OSError, RuntimeError) as error:
+            if self.complexity == 1:
+                raise
+            print(f"Warning: could not load the {self.model_name()} pose model ({error}); using full.")
+            if self.model_selector:
+                self.model_selector.failed(self.complexity)
+                self.model_selector.switched(1)
+            self.complexity = 1
+            self.estimator = self.create_estimator(1)
+
+    def model_name(self, complexity=None):
+        complexity = self.complexity if complexity is None else complexity
+        return next(name for name, value in MODEL_COMPLEXITIES.items() if value == complexity)
+
+    def switch_model(self, complexity):
+        """
+        Loads another Pose model on a helper thread. The current graph keeps
+        running meanwhile; swap_estimator() puts the new one in between frames.
+        The calibration and tracking state live here, so they carry over.
+        """
+        def load():
+            try:
+                estimator = self.create_estimator(complexity)
+            except (OSError, RuntimeError) as error:
+                print(f"Warning: could not load the {self.model_name(complexity)} pose model ({error}).")
+                estimator = None
+            self.pending_estimator = (complexity, estimator)
+
+        self.model_loader = threading.Thread(target=load, name="PoseModelLoader", daemon=True)
+        self.model_loader.start()
+
+    def swap_estimator(self):
+        """Puts a model loaded by switch_model() into use (detector thread only)."""
+        complexity, estimator = self.pending_estimator
+        self.pending_estimator = None
+        self.model_loader = None
+        if estimator is None:
+            self.model_selector.failed(complexity)
+            return
+        previous, self.estimator = self.estimator, estimator
+        previous.close()
+        self.complexity = complexity
+        self.model_selector.switched(complexity)
+        print(f"Pose model: {self.model_name()}")
+
+    def fall_back_to_thread(self, error):
+        """Replaces a crashed inference process with in-process inference for the rest of the run."""
+        print(f"Warning: {error}; running pose detection in this process instead.")
+        self.inference_warning = "Pose worker crashed — detecting in the app process instead"
+        self.status.post("warning", self.inference_warning)
+        self.estimator.close()
+        self.inference_mode = "thread"
+        self.estimator = self.create_estimator(self.complexity)
+
+    def release_estimator(self):
+        """Frees the Pose graph (and shuts down the worker process, if any)."""
+        if self.model_loader:
+            self.model_loader.join()
+            self.model_loader = None
+        if self.pending_estimator:
+            _, estimator = self.pending_estimator
+            self.pending_estimator = None
+            if estimator:
+                estimator.close()
+        if self.estimator:
+            self.estimator.close()
+            self.estimator = None
+
+    def next_frame(self, timeout=None):
+        """Takes the freshest captured frame: (frame, captured_at) or None."""
+        packet = self.mailbox.take(timeout)
+        self.metrics.dropped_frames = self.mailbox.dropped
+        return packet
+
+    def process_frame(self, frame, captured_at=None):
+        """Runs one captured frame through brightness check, pose, scoring and display."""
+        # In the background nothing is on screen: classify and alert only
+        overlay = self.power.mode == PowerMode.FOREGROUND
+        if captured_at is not None:
+            self.metrics.observe("frame_age", time.perf_counter() - captured_at)
+
+        # --- Presence Check ---
+        # A tiny grayscale copy tells whether anything moved (and how bright it is)
+        now = self.clock.monotonic()
+        with self.metrics.stage("presence"):
+            small = self.presence.shrink(frame)
+            run_inference = self.presence.should_infer(small, now)
+
+        # --- Brightness Check ---
+        with self.metrics.stage("brightness"):
+            too_dark = np.mean(small) < self.brightness_threshold
+        if too_dark:
+            self.status.post("warning", "Too dark — please improve lighting!")
+        else:
+            self.status.post("warning", self.inference_warning) # Clear warning (but keep a standing one)
+
+        # --- Pose Processing ---
+        # On screen, a steady posture only needs a fresh inference every few frames
+        if (run_inference and overlay and self.held_landmarks is not None
+                and not self.cadence.due(self.presence.motion)):
+            run_inference = False
+            landmarks = self.held_landmarks
+        elif run_inference:
+            results = self.detect_pose(frame)
+            self.metrics.inferences += 1
+            startup_metrics.mark("first processed frame")
+            landmarks = self.held_landmarks = results.pose_landmarks
+            self.presence.observe(landmarks is not None, now)
+        else:
+            landmarks = self.held_landmarks = None
+        if self.recorder:
+            self.recorder.add(self.clock.time(), landmarks)
+        
+        if landmarks:
+            with self.metrics.stage("classify"):
+                posture_ratio, good = self.classify(landmarks.landmark, now, frame.shape[1] / frame.shape[0])
+            startup_metrics.mark("first classified frame")
+            if run_inference:
+                self.cadence.observe(posture_ratio, self.current_threshold())
+            if overlay:
+                self.overlay.update(landmarks, posture_ratio, good)
+
+            if captured_at is not None and run_inference:
+                # How old the frame was when its posture verdict was made
+                self.metrics.observe("glass_to_verdict", time.perf_counter() - captured_at)
+        else:
+            self.cadence.reset()
+            self.overlay.update(None)
+            self.handle_absence(now)
+        
+        # --- Emit the processed frame (the overlay is drawn at display size) ---
+        if overlay:
+            with self.metrics.stage("emit"):
+                self.publish_frame(frame)
+
+    def classify(self, landmarks, now, aspect=1.0):
+        """
+        Scores one frame's landmark list (33 MediaPipe landmarks) from a
+        camera frame `aspect` (width / height) wide: posts the verdicts,
+        alerts and records the ratio and features. Returns (posture_ratio, good).
+        """
+        ratios, _, features = extract_features(landmarks_to_array(landmarks)[np.newaxis], aspect)
+        return self.classify_ratio(float(ratios[0]), now, features[0])
+
+    def classify_ratio(self, posture_ratio, now, features=None):
+        """classify() for an already scored frame (see core/replay.py)."""
+        good = self.check_posture(posture_ratio, now)
+        if features is not None:
+            self.check_features(features, now)
+
+        # Record data
+        self.data_manager.add_ratio(posture_ratio, features)
+        return posture_ratio, good
+
+    def check_features(self, features, now):
+        """Posts the enabled features that are over their thresholds as a hint (no alert)."""
+        thresholds = {name: self.settings.get(f"{name}_threshold") for name in self.enabled_features}
+        problems = self.feature_checker.update(features, self.enabled_features, thresholds, now)
+        text = "Check: " + ", ".join(FEATURES[name].problem for name in problems) if problems else ""
+        self.status.post("features", text)
+
+    def handle_absence(self, now):
+        """A frame without a person in it."""
+        # Recorded as its own state rather than a gap in the history
+        self.data_manager.add_absence()
+        if self.presence.absent(now):
+            self.posture_state.reset() # The verdict shows straight away on return
+            self.feature_checker.reset()
+            self.status.post("posture", "Away from desk", "gray")
+            self.status.post("features", "")
+
+    def detect_pose(self, frame):
+        """Runs the estimator on the ROI around the last known pose; landmarks come back in frame coordinates."""
+        if self.pending_estimator is not None:
+            self.swap_estimator()
+        with self.metrics.stage("roi"):
+            image, transform = self.roi.prepare(frame)
+        try:
+            results = self.estimator.process(image)
+        except RuntimeError as error:
+            self.fall_back_to_thread(error)
+            results = self.estimator.process(image)
+        self.metrics.record_stages(results.timings)
+        if self.model_selector and self.model_loader is None and "inference" in results.timings:
+            target = self.model_selector.observe(results.timings["inference"][0], time.perf_counter())
+            if target is not None:
+                self.switch_model(target)
+        if results.pose_landmarks:
+            self.roi.map_back(results.pose_landmarks, transform)
+        self.roi.track(results.pose_landmarks, frame.shape)
+        return results
+
+    def publish_frame(self, frame, overlay=True):
+        """
+        Scales the BGR frame to the display size, draws the overlay on it (unless
+        overlay is False), converts it to RGB and hands it to the GUI.
+        """
+        size = self.display.fitted_size(frame.shape)
+        if size is None:
+            return # Nothing is showing the video right now
+        slot, buffer = self.display.acquire(size)
+        cv2.resize(frame, size, dst=buffer, interpolation=cv2.INTER_LINEAR)
+        if overlay:
+            with self.metrics.stage("overlay"):
+                self.overlay.enabled = self.settings.get("show_overlay")
+                self.overlay.draw(buffer, frame.shape[1])
+        cv2.cvtColor(buffer, cv2.COLOR_BGR2RGB, dst=buffer)
+        self.display.publish(slot)
+
     def start_calibration(self):
         """Called from the GUI to trigger calibration."""
         self.calibrating = True
 
     def run_calibration(self):
         """Collect posture ratios for a few seconds to compute baseline."""
-        self.calibration_status.emit("Sit upright — calibrating posture...")
+        self.status.post("calibration", "Sit upright — calibrating posture...")
         ratios = []
-        start = time.time()
+        start = self.clock.monotonic()
         duration = self.settings.get("calibration_duration")
 
-        while time.time() - start < duration:
-            ret, frame = self.cap.read()
-            if not ret: continue
+        while self.clock.monotonic() - start < duration:
+            packet = self.next_frame(timeout=0.5)
+            if packet is None:
+                if self.mailbox.closed:
+                    break
+                continue
+            frame = packet[0]
             
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.pose.process(rgb)
+            results = self.detect_pose(frame)
             if results.pose_landmarks:
                 ratio = self.read_posture(results.pose_landmarks.landmark)
                 ratios.append(ratio)
             
             # Emit frame during calibration
-            self.frame_ready.emit(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            self.publish_frame(frame, overlay=False)
             time.sleep(0.03) # ~30fps
 
         if ratios:
-            self.baseline = np.mean(ratios)
+            self.baseline = float(np.mean(ratios))
+            # Saved so the stats page re-scores the session against it
+            self.settings.set("baseline", self.baseline)
             b = self.baseline * self.settings.get("posture_strictness")
-            self.calibration_status.emit(f"Calibration complete. Baseline: {b:.3f}")
+            self.status.post("calibration", f"Calibration complete. Baseline: {b:.3f}")
+            self.posture_state.reset() # New threshold: judge afresh
         else:
-            self.calibration_status.emit("Calibration failed — no pose detected.")
+            self.status.post("calibration", "Calibration failed — no pose detected.")
+        # The posture label was showing calibration messages; show the verdict again
+        self.status.forget("posture")
+        self.status.forget("calibration")
 
-    def add_text_and_check(self, frame, posture_ratio):
-        """Replaces add_text, also emits signals."""
-        if self.baseline:
-            threshold = self.baseline * self.settings.get("posture_strictness")
-        else:
-            threshold = self.settings.get("posture_threshold")
-        
-        cv2.putText(frame, f"Posture Ratio: {posture_ratio:.2f}", (30, 80), cv2.FONT_HERSHEY_SIMPLEX, 1, (255,255,255), 2)
+    def check_posture(self, posture_ratio, now):
+        """Posts the debounced good/bad status (and alerts on bad posture). Returns True for good posture."""
+        good = self.posture_state.update(posture_ratio, self.current_threshold(), now)
         
-        if posture_ratio > threshold:
-            cv2.putText(frame, "Good posture", (30, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0,255,0), 2)
-            self.posture_status.emit("Good Posture", "green")
-        else:
-            cv2.putText(frame, "Bad posture", (30, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,255), 2)
-            self.posture_status.emit("Bad Posture", "red")
-            self.handle_audio_alert(posture_ratio, threshold) # Pass threshold
-
-    def handle_audio_alert(self, posture_ratio, threshold):
-        """Play a sound when posture is bad."""
-        if (posture_ratio <= threshold) and self.settings.get("sound_enabled"):
-            if time.time() - self.lastTime > self.settings.get("warning_wait"):
-                self.lastTime = time.time()
+        if good:
+            self.status.post("posture", "Good Posture", "green")
+            return True
+        self.status.post("posture", "Bad Posture", "red")
+        self.handle_audio_alert()
+        return False
+
+    def current_threshold(self):
+        """The good/bad threshold: from the calibration if there is one."""
+        if self.baseline:
+            return self.baseline * self.settings.get("posture_strictness")
+        return self.settings.get("posture_threshold")
+
+    def handle_audio_alert(self):
+        """Play a sound while the (debounced) posture is bad."""
+        if self.settings.get("sound_enabled"):
+            if self.clock.time() - self.lastTime > self.settings.get("warning_wait"):
+                self.lastTime = self.clock.time()
+                self.alerts += 1
+                if not self.sound_loaded:
+                    self.load_warning_sound()
                 if self.warning_sound:
                     self.warning_sound.play()
 
+    def load_warning_sound(self):
+        """Starts pygame's mixer and loads the alert sound (once, on the first alert)."""
+        self.sound_loaded = True
+        import pygame
+        try:
+            pygame.mixer.init()
+            self.warning_sound = pygame.mixer.Sound("assets/warning.wav")
+        except (FileNotFoundError, pygame.error):
+            # Also hit on machines without an audio device (e.g. build boxes)
+            self.warning_sound = None
+            print("Warning: could not load sound file.")
+
     def read_posture(self, landmarks):
-        nose = landmarks[0]
-        left_shoulder = landmarks[11]
-        right_shoulder = landmarks[12]
-        left_shoulder_x = left_shoulder.x
-        right_shoulder_x = right_shoulder.x
-        shoulder_Length = abs(left_shoulder_x - right_shoulder_x)
-        if shoulder_Length < 0.1: # Avoid division by zero if shoulders not visible
-             return 0
-        shoulder_y = (left_shoulder.y + right_shoulder.y) / 2
-        nose_y = nose.y
-        posture_ratio = (shoulder_y - nose_y) / shoulder_Length
-        return posture_ratio
-
-    def reconnect_camera(self):
-        if self.cap:
-            self.cap.release()
-        time.sleep(0.5)
-        self.cap = cv2.VideoCapture(0)
+        """Posture ratio of one frame's landmark list (see core/posture_scoring.py)."""
+        ratios, _ = score_posture(landmarks_to_array(landmarks)[np.newaxis])
+        return float(ratios[0])
 
     def stop(self):
         """Tells the loop to exit."""
@@ -0,0 +1,242 @@
+"""
+Pose estimators used by PoseDetectorThread.
+
+InlinePoseEstimator runs MediaPipe on the calling thread (the original
+behaviour). ProcessPoseEstimator runs it in a separate process so inference
+doesn't compete with the Qt event loop for the GIL; frames are handed over
+through a preallocated shared-memory pool and only the 33 landmarks and
+timings come back.
+
+This module must not import Qt: it is imported by the worker process.
+"""
+import multiprocessing as mp_proc
+import queue
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from core.landmarks import array_to_landmark_list, landmarks_to_array
+
+
+class PoseResult:
+    """
+    What an estimator returns for one frame. pose_landmarks mimics the
+    MediaPipe results attribute (a NormalizedLandmarkList or None) and
+    timings maps stage name -> (wall_s, cpu_s).
+    """
+    __slots__ = ("pose_landmarks", "timings")
+
+    def __init__(self, pose_landmarks, timings):
+        self.pose_landmarks = pose_landmarks
+        self.timings = timings
+
+
+def _build_pose(options):
+    """
+    options are keyword arguments for mp.solutions.pose.Pose (model_complexity,
+    min_detection_confidence, ...). Only the "full" model ships with MediaPipe;
+    "lite" and "heavy" are downloaded on first use, so building one of them
+    raises OSError on a machine that is offline.
+    """
+    import mediapipe as mp
+    return mp.solutions.pose.Pose(**(options or {}))
+
+
+def _timed(func, *args):
+    """Calls func(*args) and returns (result, (wall_s, cpu_s))."""
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    result = func(*args)
+    return result, (time.perf_counter() - wall_start, time.process_time() - cpu_start)
+
+
+class InlinePoseEstimator:
+    """Runs MediaPipe Pose directly on the calling thread."""
+
+    def __init__(self, pose_options=None):
+        self.pose_options = dict(pose_options or {})
+        self.pose = _build_pose(self.pose_options)
+
+    def process(self, frame):
+        rgb, convert_time = _timed(cv2.cvtColor, frame, cv2.COLOR_BGR2RGB)
+        results, inference_time = _timed(self.pose.process, rgb)
+        return PoseResult(results.pose_landmarks,
+                          {"convert": convert_time, "inference": inference_time})
+
+    def close(self):
+        self.pose.close()
+
+
+class SharedFramePool:
+    """
+    A fixed number of frame-sized slots in one shared-memory block.
+    The owner writes BGR frames into free slots; the worker attaches by name
+    and reads them in place, so no frame data is ever pickled.
+    """
+
+    def __init__(self, slots, frame_shape, name=None):
+        self.slots = slots
+        self.frame_shape = tuple(frame_shape)
+        self.slot_bytes = int(np.prod(self.frame_shape))
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=self.slot_bytes * slots)
+            self.owner = True
+        else:
+            # Spawned workers share the parent's resource tracker, so attaching
+            # doesn't take ownership; only the creator unlinks the block.
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.buffer = np.ndarray((slots,) + self.frame_shape, dtype=np.uint8, buffer=self.shm.buf)
+        self.free = list(range(slots))
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def fits(self, frame):
+        return frame.shape == self.frame_shape and frame.dtype == np.uint8
+
+    def acquire(self):
+        return self.free.pop() if self.free else None
+
+    def release(self, slot):
+        if slot not in self.free:
+            self.free.append(slot)
+
+    def close(self):
+        del self.buffer
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _worker_main(requests, results, pose_options):
+    """Entry point of the inference process."""
+    try:
+        pose = _build_pose(pose_options)
+    except Exception as error: # Reported to the parent instead of leaving it waiting
+        results.put(("error", f"{type(error).__name__}: {error}"))
+        return
+    pool = None
+    results.put(("ready",))
+
+    while True:
+        message = requests.get()
+        if message is None:
+            break
+
+        kind = message[0]
+        if kind == "attach":
+            _, name, slots, shape = message
+            if pool:
+                pool.close()
+            pool = SharedFramePool(slots, shape, name=name)
+        elif kind == "frame":
+            _, seq, slot = message
+            rgb, convert_time = _timed(cv2.cvtColor, pool.buffer[slot], cv2.COLOR_BGR2RGB)
+            output, inference_time = _timed(pose.process, rgb)
+            landmarks = None
+            if output.pose_landmarks:
+                landmarks = landmarks_to_array(output.pose_landmarks.landmark)
+            results.put(("result", seq, slot, landmarks,
+                         {"convert": convert_time, "inference": inference_time}))
+
+    if pool:
+        pool.close()
+    pose.close()
+
+
+class ProcessPoseEstimator:
+    """
+    Runs MediaPipe Pose in a child process. process() copies the frame into a
+    shared-memory slot, sends the slot index and waits for the landmarks; the
+    calling thread holds no GIL while it waits. If the process has died,
+    process() raises RuntimeError instead of waiting for it.
+    """
+    # How often a wait for landmarks checks that the worker is still alive
+    POLL_INTERVAL = 0.25
+
+    def __init__(self, pose_options=None, slots=2, timeout=5.0):
+        self.pose_options = dict(pose_options or {})
+        self.slots = slots
+        self.timeout = timeout
+        self.pool = None
+        self.seq = 0
+
+        # spawn: forking a process that already runs Qt threads is unsafe
+        context = mp_proc.get_context("spawn")
+        self.requests = context.Queue()
+        self.results = context.Queue()
+        self.process_handle = context.Process(target=_worker_main, args=(self.requests, self.results, self.pose_options),
+                                              name="PoseInference", daemon=True)
+        self.process_handle.start()
+        message = self.results.get(timeout=60) # Wait until the model is loaded
+        if message[0] == "error":
+            self.process_handle.join(timeout=5)
+            raise RuntimeError(f"Pose worker could not load the model: {message[1]}")
+
+    def _ensure_pool(self, frame):
+        if self.pool and self.pool.fits(frame):
+            return
+        if self.pool:
+            self.pool.close()
+        self.pool = SharedFramePool(self.slots, frame.shape)
+        self.requests.put(("attach", self.pool.name, self.slots, frame.shape))
+
+    def _check_worker(self):
+        if not self.process_handle.is_alive():
+            raise RuntimeError(f"Pose worker process exited (exit code {self.process_handle.exitcode})")
+
+    def process(self, frame):
+        roundtrip_start = time.perf_counter()
+        cpu_start = time.process_time()
+
+        self._check_worker()
+        self._ensure_pool(frame)
+        slot = self.pool.acquire()
+        np.copyto(self.pool.buffer[slot], frame)
+        self.seq += 1
+        self.requests.put(("frame", self.seq, slot))
+
+        deadline = time.perf_counter() + self.timeout
+        while True:
+            try:
+                _, seq, returned_slot, landmarks, timings = self.results.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                self._check_worker()
+                if time.perf_counter() < deadline:
+                    continue
+                # Worker is stuck; report no pose rather than hanging the loop
+                self.pool.free = list(range(self.slots))
+                return PoseResult(None, {})
+            self.pool.release(returned_slot)
+            if seq == self.seq:
+                break
+
+        timings["roundtrip"] = (time.perf_counter() - roundtrip_start,
+                                time.process_time() - cpu_start)
+        pose_landmarks = array_to_landmark_list(landmarks) if landmarks is not None else None
+        return PoseResult(pose_landmarks, timings)
+
+    def close(self):
+        if self.process_handle.is_alive():
+            self.requests.put(None)
+            self.process_handle.join(timeout=5)
+        if self.process_handle.is_alive():
+            self.process_handle.terminate()
+            self.process_handle.join()
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+
+
+def create_pose_estimator(mode, pose_options=None):
+    """
+    mode is the "inference_mode" setting: "thread" or "process".
+    pose_options go to mp.solutions.pose.Pose (see _build_pose()).
+    """
+    if mode == "process":
+        return ProcessPoseEstimator(pose_options)
+    return InlinePoseEstimator(pose_options)
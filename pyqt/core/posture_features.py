@@ -0,0 +1,112 @@
+"""
+Posture features besides the posture ratio, from the same 33 landmarks:
+head tilt, shoulder asymmetry, forward head and closeness to the screen.
+extract_features() computes all of them, and the posture ratio, from one
+gather of the five landmarks they need, for one frame or a whole recording.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from core.posture_scoring import LEFT_SHOULDER, MIN_SHOULDER_WIDTH, NOSE, RIGHT_SHOULDER, posture_ratios
+from core.posture_state import PostureDebouncer
+
+LEFT_EAR = 7
+RIGHT_EAR = 8
+# Same as the overlay: less visible ears aren't used
+MIN_VISIBILITY = 0.5
+
+# Every feature gets worse as it grows; its "<name>_threshold" setting is the highest good value.
+# hysteresis is in the feature's unit, plot_max the initial top of its graph
+Feature = namedtuple("Feature", "label unit problem hysteresis plot_max")
+FEATURES = {
+    # Angle of the line between the ears
+    "head_tilt": Feature("Head Tilt", "°", "head tilted", 1.0, 30.0),
+    # Angle of the line between the shoulders
+    "shoulder_asymmetry": Feature("Shoulder Asymmetry", "°", "shoulders uneven", 0.5, 15.0),
+    # How much nearer the camera the ears are than the shoulders, in shoulder widths
+    "forward_head": Feature("Forward Head", "× shoulder width", "head forward", 0.05, 1.5),
+    # Shoulder width as a fraction of the frame width: grows as you lean in to the screen
+    "shoulder_width": Feature("Screen Closeness", "× frame width", "too close to the screen", 0.02, 1.0),
+}
+FEATURE_NAMES = tuple(FEATURES)
+
+
+def extract_features(landmarks, aspect=1.0):
+    """
+    Posture ratios and features of an (N, 33, 4) landmark array.
+    aspect is the camera frame's width / height, so angles come out as
+    they look on screen (landmark x and y are fractions of the width and
+    the height).
+
+    Returns (ratios, valid, features): ratios and valid as from
+    score_posture(), features an (N, len(FEATURE_NAMES)) float32 array in
+    FEATURE_NAMES order. A feature is NaN where it can't be measured: no
+    pose, shoulders too close together, or ears not visible.
+    """
+    landmarks = np.asarray(landmarks)
+    points = landmarks[:, (NOSE, LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_EAR, RIGHT_EAR)].astype(np.float64)
+    nose, left, right, left_ear, right_ear = points.transpose(1, 0, 2)
+    ratios, valid = posture_ratios(nose, left, right)
+
+    shoulder_length = np.abs(left[:, 0] - right[:, 0])
+    wide = shoulder_length >= MIN_SHOULDER_WIDTH
+    ears = (left_ear[:, 3] >= MIN_VISIBILITY) & (right_ear[:, 3] >= MIN_VISIBILITY)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        columns = {
+            "head_tilt": np.degrees(np.arctan2(np.abs(left_ear[:, 1] - right_ear[:, 1]),
+                                               np.abs(left_ear[:, 0] - right_ear[:, 0]) * aspect)),
+            "shoulder_asymmetry": np.degrees(np.arctan2(np.abs(left[:, 1] - right[:, 1]),
+                                                        shoulder_length * aspect)),
+            # z is on the same scale as x and smaller nearer the camera
+            "forward_head": ((left[:, 2] + right[:, 2]) - (left_ear[:, 2] + right_ear[:, 2])) / 2
+                            / shoulder_length,
+            "shoulder_width": shoulder_length,
+        }
+    columns["head_tilt"][~ears] = np.nan
+    columns["shoulder_asymmetry"][~wide] = np.nan
+    columns["forward_head"][~(ears & wide)] = np.nan
+
+    features = np.empty((len(points), len(FEATURE_NAMES)), dtype=np.float32)
+    for i, name in enumerate(FEATURE_NAMES):
+        features[:, i] = columns[name]
+    return ratios, valid, features
+
+
+def parse_feature_names(text):
+    """The "posture_features" setting (comma-separated names) as a tuple of known names."""
+    names = {name.strip() for name in text.split(",")}
+    return tuple(name for name in FEATURE_NAMES if name in names)
+
+
+class FeatureChecker:
+    """
+    Debounced over/under-threshold verdicts for the enabled features, one
+    PostureDebouncer each (with the feature's own hysteresis), so a value
+    hovering at its threshold doesn't make the hint flicker.
+    """
+
+    def __init__(self, dwell=1.0):
+        self.debouncers = {name: PostureDebouncer(feature.hysteresis, dwell)
+                           for name, feature in FEATURES.items()}
+
+    def update(self, features, enabled, thresholds, now):
+        """
+        Feeds one frame's features (a row in FEATURE_NAMES order); returns the
+        names of the enabled features that are over their threshold.
+        """
+        problems = []
+        for name, value in zip(FEATURE_NAMES, features.tolist()):
+            if name not in enabled:
+                continue
+            debouncer = self.debouncers[name]
+            if value == value: # Not NaN: unmeasurable frames keep the last verdict
+                # Negated, because these get worse as they grow
+                debouncer.update(-value, -thresholds[name], now)
+            if debouncer.good is False:
+                problems.append(name)
+        return problems
+
+    def reset(self):
+        for debouncer in self.debouncers.values():
+            debouncer.reset()
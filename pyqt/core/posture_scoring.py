@@ -0,0 +1,40 @@
+"""
+Posture ratio of landmark arrays: the live detector scores one frame at a
+time through read_posture(), recordings and analyses score whole arrays.
+"""
+import numpy as np
+
+NOSE = 0
+LEFT_SHOULDER = 11
+RIGHT_SHOULDER = 12
+# Shoulders closer together than this (normalized width) score 0: turned sideways or not visible
+MIN_SHOULDER_WIDTH = 0.1
+
+
+def score_posture(landmarks):
+    """
+    Posture ratios of an (N, 33, 4) landmark array (x, y, z, visibility):
+    (average shoulder y - nose y) / shoulder width, per sample.
+
+    Returns (ratios, valid), two arrays of length N. valid is False for
+    samples scored 0 because the shoulders are too close together, and for
+    samples without a pose (NaN landmarks, as recorded), whose ratio is NaN.
+    """
+    landmarks = np.asarray(landmarks)
+    # The three points gathered in one pass, in float64 like the per-frame
+    # arithmetic on Python floats, so both agree exactly
+    points = landmarks[:, (NOSE, LEFT_SHOULDER, RIGHT_SHOULDER), :2].astype(np.float64)
+    return posture_ratios(points[:, 0], points[:, 1], points[:, 2])
+
+
+def posture_ratios(nose, left, right):
+    """score_posture() from float64 (N, 2+) nose, left and right shoulder points (x, y first)."""
+    shoulder_length = np.abs(left[:, 0] - right[:, 0])
+    shoulder_y = (left[:, 1] + right[:, 1]) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = (shoulder_y - nose[:, 1]) / shoulder_length
+
+    narrow = shoulder_length < MIN_SHOULDER_WIDTH # False for NaN
+    ratios[narrow] = 0.0 # Avoid division by zero if shoulders not visible
+    valid = ~narrow & np.isfinite(ratios)
+    return ratios, valid
@@ -0,0 +1,39 @@
+class PostureDebouncer:
+    """
+    Turns per-frame posture ratios into a steady good/bad verdict for the
+    status label and the audio alert.
+
+    Hysteresis: while the verdict is good, the ratio must fall to
+    threshold - hysteresis to count as bad, and while it is bad it must rise
+    above threshold + hysteresis to count as good. Dwell: a new verdict only
+    takes over once it has held for `dwell` seconds. The first verdict (and
+    the first after reset()) is taken straight away.
+    """
+
+    def __init__(self, hysteresis=0.02, dwell=1.0):
+        self.hysteresis = hysteresis
+        self.dwell = dwell
+        self.good = None # Current verdict, None before the first ratio
+        self.pending_since = None # When the other verdict was first seen, if it is being seen
+
+    def update(self, ratio, threshold, now):
+        """Feeds one ratio; returns the (debounced) verdict, True for good posture."""
+        if self.good is None:
+            self.good = ratio > threshold
+            return self.good
+
+        margin = -self.hysteresis if self.good else self.hysteresis
+        if (ratio > threshold + margin) == self.good:
+            self.pending_since = None
+            return self.good
+
+        if self.pending_since is None:
+            self.pending_since = now
+        if now - self.pending_since >= self.dwell:
+            self.good = not self.good
+            self.pending_since = None
+        return self.good
+
+    def reset(self):
+        self.good = None
+        self.pending_since = None
@@ -0,0 +1,66 @@
+import threading
+import time
+
+
+class PowerMode:
+    """How hard the detector works (set from the main window's state)."""
+    # Pose page on screen: every frame, with the overlay and video
+    FOREGROUND = "foreground"
+    # Window minimized or another page open: classification and alerts only,
+    # at the background rate
+    BACKGROUND = "background"
+    # Not monitoring: the camera is released
+    PAUSED = "paused"
+
+
+class PowerScheduler:
+    """
+    Shared by the capture thread and the detector loop. In the foreground
+    frames are read as fast as the camera delivers them; in the background
+    the capture thread sleeps between frames, which throttles everything
+    downstream; while paused it waits without reading at all.
+    """
+
+    def __init__(self, background_fps=2.0):
+        self.mode = PowerMode.FOREGROUND
+        self.background_fps = background_fps
+        self._cond = threading.Condition()
+        self._last_capture = 0.0
+
+    def set_mode(self, mode, background_fps=None):
+        with self._cond:
+            self.mode = mode
+            if background_fps is not None:
+                self.background_fps = background_fps
+            self._cond.notify_all()
+
+    def wait_for_capture(self, stopped):
+        """
+        Blocks the capture thread until the next frame is due.
+        Returns the mode to capture in, or None once stopped() is true.
+        """
+        with self._cond:
+            while not stopped():
+                if self.mode == PowerMode.FOREGROUND:
+                    return self.mode
+                if self.mode == PowerMode.PAUSED:
+                    return self.mode # The caller releases the camera, then calls wait_while_paused()
+
+                due = self._last_capture + 1.0 / self.background_fps
+                remaining = due - time.perf_counter()
+                if remaining <= 0:
+                    self._last_capture = time.perf_counter()
+                    return self.mode
+                self._cond.wait(remaining) # Woken early by a mode change
+            return None
+
+    def wait_while_paused(self, stopped):
+        """Blocks until the mode leaves PAUSED or stopped() is true."""
+        with self._cond:
+            while self.mode == PowerMode.PAUSED and not stopped():
+                self._cond.wait()
+
+    def wake(self):
+        """Wakes waiting threads so they re-check stopped() (used on shutdown)."""
+        with self._cond:
+            self._cond.notify_all()
@@ -0,0 +1,163 @@
+import math
+from bisect import bisect_right
+
+import numpy as np
+
+from core.session_stats import longest_true_run, trailing_true_run
+
+
+class RatioIndex:
+    """
+    Answers "how many samples are good" and "how long is the longest good
+    streak" for any threshold, over the 1-second ratios in the posture log,
+    without rescanning it (the statistics page's what-if slider).
+
+    Ratios and thresholds are put on a grid of `step`: a threshold is rounded
+    down to it and a ratio up, so "ratio > threshold" is decided per bin.
+    NaN (away) samples are never good and end a streak.
+
+    - Good counts come from a histogram of the bins: one bin is updated per
+      sample added or evicted, a query sums the bins above the threshold.
+    - Streaks come from a monotonic stack over the samples. A sample popped
+      off it by a lower one is the minimum of the window between its
+      neighbours on the stack, so that window is a streak for any threshold
+      below its bin: the longest such window is kept per bin (`best`). Those
+      still on the stack have windows that reach the newest sample. Appends
+      are amortized O(1); a query is O(bins + log n).
+
+    Evicting the oldest sample would shorten windows that are already
+    counted in `best`, so the index keeps the oldest `head_size` samples
+    apart (the head) and only indexes the ones after them. Evictions eat
+    into the head; a query rescans what is left of it and joins its last
+    streak with the indexed samples' first one. Once the head is used up
+    the next `head_size` samples become the head and the rest takes over as
+    the indexed samples. Their index is built ahead of time, a few samples
+    per add(), so no single sample pays for re-indexing the whole log.
+    """
+
+    def __init__(self, capacity, step=0.01, top=2.0, head_size=None):
+        self.capacity = capacity
+        self.step = step
+        self.bins = int(round(top / step))
+        self.head_size = head_size or max(1, capacity // 10)
+        # Present samples per bin; bin b holds ratios in ((b - 1) * step, b * step]
+        self.histogram = np.zeros(self.bins + 1, dtype=np.int64)
+        self.present = 0
+        self.head = np.empty(0, dtype=np.int16)
+        self.head_start = 0 # Samples of the head already evicted
+        self.indexed = StreakStack(capacity, self.bins)
+        # The indexed samples after the next head, fed from `indexed` a few per add()
+        self.upcoming = StreakStack(capacity, self.bins)
+        self.fed = self.head_size + 1 # Position in `indexed` of the next sample to feed it
+        # Enough per add() for `upcoming` to be complete when the head is used up
+        self.feed_rate = 1 + math.ceil(capacity / self.head_size)
+
+    def quantize(self, ratio):
+        """A ratio's bin, or -1 for NaN."""
+        if math.isnan(ratio):
+            return -1
+        return min(max(math.ceil(ratio / self.step - 1e-9), 0), self.bins)
+
+    def threshold_bin(self, threshold):
+        """Samples in bins above this one are good at the threshold."""
+        return min(max(math.floor(threshold / self.step + 1e-9), 0), self.bins)
+
+    def add(self, ratio):
+        """Adds the newest sample."""
+        value = self.quantize(ratio)
+        if value >= 0:
+            self.histogram[value] += 1
+            self.present += 1
+        self.indexed.append(value)
+        self._feed(self.feed_rate)
+
+    def _feed(self, count):
+        """Indexes up to `count` more of the samples `upcoming` will hold."""
+        end = min(self.fed + count, self.indexed.length)
+        for value in self.indexed.values[self.fed:end].tolist():
+            self.upcoming.append(value)
+        self.fed = max(self.fed, end)
+
+    def remove(self, ratio):
+        """Removes the oldest sample (when the posture log drops it)."""
+        value = self.quantize(ratio)
+        if value >= 0:
+            self.histogram[value] -= 1
+            self.present -= 1
+        if self.head_start < len(self.head):
+            self.head_start += 1
+            return
+        # The head is used up: the oldest indexed sample is the one going,
+        # the next head_size become the head and `upcoming` indexes the rest
+        self._feed(self.indexed.length) # Normally nothing is left to feed
+        self.head = self.indexed.values[1:self.head_size + 1].copy()
+        self.head_start = 0
+        self.indexed, self.upcoming = self.upcoming, self.indexed
+        self.upcoming.clear()
+        self.fed = self.head_size + 1
+
+    def good_count(self, threshold):
+        """Present samples with a ratio above the threshold."""
+        return int(self.histogram[self.threshold_bin(threshold) + 1:].sum())
+
+    def longest_streak(self, threshold):
+        """Longest run of consecutive samples with a ratio above the threshold."""
+        level = self.threshold_bin(threshold)
+        indexed = self.indexed
+        longest = int(indexed.best[level + 1:].max(initial=0))
+
+        # Windows still on the stack end at the newest sample; the first one above the level is the longest
+        first = bisect_right(indexed.stack_bins, level)
+        if first < len(indexed.stack_bins):
+            start = indexed.stack_positions[first - 1] + 1 if first else 0
+            longest = max(longest, indexed.length - start)
+
+        head = self.head[self.head_start:]
+        if len(head):
+            good = head > level
+            longest = max(longest, longest_true_run(good))
+            # The head's last streak carries on into the indexed samples' first one
+            # (up to the first indexed sample at or below the level)
+            leading = int(np.searchsorted(indexed.negated_prefix_min[:indexed.length], -level))
+            longest = max(longest, trailing_true_run(good) + leading)
+        return longest
+
+
+class StreakStack:
+    """
+    The monotonic stack over a run of sample bins (RatioIndex's indexed
+    samples) and the longest window per bin popped off it.
+    """
+
+    def __init__(self, capacity, bins):
+        self.values = np.empty(capacity, dtype=np.int16) # Bins (-1 = away)
+        # Minus the lowest bin so far, non-decreasing so searchsorted() finds where the first streak ends
+        self.negated_prefix_min = np.empty(capacity, dtype=np.int16)
+        self.length = 0
+        self.best = np.zeros(bins + 1, dtype=np.int64)
+        self.stack_bins = []
+        self.stack_positions = []
+
+    def clear(self):
+        self.length = 0
+        self.best[:] = 0
+        self.stack_bins.clear()
+        self.stack_positions.clear()
+
+    def append(self, value):
+        position = self.length
+        self.values[position] = value
+        self.negated_prefix_min[position] = (
+            -value if position == 0 else max(self.negated_prefix_min[position - 1], -value))
+        stack_bins, stack_positions = self.stack_bins, self.stack_positions
+        while stack_bins and stack_bins[-1] >= value:
+            popped = stack_bins.pop()
+            stack_positions.pop()
+            if popped >= 0:
+                start = stack_positions[-1] + 1 if stack_positions else 0
+                if position - start > self.best[popped]:
+                    self.best[popped] = position - start
+        # Away samples go on the stack too, so windows after them start after them
+        stack_bins.append(value)
+        stack_positions.append(position)
+        self.length += 1
@@ -0,0 +1,53 @@
+"""
+Replays a landmark recording (core/landmark_recording.py) through the same
+scoring, debouncing, alerting and data manager code the live detector uses,
+on a ReplayClock that jumps from one recorded timestamp to the next. No
+camera, MediaPipe or event loop is involved, so an hour of recording
+replays in seconds.
+"""
+from app_data import AppDataManager
+from core.clock import ReplayClock
+from core.pose_detector_thread import PoseDetectorThread
+from core.posture_features import extract_features
+
+
+class LandmarkReplay:
+    """
+    Feeds recorded frames to a PoseDetectorThread that is never started.
+    The detector and data manager share the replay clock; the alert sound
+    is never played, but alerts are counted (detector.alerts).
+    Recordings don't keep the camera frame's shape; features are measured
+    as if it was `aspect` (width / height).
+    """
+
+    def __init__(self, settings, aspect=16 / 9):
+        self.aspect = aspect
+        self.clock = ReplayClock()
+        self.data_manager = AppDataManager(settings, clock=self.clock)
+        self.detector = PoseDetectorThread(settings, self.data_manager, clock=self.clock)
+        self.detector.sound_loaded = True # No pygame; warning_sound stays None
+        self.frames = 0
+        self.transitions = [] # (time, status text) each time the posture status changed
+        # Emitted on this thread, so this runs straight away
+        self.detector.status.changed.connect(self.on_status)
+
+    def on_status(self):
+        posture = self.detector.status.take().get("posture")
+        if posture:
+            self.transitions.append((self.clock.now, posture[0]))
+
+    def run(self, records, chunk_frames=4096):
+        """Replays records (from open_recording()) in order."""
+        detector = self.detector
+        for start in range(0, len(records), chunk_frames):
+            # Copied out of the memmap and scored a chunk at a time
+            chunk = records[start:start + chunk_frames]
+            ratios, _, features = extract_features(chunk["landmarks"], self.aspect)
+            for now, ratio, row in zip(chunk["time"].tolist(), ratios.tolist(), features):
+                self.clock.set(now)
+                if ratio != ratio: # NaN: no pose in this frame
+                    detector.handle_absence(now)
+                else:
+                    detector.presence.observe(True, now)
+                    detector.classify_ratio(ratio, now, row)
+                self.frames += 1
@@ -0,0 +1,67 @@
+import numpy as np
+
+
+class PostureRingBuffer:
+    """
+    Fixed-capacity, columnar ring buffer of (timestamp, ratio) samples,
+    plus one float32 column per name in `feature_names` (NaN if a sample
+    has no features).
+
+    Every sample is written twice, at slot i and at slot i + capacity, so the
+    samples in oldest-to-newest order are always one contiguous slice of the
+    storage. Readers get that slice as a zero-copy view instead of a rebuilt
+    list; appending is O(1) and never moves existing data.
+    """
+
+    def __init__(self, capacity, feature_names=()):
+        self.capacity = capacity
+        self.feature_names = tuple(feature_names)
+        self._timestamps = np.zeros(capacity * 2, dtype=np.float64)
+        self._ratios = np.zeros(capacity * 2, dtype=np.float32)
+        # One row per feature, so each feature's samples are contiguous too
+        self._features = np.full((len(self.feature_names), capacity * 2), np.nan, dtype=np.float32)
+        self.head = 0 # Slot of the oldest sample
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, timestamp, ratio, features=None):
+        """
+        Adds a sample (features in feature_names order, or None), evicting the
+        oldest one once the buffer is full.
+        Returns the evicted (timestamp, ratio) or None.
+        """
+        evicted = None
+        if self.size < self.capacity:
+            slot = (self.head + self.size) % self.capacity
+            self.size += 1
+        else:
+            slot = self.head
+            evicted = (float(self._timestamps[slot]), float(self._ratios[slot]))
+            self.head = (self.head + 1) % self.capacity
+
+        self._timestamps[slot] = self._timestamps[slot + self.capacity] = timestamp
+        self._ratios[slot] = self._ratios[slot + self.capacity] = ratio
+        if len(self.feature_names):
+            self._features[:, slot] = self._features[:, slot + self.capacity] = (
+                np.nan if features is None else features)
+        return evicted
+
+    @property
+    def timestamps(self):
+        """Oldest-to-newest timestamps (a view, don't modify)."""
+        return self._timestamps[self.head:self.head + self.size]
+
+    @property
+    def ratios(self):
+        """Oldest-to-newest ratios (a view, don't modify)."""
+        return self._ratios[self.head:self.head + self.size]
+
+    def feature(self, name):
+        """Oldest-to-newest values of one feature (a view, don't modify)."""
+        return self._features[self.feature_names.index(name), self.head:self.head + self.size]
+
+    @property
+    def nbytes(self):
+        return self._timestamps.nbytes + self._ratios.nbytes + self._features.nbytes
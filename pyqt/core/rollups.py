@@ -0,0 +1,151 @@
+import math
+
+import numpy as np
+
+
+class RollupTier:
+    """
+    Per-bucket aggregates (count, mean, min, max, good fraction, no-pose time)
+    at one resolution, kept in a fixed-size ring so memory never grows.
+    """
+
+    def __init__(self, bucket_seconds, capacity):
+        self.bucket_seconds = bucket_seconds
+        self.capacity = capacity
+        self.starts = np.zeros(capacity, dtype=np.float64)
+        self.counts = np.zeros(capacity, dtype=np.int32)
+        self.sums = np.zeros(capacity, dtype=np.float64)
+        self.mins = np.zeros(capacity, dtype=np.float32)
+        self.maxs = np.zeros(capacity, dtype=np.float32)
+        self.goods = np.zeros(capacity, dtype=np.int32)
+        self.no_pose = np.zeros(capacity, dtype=np.float32)
+        self.head = 0 # Slot of the oldest bucket
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def _bucket_slot(self, timestamp):
+        """Returns the slot for the bucket containing timestamp, opening a new one if needed."""
+        bucket_start = math.floor(timestamp / self.bucket_seconds) * self.bucket_seconds
+        if self.size:
+            newest = (self.head + self.size - 1) % self.capacity
+            if self.starts[newest] == bucket_start:
+                return newest
+            if bucket_start < self.starts[newest]:
+                return None # Out-of-order sample older than the open bucket
+
+        if self.size < self.capacity:
+            slot = (self.head + self.size) % self.capacity
+            self.size += 1
+        else:
+            slot = self.head
+            self.head = (self.head + 1) % self.capacity
+
+        self.starts[slot] = bucket_start
+        self.counts[slot] = 0
+        self.sums[slot] = 0.0
+        self.mins[slot] = np.inf
+        self.maxs[slot] = -np.inf
+        self.goods[slot] = 0
+        self.no_pose[slot] = 0.0
+        return slot
+
+    def add(self, timestamp, ratio, is_good):
+        """Adds a 1-second sample."""
+        slot = self._bucket_slot(timestamp)
+        if slot is None:
+            return
+        self.counts[slot] += 1
+        self.sums[slot] += ratio
+        self.mins[slot] = min(self.mins[slot], ratio)
+        self.maxs[slot] = max(self.maxs[slot], ratio)
+        if is_good:
+            self.goods[slot] += 1
+
+    def add_no_pose(self, start, end):
+        """Adds the seconds between start and end, split over the buckets they span."""
+        while end - start > 1e-9:
+            bucket_end = (math.floor(start / self.bucket_seconds) + 1) * self.bucket_seconds
+            chunk_end = min(end, bucket_end)
+            slot = self._bucket_slot(start)
+            if slot is not None:
+                self.no_pose[slot] += chunk_end - start
+            start = chunk_end
+
+    def _ordered(self, column):
+        if self.head + self.size <= self.capacity:
+            return column[self.head:self.head + self.size]
+        return np.concatenate((column[self.head:], column[:(self.head + self.size) % self.capacity]))
+
+    def query(self, start, end):
+        """Buckets whose start lies in [start, end), oldest first, as a dict of arrays."""
+        starts = self._ordered(self.starts)
+        lo, hi = np.searchsorted(starts, [start, end])
+        counts = self._ordered(self.counts)[lo:hi]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = self._ordered(self.sums)[lo:hi] / counts
+            good_fraction = self._ordered(self.goods)[lo:hi] / counts
+        empty = counts == 0
+        mins = self._ordered(self.mins)[lo:hi].astype(np.float64)
+        maxs = self._ordered(self.maxs)[lo:hi].astype(np.float64)
+        mins[empty] = maxs[empty] = np.nan
+        return {
+            "time": starts[lo:hi],
+            "count": counts,
+            "mean": means,
+            "min": mins,
+            "max": maxs,
+            "good_fraction": good_fraction,
+            "no_pose_s": self._ordered(self.no_pose)[lo:hi],
+        }
+
+
+class RollupStore:
+    """
+    1-minute, 15-minute and 1-hour rollups maintained from the 1-second
+    samples, each tier bounded to a fixed number of buckets.
+    """
+    # (bucket seconds, buckets kept)
+    TIERS = (
+        (60, 7 * 24 * 60),        # a week of minutes
+        (900, 90 * 24 * 4),       # ~3 months of quarter hours
+        (3600, 2 * 365 * 24),     # ~2 years of hours
+    )
+    # Gaps longer than this between samples are counted as time without a pose
+    SAMPLE_INTERVAL = 1.0
+
+    def __init__(self):
+        self.tiers = [RollupTier(seconds, capacity) for seconds, capacity in self.TIERS]
+        self.last_timestamp = None
+
+    def add(self, timestamp, ratio, is_good):
+        """Adds a 1-second sample; a NaN ratio (nobody there) counts as time without a pose."""
+        if self.last_timestamp is not None:
+            gap = timestamp - self.last_timestamp - self.SAMPLE_INTERVAL
+            if gap >= self.SAMPLE_INTERVAL:
+                for tier in self.tiers:
+                    tier.add_no_pose(self.last_timestamp + self.SAMPLE_INTERVAL, timestamp)
+        self.last_timestamp = timestamp
+
+        for tier in self.tiers:
+            if math.isnan(ratio):
+                tier.add_no_pose(timestamp, timestamp + self.SAMPLE_INTERVAL)
+            else:
+                tier.add(timestamp, ratio, is_good)
+
+    def tier_for(self, resolution_s):
+        """The coarsest tier whose buckets are no wider than resolution_s (None -> use raw samples)."""
+        chosen = None
+        for tier in self.tiers:
+            if tier.bucket_seconds <= resolution_s:
+                chosen = tier
+        return chosen
+
+    @property
+    def nbytes(self):
+        return sum(
+            sum(getattr(tier, name).nbytes for name in
+                ("starts", "counts", "sums", "mins", "maxs", "goods", "no_pose"))
+            for tier in self.tiers
+        )
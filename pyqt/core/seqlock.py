@@ -0,0 +1,46 @@
+import time
+from contextlib import contextmanager
+
+
+class SeqLock:
+    """
+    Single-writer sequence lock: the writer never waits, readers retry.
+
+    The writer wraps each update in `with write():`, which makes `sequence`
+    odd while the update is in progress and even (and larger) afterwards.
+    read(func) runs func, which must copy whatever it needs out of the
+    shared state, and runs it again if a write started or finished in the
+    meantime, so callers only ever see state from between two writes.
+    Only one thread may write.
+    """
+
+    def __init__(self):
+        self.sequence = 0
+        self.retries = 0 # Reads that overlapped a write and were repeated
+
+    @contextmanager
+    def write(self):
+        self.sequence += 1
+        try:
+            yield
+        finally:
+            self.sequence += 1
+
+    def read(self, func):
+        """Returns func() as computed over a state no write overlapped."""
+        while True:
+            start = self.sequence
+            if start & 1:
+                self.retries += 1
+                time.sleep(0) # Let the writer finish
+                continue
+            try:
+                result = func()
+            except (IndexError, ValueError):
+                # A torn state can break the read itself; only a real error if nothing was written
+                if self.sequence == start:
+                    raise
+                result = None
+            if self.sequence == start:
+                return result
+            self.retries += 1
@@ -0,0 +1,152 @@
+import math
+
+import numpy as np
+
+
+class SessionStats:
+    """
+    Posture statistics kept up to date one 1-second sample at a time.
+
+    add() and remove() are O(1): good time, current/longest good streak and a
+    running mean/variance (Welford) of the ratio. When the threshold changes
+    the whole window is re-scored once with recompute(). Evicting samples of
+    the oldest good run only needs a rescan (refresh_longest()) when that run
+    may be the longest one.
+
+    NaN samples mean nobody was at the desk: they are counted in
+    absent_count, end the current streak and are left out of the mean.
+    """
+
+    def __init__(self, threshold=None):
+        self.reset(threshold)
+
+    def reset(self, threshold=None):
+        self.threshold = threshold
+        self.count = 0 # Samples with a pose
+        self.absent_count = 0
+        self.good_count = 0
+        self.current_streak = 0
+        self.longest_streak = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        # Good samples at the start of the window (None = not known until the next rescan)
+        self.leading_streak = 0
+        # Set when evicting a sample may have shortened the longest streak
+        self.longest_stale = False
+
+    @property
+    def variance(self):
+        return self._m2 / self.count if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def add(self, ratio):
+        """Adds the newest sample."""
+        window = self.count + self.absent_count
+        if math.isnan(ratio):
+            self.absent_count += 1
+            self.current_streak = 0
+            return
+
+        self.count += 1
+        delta = ratio - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (ratio - self.mean)
+
+        if ratio > self.threshold:
+            self.good_count += 1
+            self.current_streak += 1
+            if self.leading_streak == window:
+                self.leading_streak += 1 # The whole window is one good run
+            if self.current_streak > self.longest_streak:
+                self.longest_streak = self.current_streak
+        else:
+            self.current_streak = 0
+
+    def remove(self, ratio):
+        """Removes the oldest sample (when the history window drops it)."""
+        if math.isnan(ratio):
+            self.absent_count -= 1
+            self._leading_bad_removed()
+            return
+        if self.count <= 1:
+            absent_count = self.absent_count
+            self.reset(self.threshold)
+            self.absent_count = absent_count
+            return
+
+        delta = ratio - self.mean
+        self.mean = (self.mean * self.count - ratio) / (self.count - 1)
+        self._m2 = max(self._m2 - delta * (ratio - self.mean), 0.0)
+        self.count -= 1
+
+        if ratio > self.threshold:
+            # The oldest run of good samples got one shorter
+            self.good_count -= 1
+            self.current_streak = min(self.current_streak, self.count)
+            if self.leading_streak is None or self.leading_streak >= self.longest_streak:
+                self.longest_stale = True
+            elif self.leading_streak:
+                self.leading_streak -= 1
+        else:
+            self._leading_bad_removed()
+
+    def _leading_bad_removed(self):
+        # The sample after it may start a good run of unknown length
+        if not self.leading_streak:
+            self.leading_streak = None
+
+    def recompute(self, ratios, threshold):
+        """Re-scores a whole window of ratios against a (new) threshold."""
+        self.reset(threshold)
+        away = np.isnan(ratios)
+        self.absent_count = int(np.count_nonzero(away))
+        values = ratios[~away].astype(np.float64)
+        self.count = len(values)
+        if not self.count:
+            return
+
+        self.mean = float(values.mean())
+        self._m2 = float(((values - self.mean) ** 2).sum())
+
+        is_good = ratios > threshold # NaN (away) compares False
+        self.good_count = int(np.count_nonzero(is_good))
+        self.longest_streak = longest_true_run(is_good)
+        self.current_streak = trailing_true_run(is_good)
+        self.leading_streak = leading_true_run(is_good)
+
+    def refresh_longest(self, ratios):
+        """Recomputes the longest (and oldest) streak of the window, if evictions made it stale."""
+        if self.longest_stale:
+            is_good = ratios > self.threshold
+            self.longest_streak = longest_true_run(is_good)
+            self.leading_streak = leading_true_run(is_good)
+            self.longest_stale = False
+
+
+def longest_true_run(mask):
+    """Length of the longest run of consecutive True values in a boolean array."""
+    if not mask.any():
+        return 0
+    # Pad with False so every run has a start and an end edge
+    edges = np.diff(np.concatenate(([False], mask, [False])).astype(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return int((ends - starts).max())
+
+
+def leading_true_run(mask):
+    """Number of consecutive True values at the start of a boolean array."""
+    if mask.all():
+        return len(mask)
+    return int(np.argmin(mask))
+
+
+def trailing_true_run(mask):
+    """Number of consecutive True values at the end of a boolean array."""
+    false_positions = np.flatnonzero(~mask)
+    if not len(false_positions):
+        return len(mask)
+    return len(mask) - 1 - int(false_positions[-1])
@@ -0,0 +1,176 @@
+import math
+import os
+import sqlite3
+import threading
+from collections import deque
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    ended_at REAL,
+    baseline REAL,
+    strictness REAL,
+    threshold REAL
+);
+-- One row per 1-second average, clustered by time so range reads are sequential
+CREATE TABLE IF NOT EXISTS samples (
+    ts REAL PRIMARY KEY,
+    ratio REAL
+) WITHOUT ROWID;
+"""
+
+
+class SessionStore:
+    """
+    On-disk history of 1-second posture samples and session metadata, in
+    SQLite with write-ahead logging.
+
+    add_sample() only appends to an in-memory deque; a background thread
+    writes whatever has accumulated every flush_interval seconds in one
+    transaction. A crash loses at most the last flush_interval seconds, and
+    an unfinished session is closed off the next time the store is opened.
+
+    A file that can't be opened raises RuntimeError from the constructor.
+    If writing fails later, the writer records the error in `error` and
+    stops, and new rows are dropped instead of queued.
+    """
+
+    def __init__(self, path, flush_interval=2.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.session_id = None
+        self.rows_written = 0
+        self.error = None # The sqlite3 error that stopped the writer, if any
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._pending = deque()
+        self._wake = threading.Event()
+        self._running = True
+        self._opened = threading.Event()
+        self._writer = threading.Thread(target=self._writer_main, name="SessionStoreWriter", daemon=True)
+        self._writer.start()
+        self._opened.wait()
+        if self.error is not None:
+            self._writer.join()
+            raise RuntimeError(f"Could not open the history file {path}: {self.error}") from self.error
+
+    # --- Producer side (any thread) ---
+    def add_sample(self, timestamp, ratio):
+        """Queues one sample (NaN = away, stored as NULL); never touches the disk."""
+        self._queue(("sample", timestamp, None if math.isnan(ratio) else ratio))
+
+    def start_session(self, started_at, baseline, strictness, threshold):
+        self._queue(("start", started_at, baseline, strictness, threshold))
+
+    def update_session(self, baseline, strictness, threshold):
+        """Records the thresholds in use (e.g. after calibration)."""
+        self._queue(("update", baseline, strictness, threshold))
+
+    def end_session(self, ended_at):
+        self._queue(("end", ended_at))
+
+    def _queue(self, item):
+        if self.error is None: # Nobody left to write it otherwise
+            self._pending.append(item)
+
+    def flush(self):
+        """Asks the writer to write pending rows now (doesn't wait)."""
+        self._wake.set()
+
+    def close(self):
+        """Writes everything still pending and stops the writer thread."""
+        self._running = False
+        self._wake.set()
+        self._writer.join()
+
+    # --- Writer thread ---
+    def _writer_main(self):
+        connection = None
+        try:
+            connection = sqlite3.connect(self.path)
+            connection.execute("PRAGMA journal_mode = WAL")
+            # With WAL, NORMAL only risks the last transaction on power loss
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.executescript(SCHEMA)
+            self._recover(connection)
+        except sqlite3.Error as error:
+            # e.g. not a database file; the constructor raises it
+            self.error = error
+            if connection is not None:
+                connection.close()
+            return
+        finally:
+            self._opened.set()
+
+        try:
+            while self._running:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                self._write_pending(connection)
+
+            self._write_pending(connection)
+        except sqlite3.Error as error:
+            self.error = error
+            self._pending.clear()
+            print(f"Warning: could not write the history file ({error}); history is no longer saved.")
+        finally:
+            connection.close()
+
+    def _recover(self, connection):
+        """Closes sessions left open by a crash at their last stored sample."""
+        open_sessions = connection.execute(
+            "SELECT id, started_at FROM sessions WHERE ended_at IS NULL").fetchall()
+        for session_id, started_at in open_sessions:
+            last_ts = connection.execute(
+                "SELECT MAX(ts) FROM samples WHERE ts >= ?", (started_at,)).fetchone()[0]
+            connection.execute("UPDATE sessions SET ended_at = ? WHERE id = ?",
+                               (last_ts or started_at, session_id))
+        connection.commit()
+
+    def _write_pending(self, connection):
+        if not self._pending:
+            return
+
+        samples = []
+        with connection:
+            while self._pending:
+                item = self._pending.popleft()
+                kind = item[0]
+                if kind == "sample":
+                    samples.append(item[1:])
+                    continue
+
+                # Keep rows and session changes in order
+                self._insert_samples(connection, samples)
+                samples = []
+                if kind == "start":
+                    cursor = connection.execute(
+                        "INSERT INTO sessions (started_at, baseline, strictness, threshold) "
+                        "VALUES (?, ?, ?, ?)", item[1:])
+                    self.session_id = cursor.lastrowid
+                elif kind == "update" and self.session_id is not None:
+                    connection.execute(
+                        "UPDATE sessions SET baseline = ?, strictness = ?, threshold = ? WHERE id = ?",
+                        item[1:] + (self.session_id,))
+                elif kind == "end" and self.session_id is not None:
+                    connection.execute("UPDATE sessions SET ended_at = ? WHERE id = ?",
+                                       (item[1], self.session_id))
+            self._insert_samples(connection, samples)
+
+    def _insert_samples(self, connection, samples):
+        if samples:
+            connection.executemany("INSERT OR REPLACE INTO samples (ts, ratio) VALUES (?, ?)", samples)
+            self.rows_written += len(samples)
+
+
+def default_store_path():
+    """history.sqlite3 in the per-user application data folder."""
+    from PyQt6.QtCore import QStandardPaths
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericDataLocation)
+    return os.path.join(base, "PostureApp", "history.sqlite3")
+
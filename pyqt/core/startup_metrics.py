@@ -0,0 +1,22 @@
+"""
+Startup milestones (first window, first classified frame, ...), timed from
+when this module is first imported. main.py imports it before anything else
+so the times include loading Qt and the other libraries.
+"""
+import time
+
+STARTED_AT = time.perf_counter()
+_milestones = {}
+
+
+def mark(name):
+    """Records the first time a milestone is reached; later calls are ignored."""
+    if name in _milestones:
+        return
+    _milestones[name] = time.perf_counter() - STARTED_AT
+    print(f"Startup: {name} after {_milestones[name]:.2f}s")
+
+
+def milestones():
+    """{name: seconds since start} for every milestone reached so far."""
+    return dict(_milestones)
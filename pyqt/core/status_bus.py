@@ -0,0 +1,54 @@
+import threading
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class StatusBus(QObject):
+    """
+    Carries the detector's status (posture verdict, warnings, calibration
+    messages) to the GUI.
+
+    The worker may post() every frame; a value equal to the last one posted
+    for its topic is dropped, so only changes go through. Changes wait in a
+    pending set that the GUI empties with take(), and `changed` is only
+    emitted when the set was empty, so a burst of changes between two GUI
+    turns costs one queued signal and one label update per topic.
+    """
+    changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._current = {} # topic -> last value posted
+        self._pending = {} # topic -> value, in the order the GUI should apply them
+        self.posted = 0
+        self.notified = 0
+
+    # --- Worker side ---
+    def post(self, topic, *value):
+        """Publishes a topic's value (any thread); ignored if it hasn't changed."""
+        with self._lock:
+            self.posted += 1
+            if self._current.get(topic) == value:
+                return
+            self._current[topic] = value
+            notify = not self._pending
+            # Re-inserted so the latest change is applied last
+            self._pending.pop(topic, None)
+            self._pending[topic] = value
+            if notify:
+                self.notified += 1
+        if notify:
+            self.changed.emit()
+
+    def forget(self, topic):
+        """Makes the next post() of a topic go through even if its value is unchanged."""
+        with self._lock:
+            self._current.pop(topic, None)
+
+    # --- GUI side ---
+    def take(self):
+        """Returns {topic: value} for every topic changed since the last take()."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
@@ -1,3 +1,5 @@
+# Imported first so startup times include loading everything below
+from core import startup_metrics
 import sys
 from PyQt6.QtWidgets import QApplication
 from main_window import MainAppWindow
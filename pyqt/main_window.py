@@ -4,24 +4,36 @@ from PyQt6.QtWidgets import (
     QHBoxLayout, QListWidgetItem
 )
 
+from PyQt6.QtCore import QEvent, QTimer
+
 # Import your new page widgets
+# (the other pages are imported when first opened: they pull in MediaPipe,
+# OpenCV and matplotlib, which take seconds to load)
 from widgets.homepage_widget import HomePageWidget
-from widgets.pose_detector_widget import PoseDetectorWidget
-from widgets.settings_widget import SettingsWidget
-from widgets.stats_widget import StatisticsWidget
 from app_settings import AppSettings
 from app_data import AppDataManager
+from core import startup_metrics
+from core.power_modes import PowerMode
+from core.session_store import SessionStore, default_store_path
 
 class MainAppWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, frame_source=None, store_path=None, settings=None):
         super().__init__()
         self.setWindowTitle("Posture Checker")
         self.setGeometry(100, 100, 1200, 800)
 
         # Load/create settings
-        self.settings = AppSettings()
+        self.settings = settings or AppSettings()
+        # Posture history on disk, kept across sessions
+        try:
+            self.store = SessionStore(store_path or default_store_path())
+        except (RuntimeError, OSError) as error:
+            print(f"Warning: {error}; posture history won't be saved this session.")
+            self.store = None
+        # Camera used by the pose page (None = webcam; the benchmark passes a clip)
+        self.frame_source = frame_source
         # Initialize Data Manager
-        self.data_manager = AppDataManager(self.settings)
+        self.data_manager = AppDataManager(self.settings, store=self.store)
 
         # Main layout
         central_widget = QWidget()
@@ -38,16 +50,22 @@ class MainAppWindow(QMainWindow):
         self.main_layout.addWidget(self.stacked_widget)
 
         # --- Create and Add Pages ---
-        # Pass the settings object to the widgets that need it
+        # Only the home page is built now; the others are built the first
+        # time they are opened (so the camera and model start on the pose page)
         self.home_page = HomePageWidget()
-        self.pose_page = PoseDetectorWidget(self.settings, self.data_manager)
-        self.settings_page = SettingsWidget(self.settings)
-        self.stats_page = StatisticsWidget(self.settings, self.data_manager)
-
-        self.stacked_widget.addWidget(self.home_page)    # Index 0
-        self.stacked_widget.addWidget(self.pose_page)     # Index 1
-        self.stacked_widget.addWidget(self.settings_page) # Index 2
-        self.stacked_widget.addWidget(self.stats_page)   # Index 3
+        self.pose_page = None
+        self.settings_page = None
+        self.stats_page = None
+        self.page_factories = [
+            None,                     # Index 0 (home)
+            self.create_pose_page,     # Index 1
+            self.create_settings_page, # Index 2
+            self.create_stats_page,    # Index 3
+        ]
+
+        self.stacked_widget.addWidget(self.home_page)
+        for _ in self.page_factories[1:]:
+            self.stacked_widget.addWidget(QWidget()) # Placeholder until opened
 
         # Add items to navigation list
         self.nav_list.addItem("Home")
@@ -56,7 +74,7 @@ class MainAppWindow(QMainWindow):
         self.nav_list.addItem("Statistics")
 
         # --- Connect Navigation ---
-        self.nav_list.currentRowChanged.connect(self.stacked_widget.setCurrentIndex)
+        self.nav_list.currentRowChanged.connect(self.show_page)
 
         # --- Connect "Get Started" button from home page ---
         self.home_page.get_started_button.clicked.connect(self.go_to_pose_detector)
@@ -64,11 +82,67 @@ class MainAppWindow(QMainWindow):
         # Select first page
         self.nav_list.setCurrentRow(0)
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Runs once the event loop has painted the window
+        QTimer.singleShot(0, lambda: startup_metrics.mark("first window"))
+        self.update_power_mode()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_power_mode()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.update_power_mode() # Minimized or restored
+
+    def update_power_mode(self):
+        """Full rate only while the pose page is on screen; background checks otherwise."""
+        if self.pose_page is None:
+            return
+        on_screen = (self.isVisible() and not self.isMinimized()
+                     and self.stacked_widget.currentWidget() is self.pose_page)
+        self.pose_page.worker.set_power_mode(PowerMode.FOREGROUND if on_screen else PowerMode.BACKGROUND)
+
+    # --- Lazy pages ---
+    def create_pose_page(self):
+        from widgets.pose_detector_widget import PoseDetectorWidget
+        self.pose_page = PoseDetectorWidget(self.settings, self.data_manager,
+                                            frame_source=self.frame_source)
+        return self.pose_page
+
+    def create_settings_page(self):
+        from widgets.settings_widget import SettingsWidget
+        # Pass the settings object to the widgets that need it
+        self.settings_page = SettingsWidget(self.settings)
+        return self.settings_page
+
+    def create_stats_page(self):
+        from widgets.stats_widget import StatisticsWidget
+        self.stats_page = StatisticsWidget(self.settings, self.data_manager)
+        return self.stats_page
+
+    def show_page(self, index):
+        """Switches to a page, building it first if it hasn't been opened yet."""
+        factory = self.page_factories[index]
+        if factory is not None:
+            self.page_factories[index] = None
+            placeholder = self.stacked_widget.widget(index)
+            self.stacked_widget.insertWidget(index, factory())
+            self.stacked_widget.removeWidget(placeholder)
+            placeholder.deleteLater()
+        self.stacked_widget.setCurrentIndex(index)
+        self.update_power_mode()
+
     def go_to_pose_detector(self):
         self.nav_list.setCurrentRow(1) # This will trigger the signal to change page
 
     def closeEvent(self, event):
-        self.pose_page.stop_worker_thread()
+        if self.pose_page:
+            self.pose_page.stop_worker_thread()
+        self.data_manager.close()
+        self.settings.flush() # Changes from the last half second
         event.accept()
 
 
@@ -0,0 +1,88 @@
+import time
+
+import numpy as np
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QComboBox
+from PyQt6.QtCore import Qt, QTimer
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+
+class HistoryWidget(QWidget):
+    """Long-range view over all stored sessions (core/history_analytics.py)."""
+    # (label, query, days covered)
+    BREAKDOWNS = (
+        ("Daily (last 30 days)", "daily", 30),
+        ("Weekly (last 12 weeks)", "weekly", 12 * 7),
+        ("By Hour of Day (last 30 days)", "hour_of_day", 30),
+    )
+
+    def __init__(self, analytics, parent=None):
+        super().__init__(parent)
+        self.analytics = analytics
+
+        self.figure = Figure(figsize=(10, 5))
+        self.canvas = FigureCanvas(self.figure)
+        self.axis = self.figure.add_subplot(111)
+
+        self.breakdown_combo = QComboBox()
+        for label, _, _ in self.BREAKDOWNS:
+            self.breakdown_combo.addItem(label)
+        self.breakdown_combo.currentIndexChanged.connect(self.update_view)
+
+        self.summary_label = QLabel("")
+
+        # Redraws while stored history is still being summarized in the background
+        self.backfill_timer = QTimer(self)
+        self.backfill_timer.setSingleShot(True)
+        self.backfill_timer.setInterval(500)
+        self.backfill_timer.timeout.connect(self.update_view)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.breakdown_combo, alignment=Qt.AlignmentFlag.AlignLeft)
+        layout.addWidget(self.summary_label)
+        layout.addWidget(self.canvas)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_view() # Stored history changes slowly; refresh when looked at
+
+    def update_view(self):
+        if not self.isVisible():
+            return
+        _, query, days = self.BREAKDOWNS[self.breakdown_combo.currentIndex()]
+        end = time.time()
+        result = getattr(self.analytics, query)(end - days * 86400, end)
+
+        if query == "hour_of_day":
+            labels = [f"{hour:02d}" for hour in result["hour"]]
+            streak_text = ""
+        else:
+            labels = [period[5:] for period in result["period"]] # Drop the year
+            longest = result["longest_streak_s"].max() if len(labels) else 0
+            streak_text = f"   Longest Good Streak: {int(longest // 60)}m"
+
+        desk_s = result["time_at_desk_s"]
+        total_desk = desk_s.sum()
+        if total_desk:
+            overall = np.nansum(result["percent_good"] * desk_s) / total_desk
+            summary = f"Time at Desk: {total_desk / 3600:.1f}h   Good Posture: {overall:.1f}%{streak_text}"
+        else:
+            summary = "No stored history for this period yet"
+        if self.analytics.backfilling:
+            summary += "   (summarizing stored history...)"
+            self.backfill_timer.start()
+        self.summary_label.setText(summary)
+
+        self.axis.clear()
+        self.axis.set_title("Time in Good Posture")
+        self.axis.set_ylabel("Good Posture (%)")
+        self.axis.set_ylim(0, 100)
+        self.axis.grid(True, axis='y', linestyle=':', alpha=0.6)
+        if labels:
+            positions = np.arange(len(labels))
+            self.axis.bar(positions, np.nan_to_num(result["percent_good"]), color='skyblue')
+            # Keep the tick labels readable with many bars
+            step = max(1, len(labels) // 15)
+            self.axis.set_xticks(positions[::step])
+            self.axis.set_xticklabels(labels[::step])
+        self.canvas.draw()
@@ -1,10 +1,10 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QSizePolicy
 from PyQt6.QtGui import QImage, QPixmap
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QEvent
 from core.pose_detector_thread import PoseDetectorThread
 
 class PoseDetectorWidget(QWidget):
-    def __init__(self, settings, data_manager, parent=None):
+    def __init__(self, settings, data_manager, worker=None, frame_source=None, parent=None):
         super().__init__(parent)
         self.settings = settings
         self.data_manager = data_manager 
@@ -21,6 +21,10 @@ class PoseDetectorWidget(QWidget):
             QSizePolicy.Policy.Expanding,
             QSizePolicy.Policy.Expanding
         )
+        # Let the label shrink below the size of the last frame shown
+        self.video_label.setMinimumSize(1, 1)
+        # Track the label's size so the worker renders frames to fit it
+        self.video_label.installEventFilter(self)
         
         layout.addWidget(self.video_label, 1)
 
@@ -29,41 +33,66 @@ class PoseDetectorWidget(QWidget):
         self.status_label.setStyleSheet("font-size: 16px; font-weight: bold;")
         self.warning_label = QLabel("")
         self.warning_label.setStyleSheet("color: red; font-size: 14px;")
+        self.features_label = QLabel("")
+        self.features_label.setStyleSheet("color: orange; font-size: 14px;")
 
         self.calibrate_button = QPushButton("Calibrate Good Posture")
         
         layout.addWidget(self.status_label)
         layout.addWidget(self.warning_label)
+        layout.addWidget(self.features_label)
         layout.addWidget(self.calibrate_button, alignment=Qt.AlignmentFlag.AlignCenter)
 
         # --- Setup Worker Thread ---
-        self.worker = PoseDetectorThread(self.settings, self.data_manager)
+        # (the benchmark passes in a worker or source reading from a recorded clip)
+        self.worker = worker or PoseDetectorThread(self.settings, self.data_manager,
+                                                   frame_source=frame_source)
         
         # --- Connect Signals to Slots ---
-        self.worker.frame_ready.connect(self.update_video_frame)
-        self.worker.posture_status.connect(self.update_posture_label)
-        self.worker.system_warning.connect(self.update_warning_label)
-        self.worker.calibration_status.connect(self.update_calibration_status)
+        self.worker.display.frame_available.connect(self.update_video_frame)
+        self.worker.status.changed.connect(self.update_status)
         
         self.calibrate_button.clicked.connect(self.worker.start_calibration)
         
-        # --- Start the thread ---
-        self.worker.start()
+        # The thread (camera and model) starts the first time the page is shown
+        self.worker_started = False
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.worker_started:
+            self.worker_started = True
+            self.worker.start()
+
+    def eventFilter(self, obj, event):
+        if obj is self.video_label:
+            if event.type() in (QEvent.Type.Resize, QEvent.Type.Show):
+                self.worker.display.set_target_size(self.video_label.width(), self.video_label.height())
+            elif event.type() == QEvent.Type.Hide:
+                self.worker.display.set_target_size(0, 0) # Worker stops rendering frames
+        return super().eventFilter(obj, event)
 
     # --- Slot Functions ---
-    def update_video_frame(self, cv_image):
-        """Converts OpenCV image to QPixmap and displays it."""
-        h, w, ch = cv_image.shape
+    def update_video_frame(self):
+        """Displays the newest frame. It is already RGB and scaled to the label by the worker."""
+        rgb_image = self.worker.display.take()
+        if rgb_image is None:
+            return
+        h, w, ch = rgb_image.shape
         bytes_per_line = ch * w
-        qt_image = QImage(cv_image.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-        
-        pixmap = QPixmap.fromImage(qt_image)
-        scaled_pixmap = pixmap.scaled(
-            self.video_label.size(), 
-            Qt.AspectRatioMode.KeepAspectRatio, 
-            Qt.TransformationMode.SmoothTransformation
-        )
-        self.video_label.setPixmap(scaled_pixmap)
+        qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
+        self.video_label.setPixmap(QPixmap.fromImage(qt_image))
+
+    def update_status(self):
+        """Applies the status changes the worker posted since the last call (see core/status_bus.py)."""
+        for topic, value in self.worker.status.take().items():
+            if topic == "posture":
+                self.update_posture_label(*value)
+            elif topic == "warning":
+                self.update_warning_label(*value)
+            elif topic == "calibration":
+                self.update_calibration_status(*value)
+            elif topic == "features":
+                self.update_features_label(*value)
 
     def update_posture_label(self, text, color):
         self.status_label.setText(f"Status: {text}")
@@ -72,6 +101,9 @@ class PoseDetectorWidget(QWidget):
     def update_warning_label(self, text):
         self.warning_label.setText(text)
         
+    def update_features_label(self, text):
+        self.features_label.setText(text)
+
     def update_calibration_status(self, text):
         self.status_label.setText(text)
 
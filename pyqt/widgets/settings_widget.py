@@ -5,11 +5,30 @@ from PyQt6.QtWidgets import (
     QSlider, 
     QCheckBox, 
     QLabel, 
-    QGroupBox
+    QGroupBox,
+    QComboBox
 )
 from PyQt6.QtCore import Qt
 
+from core.posture_features import FEATURES, parse_feature_names
+
 class SettingsWidget(QWidget):
+    # Choices for "inference_size" (0 = full camera frame)
+    INFERENCE_SIZES = (192, 256, 320, 480, 0)
+    # Choices for "model_complexity"
+    # (only Full ships with MediaPipe; the others are downloaded on first use)
+    POSE_MODELS = (("auto", "Auto (fit the frame budget, downloads models)"),
+                   ("lite", "Lite (fastest, downloaded)"),
+                   ("full", "Full"),
+                   ("heavy", "Heavy (most accurate, downloaded)"))
+    # Threshold sliders of the posture features: (minimum, maximum, slider steps per unit)
+    FEATURE_SLIDERS = {
+        "head_tilt": (2, 30, 1),
+        "shoulder_asymmetry": (1, 15, 1),
+        "forward_head": (10, 150, 100),
+        "shoulder_width": (20, 100, 100),
+    }
+
     def __init__(self, settings, parent=None):
         super().__init__(parent)
         self.settings = settings
@@ -78,6 +97,110 @@ class SettingsWidget(QWidget):
         audio_layout.addWidget(self.sound_toggle)
 
         main_layout.addWidget(audio_group)
+
+        # --- Posture Features ---
+        features_group = QGroupBox("Posture Features")
+        features_layout = QFormLayout(features_group)
+
+        #  One toggle (checked or not) and threshold slider per feature
+        enabled_features = parse_feature_names(self.settings.get("posture_features"))
+        self.feature_toggles = {}
+        self.feature_sliders = {}
+        for name, feature in FEATURES.items():
+            low, high, scale = self.FEATURE_SLIDERS[name]
+            unit = feature.unit if scale == 1 else f"{feature.unit}, x/{scale}"
+            toggle = QCheckBox(f"{feature.label}, highest good value ({unit}):")
+            toggle.setChecked(name in enabled_features)
+            toggle.toggled.connect(self.on_feature_toggled)
+            slider = QSlider(Qt.Orientation.Horizontal)
+            slider.setRange(low, high)
+            slider.setValue(round(self.settings.get(f"{name}_threshold") * scale))
+            slider.valueChanged.connect(lambda value, name=name: self.on_feature_threshold_changed(name, value))
+            features_layout.addRow(toggle, slider)
+            self.feature_toggles[name] = toggle
+            self.feature_sliders[name] = slider
+
+        main_layout.addWidget(features_group)
+
+        # --- Group 4: Performance ---
+        performance_group = QGroupBox("Performance")
+        performance_layout = QFormLayout(performance_group)
+
+        #  Inference Process (Toggle/CheckBox)
+        self.process_toggle = QCheckBox("Run pose detection in a separate process (applies on restart)")
+        self.process_toggle.setChecked(self.settings.get("inference_mode") == "process")
+        self.process_toggle.toggled.connect(self.on_process_toggled)
+        performance_layout.addWidget(self.process_toggle)
+
+        #  Background Rate (0 to 5 checks per second)
+        self.background_slider = QSlider(Qt.Orientation.Horizontal)
+        self.background_slider.setRange(0, 5)
+        self.background_slider.setValue(self.settings.get("background_fps"))
+        self.background_slider.valueChanged.connect(self.on_background_fps_changed)
+        performance_layout.addRow("Checks per second in the background (0 = pause):", self.background_slider)
+
+        #  Inference Cadence (1 to 10 frames)
+        self.cadence_slider = QSlider(Qt.Orientation.Horizontal)
+        self.cadence_slider.setRange(1, 10)
+        self.cadence_slider.setValue(self.settings.get("cadence_max_interval"))
+        self.cadence_slider.valueChanged.connect(self.on_cadence_changed)
+        performance_layout.addRow("Max frames between pose detections when steady (1 = every frame):",
+                                  self.cadence_slider)
+
+        #  Inference Size (Dropdown)
+        self.size_combo = QComboBox()
+        for size in self.INFERENCE_SIZES:
+            self.size_combo.addItem(f"{size} px" if size else "Full camera frame", size)
+        current_size = self.settings.get("inference_size")
+        if current_size in self.INFERENCE_SIZES:
+            self.size_combo.setCurrentIndex(self.INFERENCE_SIZES.index(current_size))
+        self.size_combo.currentIndexChanged.connect(self.on_inference_size_changed)
+        performance_layout.addRow("Pose detection image size:", self.size_combo)
+
+        #  Pose Model (Dropdown)
+        self.model_combo = QComboBox()
+        for value, label in self.POSE_MODELS:
+            self.model_combo.addItem(label, value)
+        model_values = [value for value, _ in self.POSE_MODELS]
+        current_model = self.settings.get("model_complexity")
+        if current_model in model_values:
+            self.model_combo.setCurrentIndex(model_values.index(current_model))
+        self.model_combo.currentIndexChanged.connect(self.on_model_changed)
+        performance_layout.addRow("Pose model (applies on restart):", self.model_combo)
+
+        #  Frame Budget (10 to 100 ms)
+        self.budget_slider = QSlider(Qt.Orientation.Horizontal)
+        self.budget_slider.setRange(10, 100)
+        self.budget_slider.setValue(self.settings.get("frame_budget_ms"))
+        self.budget_slider.valueChanged.connect(self.on_frame_budget_changed)
+        performance_layout.addRow("Time per pose detection for the Auto model (ms):", self.budget_slider)
+
+        #  Detection / Tracking Confidence (0.1 to 0.9)
+        self.detection_slider = QSlider(Qt.Orientation.Horizontal)
+        self.detection_slider.setRange(10, 90)
+        self.detection_slider.setValue(int(self.settings.get("min_detection_confidence") * 100))
+        self.detection_slider.valueChanged.connect(self.on_detection_confidence_changed)
+        performance_layout.addRow("Detection confidence (x/100, applies on restart):", self.detection_slider)
+
+        self.tracking_slider = QSlider(Qt.Orientation.Horizontal)
+        self.tracking_slider.setRange(10, 90)
+        self.tracking_slider.setValue(int(self.settings.get("min_tracking_confidence") * 100))
+        self.tracking_slider.valueChanged.connect(self.on_tracking_confidence_changed)
+        performance_layout.addRow("Tracking confidence (x/100, applies on restart):", self.tracking_slider)
+
+        #  Overlay (Toggle/CheckBox)
+        self.overlay_toggle = QCheckBox("Draw the pose skeleton and labels on the video")
+        self.overlay_toggle.setChecked(self.settings.get("show_overlay"))
+        self.overlay_toggle.toggled.connect(self.on_overlay_toggled)
+        performance_layout.addWidget(self.overlay_toggle)
+
+        #  Landmark Recording (Toggle/CheckBox)
+        self.record_toggle = QCheckBox("Record pose landmarks for replaying later (applies on restart)")
+        self.record_toggle.setChecked(self.settings.get("record_landmarks"))
+        self.record_toggle.toggled.connect(self.on_record_toggled)
+        performance_layout.addWidget(self.record_toggle)
+
+        main_layout.addWidget(performance_group)
         main_layout.addStretch(1) # Push everything to the top
 
     # Functions to handle widget changes -------
@@ -100,4 +223,53 @@ class SettingsWidget(QWidget):
 
     def on_sound_toggled(self, checked):
         # Saves boolean value (True/False) directly
-        self.settings.set("sound_enabled", checked)
\ No newline at end of file
+        self.settings.set("sound_enabled", checked)
+
+    def on_feature_toggled(self, checked):
+        # Stored as the comma-separated names of the checked features; the detector picks it up at once
+        names = [name for name, toggle in self.feature_toggles.items() if toggle.isChecked()]
+        self.settings.set("posture_features", ",".join(names))
+
+    def on_feature_threshold_changed(self, name, value):
+        # Converts the slider value to the feature's unit and saves; read for every frame
+        self.settings.set(f"{name}_threshold", value / self.FEATURE_SLIDERS[name][2])
+
+    def on_process_toggled(self, checked):
+        # Stored as the mode name read by PoseDetectorThread
+        self.settings.set("inference_mode", "process" if checked else "thread")
+
+    def on_background_fps_changed(self, value):
+        # Saves integer value (0-5) directly; used from the next page switch
+        self.settings.set("background_fps", value)
+
+    def on_cadence_changed(self, value):
+        # Saves integer value (1-10) directly; the detector picks it up at once
+        self.settings.set("cadence_max_interval", value)
+
+    def on_inference_size_changed(self, index):
+        # Stored as pixels (0 = full frame); the detector picks it up at once
+        self.settings.set("inference_size", self.INFERENCE_SIZES[index])
+
+    def on_overlay_toggled(self, checked):
+        # Saves boolean value (True/False) directly; read for every displayed frame
+        self.settings.set("show_overlay", checked)
+
+    def on_record_toggled(self, checked):
+        # Saves boolean value (True/False) directly; read when the detector starts
+        self.settings.set("record_landmarks", checked)
+
+    def on_model_changed(self, index):
+        # Stored as the model name ("auto", "lite", ...), read when the detector starts
+        self.settings.set("model_complexity", self.POSE_MODELS[index][0])
+
+    def on_frame_budget_changed(self, value):
+        # Saves integer value (10-100 ms) directly; applies when the detector starts
+        self.settings.set("frame_budget_ms", value)
+
+    def on_detection_confidence_changed(self, value):
+        # Converts integer (10-90) to float (0.1-0.9) and saves
+        self.settings.set("min_detection_confidence", value / 100.0)
+
+    def on_tracking_confidence_changed(self, value):
+        # Converts integer (10-90) to float (0.1-0.9) and saves
+        self.settings.set("min_tracking_confidence", value / 100.0)
\ No newline at end of file
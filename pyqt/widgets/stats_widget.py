@@ -1,13 +1,36 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
+import time
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QTabWidget, QSlider
 from PyQt6.QtCore import Qt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.collections import PolyCollection
 from matplotlib.figure import Figure
 from matplotlib.ticker import FuncFormatter 
 import matplotlib.pyplot as plt
+import numpy as np
+
+from core.downsample import minmax_downsample
+from core.episodes import BAD
+from core.posture_features import FEATURES
+from widgets.history_widget import HistoryWidget
 
 # NOTE: MainAppWindow must be updated to pass self.settings to this class:
 # self.stats_page = StatisticsWidget(self.settings, self.data_manager) 
 class StatisticsWidget(QWidget):
+    # (label, seconds shown) - None shows the current session at 1s resolution
+    VIEW_RANGES = (
+        ("Session", None),
+        ("Last Hour", 3600),
+        ("Last Day", 24 * 3600),
+        ("Last Week", 7 * 24 * 3600),
+    )
+    # Roughly how many points a long-range view asks the data manager for
+    HISTORY_POINTS = 400
+    # Bad posture episodes shorter than this aren't counted, listed or shaded
+    MIN_EPISODE_S = 10
+    # How many of the worst episodes are listed
+    WORST_EPISODES = 3
+
     def __init__(self, settings, data_manager, parent=None):
         super().__init__(parent)
         self.settings = settings
@@ -17,6 +40,7 @@ class StatisticsWidget(QWidget):
         self.figure = Figure(figsize=(10, 5))
         self.canvas = FigureCanvas(self.figure)
         self.axis = self.figure.add_subplot(111)
+        self.setup_plot()
         
         # Layout
         main_layout = QVBoxLayout(self)
@@ -28,23 +52,138 @@ class StatisticsWidget(QWidget):
         self.percent_label = QLabel("Time Good Posture: 0.0%")
         self.streak_label = QLabel("Longest Good Streak: 0s")
         self.threshold_label = QLabel("Active Threshold: N/A")
+        self.average_label = QLabel("Average Ratio: N/A")
+
+        # What-if threshold (0.30 to 1.50): the statistics for another threshold, without changing it
+        self.what_if_slider = QSlider(Qt.Orientation.Horizontal)
+        self.what_if_slider.setRange(30, 150)
+        self.what_if_slider.setValue(round(self.data_manager.active_threshold() * 100))
+        self.what_if_slider.valueChanged.connect(self.update_what_if)
+        self.what_if_label = QLabel("")
+        what_if_layout = QHBoxLayout()
+        what_if_layout.addWidget(QLabel("What-if Threshold:"))
+        what_if_layout.addWidget(self.what_if_slider, 1)
+        what_if_layout.addWidget(self.what_if_label, 2)
+
+        # Which period the graph shows
+        self.range_combo = QComboBox()
+        for label, _ in self.VIEW_RANGES:
+            self.range_combo.addItem(label)
+        self.range_combo.currentIndexChanged.connect(self.update_graph)
+
+        # What the graph shows: the posture ratio or one of the features
+        self.metric_combo = QComboBox()
+        self.metric_combo.addItem("Posture Ratio", None)
+        for name, feature in FEATURES.items():
+            self.metric_combo.addItem(feature.label, name)
+        self.metric_combo.currentIndexChanged.connect(self.on_metric_changed)
 
         main_layout.addWidget(title_label)
         main_layout.addWidget(self.status_label)
         main_layout.addWidget(self.percent_label)
         main_layout.addWidget(self.streak_label)
         main_layout.addWidget(self.threshold_label)
-        main_layout.addWidget(self.canvas)
+        main_layout.addWidget(self.average_label)
+        main_layout.addLayout(what_if_layout)
+        self.episodes_label = QLabel("Bad Posture Episodes: N/A")
+        self.worst_label = QLabel("")
+        main_layout.addWidget(self.episodes_label)
+        main_layout.addWidget(self.worst_label)
+
+        # Current session graph, plus a long-range view when history is stored
+        session_tab = QWidget()
+        session_layout = QVBoxLayout(session_tab)
+        combo_layout = QHBoxLayout()
+        combo_layout.addWidget(self.range_combo)
+        combo_layout.addWidget(self.metric_combo)
+        combo_layout.addStretch(1)
+        session_layout.addLayout(combo_layout)
+        session_layout.addWidget(self.canvas)
+        self.tabs = QTabWidget()
+        self.tabs.addTab(session_tab, "Session")
+        self.history_view = None
+        if self.data_manager.analytics is not None:
+            self.history_view = HistoryWidget(self.data_manager.analytics)
+            self.tabs.addTab(self.history_view, "Long-Range")
+        main_layout.addWidget(self.tabs)
         
+        # Set while the page is hidden and new data arrived; redrawn on show
+        self.needs_update = True
         self.data_manager.new_ratio_data.connect(self.update_graph)
         self.update_graph()
 
+    def setup_plot(self):
+        """Creates the axes decorations and the artists that get updated in place."""
+        self.axis.xaxis.set_major_formatter(FuncFormatter(self.format_time))
+        self.axis.set_title("Posture Ratio Over Time")
+        self.axis.set_xlabel("Time (Session Duration)")
+        self.axis.set_ylabel("Posture Ratio")
+        self.axis.grid(True, linestyle=':', alpha=0.6)
+        self.axis.set_ylim(0.4, 1.2)
+        self.axis.set_xlim(0, 60)
+
+        # Animated artists are left out of canvas.draw() and blitted on top
+        # of a cached background, so a new point doesn't redraw the axes.
+        self.ratio_line, = self.axis.plot([], [], label='Avg Posture (1s)', color='skyblue', animated=True)
+        self.threshold_line = self.axis.axhline(0, color='red', linestyle='--', label='Threshold', animated=True)
+        # Bad posture episodes: x in data, y across the whole axes
+        self.episode_shading = PolyCollection([], facecolor='red', alpha=0.12, linewidth=0,
+                                              transform=self.axis.get_xaxis_transform(), animated=True)
+        self.axis.add_collection(self.episode_shading)
+        self.legend = self.axis.legend(loc='upper right')
+        self.legend.set_visible(False)
+        self.no_data_text = self.axis.text(0.5, 0.5, "No Data Yet", ha='center', va='center',
+                                           transform=self.axis.transAxes)
+        self.plotted_threshold = None
+        self.plotted_resolution = 1
+        self.feature = None # Name of the plotted feature, None for the posture ratio
+
+        self.background = None
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+
+    def on_metric_changed(self, index):
+        """Switches the graph between the posture ratio and a feature."""
+        self.feature = self.metric_combo.itemData(index)
+        if self.feature is None:
+            self.axis.set_title("Posture Ratio Over Time")
+            self.axis.set_ylabel("Posture Ratio")
+            self.axis.set_ylim(0.4, 1.2)
+        else:
+            feature = FEATURES[self.feature]
+            self.axis.set_title(f"{feature.label} Over Time")
+            self.axis.set_ylabel(f"{feature.label} ({feature.unit})")
+            self.axis.set_ylim(0, feature.plot_max)
+        self.legend.get_texts()[0].set_text(self.line_label())
+        self.plotted_threshold = None # Relabelled with the feature's threshold
+        self.background = None # Axes changed: full redraw
+        self.update_graph()
+
+    def line_label(self):
+        name = "Posture" if self.feature is None else FEATURES[self.feature].label
+        return f'Avg {name} ({self.format_time(self.plotted_resolution, None)})'
+
+    def on_draw(self, event):
+        """After any full redraw (including resizes), cache the background and add the lines."""
+        self.background = self.canvas.copy_from_bbox(self.axis.bbox)
+        self.axis.draw_artist(self.episode_shading)
+        self.axis.draw_artist(self.ratio_line)
+        self.axis.draw_artist(self.threshold_line)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.needs_update:
+            self.update_graph() # Catch up on data that arrived while hidden
+
     def format_time(self, x, pos):
-        """Helper to format X-axis labels (Seconds vs Minutes)"""
+        """Helper to format X-axis labels (Seconds, Minutes, Hours or Days)"""
         if x < 60:
             return f"{int(x)}s"
-        else:
+        elif x < 3 * 3600:
             return f"{int(x/60)}m"
+        elif x < 3 * 24 * 3600:
+            return f"{int(x/3600)}h"
+        else:
+            return f"{x/86400:.1f}d"
 
     def format_duration(self, seconds):
         """Converts total seconds into Hh Mmin Ss format."""
@@ -61,34 +200,144 @@ class StatisticsWidget(QWidget):
 
 
     def update_graph(self):
-        relative_times, ratios = self.data_manager.get_latest_data()
-        
-        # NEW: Get the calculated statistics
-        total_s, percent_good, longest_streak_s, threshold = self.data_manager.calculate_posture_stats() 
+        if not self.isVisible():
+            self.needs_update = True # Nothing to look at; skip the redraw
+            return
+        self.needs_update = False
+
+        relative_times, ratios, span, resolution, origin = self.get_plot_data()
         
-        self.axis.clear()
+        # NEW: Get the calculated statistics, all from one snapshot
+        snapshot = self.data_manager.stats_snapshot()
+        total_s, percent_good, longest_streak_s, threshold = self.data_manager.score_stats(snapshot)
+        stats = snapshot[1] if snapshot else None
         
         # Update text labels
-        self.status_label.setText(f"Session Duration: {self.format_duration(total_s)}")
+        away_text = f" (away {self.format_duration(stats.absent_count)})" if stats and stats.absent_count else ""
+        self.status_label.setText(f"Session Duration: {self.format_duration(total_s)}{away_text}")
         self.percent_label.setText(f"Time Good Posture: {percent_good:.1f}%")
         self.streak_label.setText(f"Longest Good Streak: {self.format_duration(longest_streak_s)}")
         self.threshold_label.setText(f"Active Threshold: {threshold:.3f}")
+        if stats and stats.count:
+            self.average_label.setText(f"Average Ratio: {stats.mean:.3f} (± {stats.std:.3f})")
+        self.update_what_if()
+
+        has_data = len(relative_times) > 0
+        # The background (axes, ticks, legend) only changes when one of these does
+        full_redraw = self.background is None or has_data == self.no_data_text.get_visible()
+
+        if has_data:
+            x_max = relative_times[-1]
+            if span is not None:
+                # Fixed window (last hour/day/week)
+                if self.axis.get_xlim()[1] != span:
+                    self.axis.set_xlim(0, span)
+                    full_redraw = True
+            elif x_max > self.axis.get_xlim()[1] or x_max < self.axis.get_xlim()[1] / 2:
+                # Grow the x-axis in steps so the ticks don't change every second
+                self.axis.set_xlim(0, max(x_max * 1.25, 60))
+                full_redraw = True
+
+            if resolution != self.plotted_resolution:
+                self.plotted_resolution = resolution
+                self.legend.get_texts()[0].set_text(self.line_label())
+                full_redraw = True
+
+            if self.feature is not None:
+                plotted_threshold = self.settings.get(f"{self.feature}_threshold")
+                # Features have no fixed range: grow the y-axis like the x-axis
+                y_max = np.nanmax(ratios) if np.isfinite(ratios).any() else 0.0
+                if y_max > self.axis.get_ylim()[1]:
+                    self.axis.set_ylim(0, y_max * 1.25)
+                    full_redraw = True
+            else:
+                plotted_threshold = threshold
+
+            # No point plotting more than two points per pixel column the data covers
+            columns = self.axis.bbox.width * x_max / self.axis.get_xlim()[1]
+            x, y = minmax_downsample(relative_times, ratios, columns)
+            self.ratio_line.set_data(x, y)
+            self.update_episodes(origin, origin + self.axis.get_xlim()[1], threshold)
+            self.threshold_line.set_ydata([plotted_threshold, plotted_threshold])
+
+            if plotted_threshold != self.plotted_threshold:
+                self.legend.get_texts()[1].set_text(f'Threshold ({plotted_threshold:.3f})')
+                self.plotted_threshold = plotted_threshold
+                full_redraw = True
 
-        if relative_times and ratios:
-            self.axis.plot(relative_times, ratios, label='Avg Posture (1s)', color='skyblue')
-            
-            # Plot the threshold line
-            self.axis.axhline(threshold, color='red', linestyle='--', label=f'Threshold ({threshold:.3f})')
-            
-            self.axis.xaxis.set_major_formatter(FuncFormatter(self.format_time))
-            
-            self.axis.set_title("Posture Ratio Over Time")
-            self.axis.set_xlabel("Time (Session Duration)")
-            self.axis.set_ylabel("Posture Ratio")
-            self.axis.grid(True, linestyle=':', alpha=0.6)
-            self.axis.set_ylim(0.4, 1.2)
-            self.axis.legend()
         else:
-             self.axis.text(0.5, 0.5, "No Data Yet", ha='center', va='center')
+            self.ratio_line.set_data([], [])
+            self.episode_shading.set_verts([])
+
+        self.legend.set_visible(has_data)
+        self.no_data_text.set_visible(not has_data)
+
+        if full_redraw:
+            self.canvas.draw() # on_draw re-caches the background
+        else:
+            self.canvas.restore_region(self.background)
+            self.axis.draw_artist(self.episode_shading)
+            self.axis.draw_artist(self.ratio_line)
+            self.axis.draw_artist(self.threshold_line)
+            self.canvas.blit(self.axis.bbox)
+
+    def update_what_if(self):
+        """Shows the good posture time and longest streak at the what-if slider's threshold."""
+        threshold = self.what_if_slider.value() / 100.0
+        result = self.data_manager.stats_at_threshold(threshold)
+        if result is None:
+            self.what_if_label.setText(f"At {threshold:.2f}: no data yet")
+            return
+        percent_good, longest_streak_s = result
+        self.what_if_label.setText(f"At {threshold:.2f}: {percent_good:.1f}% good, "
+                                   f"longest streak {self.format_duration(longest_streak_s)}")
+
+    def update_episodes(self, start, end, threshold):
+        """
+        Bad posture episodes between two timestamps, from the data manager's
+        episode index: shaded on the graph, counted per hour at the desk and
+        the worst (longest time furthest below the threshold) listed.
+        """
+        episodes = self.data_manager.get_episodes(start, end)
+        bad = (episodes["state"] == BAD) & (episodes["duration"] >= self.MIN_EPISODE_S)
+        starts, ends = episodes["start"][bad], episodes["end"][bad]
+
+        self.episode_shading.set_verts([((x0, 0), (x0, 1), (x1, 1), (x1, 0))
+                                        for x0, x1 in zip((starts - start).tolist(), (ends - start).tolist())])
+
+        # Time at the desk in the range: every episode with a pose, clipped to the range
+        present = episodes["count"] > 0
+        present_s = float((np.minimum(episodes["end"][present], end) -
+                           np.maximum(episodes["start"][present], start)).sum())
+        count = len(starts)
+        per_hour = count / (present_s / 3600) if present_s > 0 else 0.0
+        self.episodes_label.setText(f"Bad Posture Episodes (≥ {self.MIN_EPISODE_S}s): {count} "
+                                    f"({per_hour:.1f} per hour at the desk)")
+
+        severity = episodes["duration"][bad] * (threshold - episodes["mean"][bad])
+        worst = np.argsort(-severity)[:self.WORST_EPISODES]
+        lines = [f"{time.strftime('%H:%M', time.localtime(starts[i]))} for "
+                 f"{self.format_duration(ends[i] - starts[i])} at {episodes['mean'][bad][i]:.2f}"
+                 for i in worst.tolist()]
+        self.worst_label.setText("Worst Episodes: " + ("; ".join(lines) if lines else "none"))
+
+    def get_plot_data(self):
+        """
+        Returns (x, ratios, span, resolution, origin) for the selected range
+        (origin is the timestamp at x = 0), with the
+        selected feature's values in place of the ratios if one is chosen.
+        Long ranges come from the data manager's rollups at about
+        HISTORY_POINTS points, so a week costs no more to draw than a minute;
+        features only have the 1-second session log.
+        """
+        span = self.VIEW_RANGES[self.range_combo.currentIndex()][1]
+        if span is None:
+            relative_times, ratios = self.data_manager.get_latest_data(self.feature)
+            return relative_times, ratios, None, 1, self.data_manager.log_start()
 
-        self.canvas.draw()
\ No newline at end of file
+        end = time.time()
+        if self.feature is not None:
+            timestamps, values = self.data_manager.get_feature_history(self.feature, end - span, end)
+            return timestamps - (end - span), values, span, 1, end - span
+        history = self.data_manager.get_history(end - span, end, span / self.HISTORY_POINTS)
+        return history["time"] - (end - span), history["mean"], span, history["resolution"], end - span